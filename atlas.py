@@ -0,0 +1,97 @@
+import glob
+import json
+import os
+import pygame
+
+# Atlas com todos os frames do Pacman e dos fantasmas já no tamanho usado no jogo
+CAMINHO_IMAGEM = os.path.join("assets", "atlas.png")
+CAMINHO_INDICE = os.path.join("assets", "atlas.json")
+
+TAMANHO_FANTASMA = (30, 30)  # Mesmo tamanho usado por ghost.GhostSprite
+LARGURA_MAXIMA = 256
+ESPACAMENTO = 1  # Pixels entre frames, para evitar vazamento ao escalar o atlas
+
+def chave_frame(caminho):
+    """Nome de um frame no atlas: o caminho relativo do PNG original, com '/'."""
+    return os.path.normpath(caminho).replace(os.sep, "/")
+
+def listar_frames():
+    """Lista os frames do atlas como (nome, caminho do PNG, tamanho final ou None para manter)."""
+    frames = []
+    for caminho in sorted(glob.glob(os.path.join("assets", "pacman", "*.png"))):
+        frames.append((chave_frame(caminho), caminho, None))
+    for caminho in sorted(glob.glob(os.path.join("assets", "ghosts", "*.png"))):
+        frames.append((chave_frame(caminho), caminho, TAMANHO_FANTASMA))
+    return frames
+
+def construir_atlas(caminho_imagem=CAMINHO_IMAGEM, caminho_indice=CAMINHO_INDICE):
+    """
+    Empacota todos os frames, já redimensionados, em uma única imagem e grava o índice.
+    Deve ser executado de novo sempre que algum sprite for alterado.
+
+    Returns:
+        O índice gravado: {nome do frame: [x, y, largura, altura]}
+    """
+    imagens = []
+    for nome, caminho, tamanho in listar_frames():
+        imagem = pygame.image.load(caminho)
+        if tamanho is not None:
+            imagem = pygame.transform.scale(imagem, tamanho)
+        imagens.append((nome, imagem))
+
+    # Empacotamento em prateleiras: frames mais altos primeiro, linha a linha
+    imagens.sort(key=lambda item: item[1].get_height(), reverse=True)
+    posicoes = {}
+    x = y = altura_prateleira = largura_total = 0
+    for nome, imagem in imagens:
+        largura, altura = imagem.get_size()
+        if x > 0 and x + largura > LARGURA_MAXIMA:
+            x = 0
+            y += altura_prateleira + ESPACAMENTO
+            altura_prateleira = 0
+        posicoes[nome] = [x, y, largura, altura]
+        x += largura + ESPACAMENTO
+        altura_prateleira = max(altura_prateleira, altura)
+        largura_total = max(largura_total, x - ESPACAMENTO)
+
+    atlas = pygame.Surface((largura_total, y + altura_prateleira), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for nome, imagem in imagens:
+        # BLEND_RGBA_MAX sobre o fundo zerado copia os pixels sem misturar o alfa
+        atlas.blit(imagem, posicoes[nome][:2], special_flags=pygame.BLEND_RGBA_MAX)
+
+    pygame.image.save(atlas, caminho_imagem)
+    with open(caminho_indice, "w", encoding="utf-8") as arquivo:
+        json.dump({"frames": posicoes}, arquivo, indent=1, sort_keys=True)
+    return posicoes
+
+class Atlas:
+    """Atlas carregado: uma única imagem e os frames como subsuperfícies dela."""
+    def __init__(self, imagem, indice):
+        self.imagem = imagem
+        self.frames = {nome: imagem.subsurface(pygame.Rect(rect)) for nome, rect in indice.items()}
+
+    def get_frame(self, caminho):
+        """Retorna o frame do PNG `caminho`, ou None se ele não estiver no atlas."""
+        return self.frames.get(chave_frame(caminho))
+
+_atlas = None
+_atlas_carregado = False
+
+def obter_atlas(caminho_imagem=CAMINHO_IMAGEM, caminho_indice=CAMINHO_INDICE):
+    """
+    Carrega o atlas na primeira chamada (requer a janela já criada, por causa de convert_alpha).
+    Retorna None se o atlas não existir, e os sprites são carregados dos PNGs individuais.
+    """
+    global _atlas, _atlas_carregado
+    if not _atlas_carregado:
+        _atlas_carregado = True
+        if os.path.exists(caminho_imagem) and os.path.exists(caminho_indice):
+            with open(caminho_indice, encoding="utf-8") as arquivo:
+                indice = json.load(arquivo)["frames"]
+            _atlas = Atlas(pygame.image.load(caminho_imagem).convert_alpha(), indice)
+    return _atlas
+
+if __name__ == "__main__":
+    indice = construir_atlas()
+    print(f"{len(indice)} frames gravados em {CAMINHO_IMAGEM} e {CAMINHO_INDICE}")
@@ -0,0 +1,178 @@
+"""
+Benchmarks de cenários completos do jogo.
+
+Cada cenário executa main.main() sem limite de FPS, com o driver de vídeo "dummy" do
+SDL (sem janela), seed fixa e teclas enviadas como eventos em quadros fixos, então a
+simulação, a entrada e o desenho rodam exatamente como no jogo. Um gancho no início de
+cada quadro monta a situação do cenário (fantasmas vulneráveis, fantasmas extras,
+nível concluído...). Para cada cenário são mostrados os ticks por segundo e os
+percentis do tempo de quadro.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/cenarios.py [--quadros N] [--cenario NOME] [--salvar resultados.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame  # pylint: disable=wrong-import-position
+import main  # pylint: disable=wrong-import-position
+from entrada import TECLAS_DIRECAO  # pylint: disable=wrong-import-position
+from ghost import Ghost  # pylint: disable=wrong-import-position
+from jogo import criar_fantasmas, encontrar_posicao_inicial  # pylint: disable=wrong-import-position
+from lod_fantasmas import AgendadorLOD  # pylint: disable=wrong-import-position
+from movimento_segmentos import MovimentoSegmentos  # pylint: disable=wrong-import-position
+from perfil import PERCENTIS  # pylint: disable=wrong-import-position
+
+SEED = 1
+QUADROS = 300
+QUADROS_POR_TECLA = 8  # Uma tecla de direção a cada tantos quadros
+TECLAS = {direcao: tecla for tecla, direcao in TECLAS_DIRECAO.items()}
+DIRECOES = ("up", "left", "down", "right")
+
+# Nome -> (nível inicial, função chamada com (quadro, estado) no início de cada quadro)
+CENARIOS = {}
+
+def cenario(nome, nivel=1):
+    """Registra um cenário em CENARIOS."""
+    def registrar(funcao):
+        CENARIOS[nome] = (nivel, funcao)
+        return funcao
+    return registrar
+
+@cenario("inicio_de_nivel")
+def _inicio_de_nivel(quadro, estado):
+    pass
+
+@cenario("nivel_25", nivel=25)
+def _nivel_25(quadro, estado):
+    """Power pellets extras e mais extensões de parede."""
+
+@cenario("fantasmas_vulneraveis")
+def _fantasmas_vulneraveis(quadro, estado):
+    if quadro == 0:
+        for fantasma in estado.fantasmas:
+            fantasma.tornar_vulneravel(QUADROS * 10)
+
+@cenario("comendo_fantasmas")
+def _comendo_fantasmas(quadro, estado):
+    """A cada 4 quadros um fantasma vulnerável é colocado sobre o Pacman e comido."""
+    for fantasma in estado.fantasmas:
+        if fantasma.estado == Ghost.NORMAL:
+            fantasma.tornar_vulneravel(QUADROS * 10)
+    if quadro % 4 == 0:
+        for fantasma in estado.fantasmas:
+            if fantasma.estado == Ghost.VULNERAVEL:
+                fantasma.x, fantasma.y = estado.pacman.x, estado.pacman.y
+                break
+
+@cenario("multidao_na_casa")
+def _multidao_na_casa(quadro, estado):
+    """10 fantasmas começando na casa."""
+    if quadro == 0:
+        estado.fantasmas = (criar_fantasmas(estado.mapa, estado.gerador) +
+                            criar_fantasmas(estado.mapa, estado.gerador))
+
+def _centenas_de_fantasmas(estado, lod=False, segmentos=False):
+    """200 fantasmas em um labirinto grande (24x20 blocos), opcionalmente com LOD ou movimento por segmentos."""
+    estado.blocos_labirinto = (24, 20)
+    estado._gerar_nivel()  # pylint: disable=protected-access
+    estado.pacman.x, estado.pacman.y = encontrar_posicao_inicial(estado.mapa)
+    fantasmas = []
+    while len(fantasmas) < 200:
+        fantasmas += criar_fantasmas(estado.mapa, estado.gerador)
+    estado.fantasmas = fantasmas[:200]
+    estado.lod = AgendadorLOD() if lod else None
+    estado.movimento = MovimentoSegmentos() if segmentos else None
+
+@cenario("centenas_de_fantasmas")
+def _centenas_sem_lod(quadro, estado):
+    if quadro == 0:
+        _centenas_de_fantasmas(estado, lod=False)
+
+@cenario("centenas_de_fantasmas_lod")
+def _centenas_com_lod(quadro, estado):
+    if quadro == 0:
+        _centenas_de_fantasmas(estado, lod=True)
+
+@cenario("centenas_de_fantasmas_seg")
+def _centenas_com_segmentos(quadro, estado):
+    if quadro == 0:
+        _centenas_de_fantasmas(estado, segmentos=True)
+
+@cenario("transicao_de_nivel")
+def _transicao_de_nivel(quadro, estado):
+    """A cada 30 quadros todos os pontos são removidos e o próximo tick gera um novo nível."""
+    if quadro % 30 == 29:
+        pontos = estado.pontos
+        for row in range(pontos.altura):
+            for col in range(pontos.largura):
+                pontos.remover(row, col)
+
+def executar_cenario(nome, quadros=QUADROS):
+    """
+    Executa um cenário em main.main().
+
+    Returns:
+        (ticks por segundo, tempos de quadro em ms)
+    """
+    nivel, preparar = CENARIOS[nome]
+    instantes = []
+
+    def ao_iniciar_quadro(quadro, estado):
+        instantes.append(time.perf_counter())
+        preparar(quadro, estado)
+        if quadro % QUADROS_POR_TECLA == 0:
+            direcao = DIRECOES[(quadro // QUADROS_POR_TECLA) % len(DIRECOES)]
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=TECLAS[direcao]))
+
+    # Os avisos dos fantasmas (print) não vão para a tela durante a medição
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Um quadro a mais: o início do último quadro marca o fim do anterior
+        main.main(max_quadros=quadros + 1, seed=SEED, nivel=nivel, fps=0, ao_iniciar_quadro=ao_iniciar_quadro)
+
+    tempos = [(fim - inicio) * 1000 for inicio, fim in zip(instantes, instantes[1:])]
+    return len(tempos) / (instantes[-1] - instantes[0]), tempos
+
+def percentis(tempos):
+    """Percentis (PERCENTIS) de uma lista de tempos."""
+    ordenados = sorted(tempos)
+    return tuple(ordenados[min(len(ordenados) - 1, len(ordenados) * p // 100)] for p in PERCENTIS)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de cenários completos do PacDevs")
+    parser.add_argument("--quadros", type=int, default=QUADROS, help="quadros medidos por cenário")
+    parser.add_argument("--cenario", choices=list(CENARIOS), action="append",
+                        help="executa só este cenário (pode ser repetido)")
+    parser.add_argument("--salvar", metavar="ARQUIVO", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    # Os sprites e assets são procurados a partir da raiz do projeto
+    os.chdir(RAIZ)
+    resultados = {}
+    print(f"{'cenário':<28} {'ticks/s':>9}   " + "   ".join(f"p{p} (ms)" for p in PERCENTIS))
+    try:
+        for nome in args.cenario or CENARIOS:
+            ticks_por_segundo, tempos = executar_cenario(nome, args.quadros)
+            valores = percentis(tempos)
+            resultados[nome] = {"ticks_por_segundo": ticks_por_segundo,
+                                **{f"p{p}_ms": valor for p, valor in zip(PERCENTIS, valores)}}
+            print(f"{nome:<28} {ticks_por_segundo:9.1f}   " + "   ".join(f"{valor:7.2f}" for valor in valores))
+    finally:
+        main.encerrar()
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump({"python": platform.python_version(), "plataforma": platform.platform(),
+                       "seed": SEED, "quadros": args.quadros, "resultados": resultados}, arquivo, indent=2)
@@ -0,0 +1,251 @@
+"""
+Microbenchmarks das operações de entidades executadas a cada frame.
+
+Cada benchmark parte de uma partida sem gráficos com seed fixa, avançada alguns ticks
+para que os fantasmas já tenham saído da casa, e mede uma operação do Pacman ou dos
+fantasmas (movimento, decisão de direção, colisões). Antes de cada repetição o estado
+é restaurado do mesmo snapshot, então todas as repetições executam exatamente o
+mesmo trabalho. O resultado é o tempo por chamada (mediana e mínimo das repetições).
+
+Os resultados podem ser salvos em JSON e comparados depois com uma linha de base: a
+comparação falha (código de saída 1) se algum benchmark ficar mais lento que a
+tolerância. A linha de base vale só para a máquina e o Python em que foi gerada.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/entidades.py [--salvar linha_de_base.json]
+    python benchmarks/entidades.py --comparar linha_de_base.json [--tolerancia 0.15]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pacman as modulo_pacman  # pylint: disable=wrong-import-position
+from jogo import EstadoJogo  # pylint: disable=wrong-import-position
+
+SEED = 1
+TICKS_AQUECIMENTO = 150  # Ticks simulados antes de medir (fantasmas fora da casa)
+CHAMADAS = 1000          # Chamadas da operação por repetição
+REPETICOES = 25
+AQUECIMENTO = 3          # Repetições descartadas antes de medir (caches e frequência da CPU)
+TOLERANCIA = 0.15        # Aumento máximo aceito da mediana na comparação (15%)
+DIRECOES = ("up", "down", "left", "right")
+
+# Nome -> função que recebe o estado restaurado, prepara o cenário e retorna
+# (chamadas por execução, função que executa as chamadas)
+BENCHMARKS = {}
+
+def benchmark(nome):
+    """Registra um benchmark em BENCHMARKS."""
+    def registrar(funcao):
+        BENCHMARKS[nome] = funcao
+        return funcao
+    return registrar
+
+def _repetir(chamadas, quantidade):
+    """Número de voltas de um laço que faz `quantidade` chamadas por volta."""
+    return range(max(1, chamadas // quantidade))
+
+@benchmark("Pacman.pode_mover_para")
+def _pacman_pode_mover_para(estado):
+    pacman, mapa = estado.pacman, estado.mapa
+    voltas = _repetir(CHAMADAS, len(DIRECOES))
+    def executar():
+        for _ in voltas:
+            for direcao in DIRECOES:
+                pacman.pode_mover_para(direcao, mapa)
+    return len(voltas) * len(DIRECOES), executar
+
+@benchmark("Pacman.mover")
+def _pacman_mover(estado):
+    pacman, mapa = estado.pacman, estado.mapa
+    def executar():
+        for i in range(CHAMADAS):
+            # Troca de direção desejada a cada 25 chamadas, como um jogador
+            pacman.direcao_desejada = DIRECOES[(i // 25) % len(DIRECOES)]
+            pacman.mover(mapa)
+    return CHAMADAS, executar
+
+@benchmark("Pacman.centralizar_nos_corredores")
+def _pacman_centralizar(estado):
+    pacman = estado.pacman
+    posicao = (pacman.x, pacman.y)
+    def executar():
+        for i in range(CHAMADAS):
+            pacman.direcao = DIRECOES[i & 3]
+            pacman.x, pacman.y = posicao[0] + (i & 7), posicao[1] + (i & 7)
+            pacman.centralizar_nos_corredores()
+    return CHAMADAS, executar
+
+@benchmark("Ghost.pode_mover_para")
+def _ghost_pode_mover_para(estado):
+    fantasmas, mapa = estado.fantasmas, estado.mapa
+    # Posições vizinhas de cada fantasma nas quatro direções
+    alvos = [(fantasma, x, y) for fantasma in fantasmas
+             for x, y in ((fantasma.x, fantasma.y - fantasma.velocidade), (fantasma.x, fantasma.y + fantasma.velocidade),
+                          (fantasma.x - fantasma.velocidade, fantasma.y), (fantasma.x + fantasma.velocidade, fantasma.y))]
+    voltas = _repetir(CHAMADAS, len(alvos))
+    def executar():
+        for _ in voltas:
+            for fantasma, x, y in alvos:
+                fantasma.pode_mover_para(x, y, mapa)
+    return len(voltas) * len(alvos), executar
+
+@benchmark("Ghost.decidir_direcao")
+def _ghost_decidir_direcao(estado):
+    fantasmas, mapa, pacman = estado.fantasmas, estado.mapa, estado.pacman
+    voltas = _repetir(CHAMADAS, len(fantasmas))
+    def executar():
+        for _ in voltas:
+            for fantasma in fantasmas:
+                fantasma.decidir_direcao(pacman.x, pacman.y, mapa)
+    return len(voltas) * len(fantasmas), executar
+
+def _ghost_mover(estado):
+    fantasmas, mapa, pacman = estado.fantasmas, estado.mapa, estado.pacman
+    voltas = _repetir(CHAMADAS, len(fantasmas))
+    def executar():
+        for _ in voltas:
+            for fantasma in fantasmas:
+                fantasma.mover(pacman.x, pacman.y, mapa)
+    return len(voltas) * len(fantasmas), executar
+
+@benchmark("Ghost.mover[normal]")
+def _ghost_mover_normal(estado):
+    return _ghost_mover(estado)
+
+@benchmark("Ghost.mover[vulneravel]")
+def _ghost_mover_vulneravel(estado):
+    for fantasma in estado.fantasmas:
+        fantasma.tornar_vulneravel(CHAMADAS * 10)
+    return _ghost_mover(estado)
+
+@benchmark("Ghost.mover[comido]")
+def _ghost_mover_comido(estado):
+    for fantasma in estado.fantasmas:
+        fantasma.foi_comido()
+    return _ghost_mover(estado)
+
+@benchmark("Ghost.verificar_colisao_pacman")
+def _ghost_colisao_pacman(estado):
+    fantasmas = estado.fantasmas
+    # Posições do Pacman próximas e distantes de cada fantasma
+    posicoes = [(fantasma.x + dx, fantasma.y) for fantasma in fantasmas for dx in (0, 20, 200)]
+    voltas = _repetir(CHAMADAS, len(fantasmas) * len(posicoes))
+    def executar():
+        for _ in voltas:
+            for fantasma in fantasmas:
+                for x, y in posicoes:
+                    fantasma.verificar_colisao_pacman(x, y)
+    return len(voltas) * len(fantasmas) * len(posicoes), executar
+
+@benchmark("Ghost.verificar_colisao_com_fantasma")
+def _ghost_colisao_fantasma(estado):
+    fantasmas = estado.fantasmas
+    pares = [(a, b) for i, a in enumerate(fantasmas) for b in fantasmas[i + 1:]]
+    voltas = _repetir(CHAMADAS, len(pares))
+    def executar():
+        for _ in voltas:
+            for a, b in pares:
+                a.verificar_colisao_com_fantasma(b)
+    return len(voltas) * len(pares), executar
+
+@benchmark("Ghost.reagir_a_colisao")
+def _ghost_reagir(estado):
+    fantasmas, mapa = estado.fantasmas, estado.mapa
+    voltas = _repetir(CHAMADAS, len(fantasmas))
+    def executar():
+        for _ in voltas:
+            for fantasma in fantasmas:
+                fantasma.reagir_a_colisao(mapa)
+    return len(voltas) * len(fantasmas), executar
+
+def preparar_partida(seed=SEED, ticks=TICKS_AQUECIMENTO):
+    """Partida sem gráficos avançada `ticks` ticks com entradas fixas. Retorna (estado, snapshot)."""
+    estado = EstadoJogo(seed=seed, carregar_sprites=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for tick in range(ticks):
+            estado.atualizar(DIRECOES[(tick // 20) % len(DIRECOES)])
+    return estado, estado.snapshot(incluir_gerador=True)
+
+def medir(nome, estado, inicial, repeticoes=REPETICOES):
+    """Mede um benchmark. Retorna os tempos por chamada de cada repetição, em ns."""
+    tempos = []
+    # A saída dos avisos dos fantasmas (print) não deve ir para a tela durante a medição
+    with contextlib.redirect_stdout(io.StringIO()) as saida:
+        for repeticao in range(AQUECIMENTO + repeticoes):
+            estado.restore(inicial)
+            modulo_pacman.direcao_pacman_global = estado.direcao_pacman
+            chamadas, executar = BENCHMARKS[nome](estado)
+            inicio = time.perf_counter_ns()
+            executar()
+            tempo = time.perf_counter_ns() - inicio
+            if repeticao >= AQUECIMENTO:
+                tempos.append(tempo / chamadas)
+            saida.seek(0)
+            saida.truncate()
+    return tempos
+
+def executar_todos(filtro=None, repeticoes=REPETICOES):
+    """Executa os benchmarks (os que contêm `filtro` no nome, se informado) e retorna os resultados."""
+    estado, inicial = preparar_partida()
+    resultados = {}
+    for nome in BENCHMARKS:
+        if filtro and filtro not in nome:
+            continue
+        tempos = medir(nome, estado, inicial, repeticoes)
+        resultados[nome] = {"mediana_ns": statistics.median(tempos), "min_ns": min(tempos)}
+        print(f"{nome:<38} mediana {resultados[nome]['mediana_ns']:10.0f} ns   min {resultados[nome]['min_ns']:10.0f} ns")
+    return resultados
+
+def comparar(resultados, linha_de_base, tolerancia=TOLERANCIA):
+    """Compara com uma linha de base. Retorna os nomes dos benchmarks que regrediram."""
+    regressoes = []
+    print(f"\n{'benchmark':<38} {'base':>10} {'atual':>10} {'variação':>9}")
+    for nome, resultado in resultados.items():
+        base = linha_de_base.get(nome)
+        if base is None:
+            print(f"{nome:<38} {'-':>10} {resultado['mediana_ns']:10.0f}      novo")
+            continue
+        variacao = resultado["mediana_ns"] / base["mediana_ns"] - 1
+        regrediu = variacao > tolerancia
+        if regrediu:
+            regressoes.append(nome)
+        print(f"{nome:<38} {base['mediana_ns']:10.0f} {resultado['mediana_ns']:10.0f} {variacao:+8.1%}"
+              f"{'  REGRESSÃO' if regrediu else ''}")
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks das operações de entidades do PacDevs")
+    parser.add_argument("--salvar", metavar="ARQUIVO", help="grava os resultados em JSON")
+    parser.add_argument("--comparar", metavar="ARQUIVO", help="compara com uma linha de base salva com --salvar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="aumento máximo aceito da mediana, em fração (padrão: %(default)s)")
+    parser.add_argument("--filtro", help="executa só os benchmarks cujo nome contém este texto")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES, help="repetições de cada benchmark")
+    args = parser.parse_args()
+
+    # Os sprites e assets são procurados a partir da raiz do projeto
+    os.chdir(RAIZ)
+    resultados = executar_todos(args.filtro, args.repeticoes)
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump({"python": platform.python_version(), "plataforma": platform.platform(),
+                       "seed": SEED, "chamadas": CHAMADAS, "resultados": resultados}, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            linha_de_base = json.load(arquivo)["resultados"]
+        regressoes = comparar(resultados, linha_de_base, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} benchmark(s) acima da tolerância de {args.tolerancia:.0%}: {', '.join(regressoes)}")
+            sys.exit(1)
@@ -0,0 +1,60 @@
+"""
+Benchmark do tempo de inicialização do jogo.
+
+Mede, em processos novos, o tempo desde o início do processo até o primeiro quadro
+desenhado (main.py --quadros 1, incluindo o encerramento do processo) e, separadamente,
+o tempo só das importações de main.py. Usa o driver de vídeo "dummy" do SDL, então
+roda sem janela.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/inicializacao.py [--repeticoes N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODIGO_IMPORTACAO = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+def ambiente_sem_tela():
+    """Ambiente dos processos filhos: SDL sem janela e sem áudio, sem a mensagem do pygame."""
+    ambiente = dict(os.environ)
+    ambiente.setdefault("SDL_VIDEODRIVER", "dummy")
+    ambiente.setdefault("SDL_AUDIODRIVER", "dummy")
+    ambiente["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    return ambiente
+
+def medir_primeiro_quadro(ambiente):
+    """Tempo, em segundos, de um processo que desenha um quadro e encerra."""
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "main.py", "--quadros", "1"], cwd=RAIZ, env=ambiente,
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - inicio
+
+def medir_importacao(ambiente):
+    """Tempo, em segundos, das importações de main.py, medido dentro do processo filho."""
+    saida = subprocess.run([sys.executable, "-c", CODIGO_IMPORTACAO], cwd=RAIZ, env=ambiente,
+                           check=True, stdout=subprocess.PIPE, text=True).stdout
+    return float(saida.split()[-1])
+
+def resumo(nome, tempos):
+    """Formata mínimo, mediana e máximo de uma lista de tempos em ms."""
+    tempos_ms = [tempo * 1000 for tempo in tempos]
+    return (f"{nome:<28} min {min(tempos_ms):7.1f} ms   mediana {statistics.median(tempos_ms):7.1f} ms   "
+            f"max {max(tempos_ms):7.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização do PacDevs")
+    parser.add_argument("--repeticoes", type=int, default=10, help="número de processos medidos")
+    args = parser.parse_args()
+
+    ambiente = ambiente_sem_tela()
+    # Um processo de aquecimento para o cache de bytecode e do sistema de arquivos
+    medir_primeiro_quadro(ambiente)
+
+    print(resumo("processo até o 1º quadro", [medir_primeiro_quadro(ambiente) for _ in range(args.repeticoes)]))
+    print(resumo("importações de main.py", [medir_importacao(ambiente) for _ in range(args.repeticoes)]))
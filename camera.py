@@ -0,0 +1,56 @@
+import pygame
+from jogo import TILE_SIZE
+
+class Camera:
+    """
+    Janela de visualização sobre o mapa que segue o Pacman.
+
+    Guarda a posição (em pixels do mapa) do canto superior esquerdo da tela. Quando o mapa
+    cabe na tela a câmera fica parada na origem, como no desenho sem câmera; em mapas
+    maiores ela acompanha o Pacman sem mostrar área fora do mapa.
+    """
+    def __init__(self, largura, altura, tile_size=TILE_SIZE):
+        """
+        Args:
+            largura, altura: Tamanho da área visível na tela, em pixels
+            tile_size: Tamanho de cada bloco do labirinto
+        """
+        self.largura = largura
+        self.altura = altura
+        self.tile_size = tile_size
+        self.x = 0
+        self.y = 0
+
+    @property
+    def deslocamento(self):
+        """Deslocamento a somar a uma posição do mapa para obter a posição na tela."""
+        return (-self.x, -self.y)
+
+    @property
+    def retangulo(self):
+        """Área visível, em coordenadas do mapa."""
+        return pygame.Rect(self.x, self.y, self.largura, self.altura)
+
+    def seguir(self, x, y, mapa):
+        """Centraliza a câmera na entidade em (x, y), sem sair dos limites do mapa."""
+        largura_mapa = len(mapa[0]) * self.tile_size
+        altura_mapa = len(mapa) * self.tile_size
+        alvo_x = int(x) + self.tile_size // 2 - self.largura // 2
+        alvo_y = int(y) + self.tile_size // 2 - self.altura // 2
+        self.x = max(0, min(alvo_x, largura_mapa - self.largura))
+        self.y = max(0, min(alvo_y, altura_mapa - self.altura))
+
+    def janela_tiles(self, mapa):
+        """Retorna (row_inicio, row_fim, col_inicio, col_fim) das células visíveis (fim exclusivo)."""
+        row_inicio = self.y // self.tile_size
+        col_inicio = self.x // self.tile_size
+        row_fim = min(len(mapa), (self.y + self.altura - 1) // self.tile_size + 1)
+        col_fim = min(len(mapa[0]), (self.x + self.largura - 1) // self.tile_size + 1)
+        return row_inicio, row_fim, col_inicio, col_fim
+
+    def visivel(self, x, y, tamanho=None):
+        """Retorna True se uma entidade em (x, y) com o tamanho dado aparece na tela."""
+        if tamanho is None:
+            tamanho = self.tile_size
+        return (x + tamanho > self.x and x < self.x + self.largura and
+                y + tamanho > self.y and y < self.y + self.altura)
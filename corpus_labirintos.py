@@ -0,0 +1,181 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from maze_generator import gerar_labirinto, PAREDE, PONTO, CASA_FANTASMA, POWER_PELLET
+
+try:
+    import numpy
+except ImportError:  # O corpus exige NumPy; o resto do jogo funciona sem ele
+    numpy = None
+
+# Arquivo do corpus (little-endian, registros de tamanho fixo):
+#   cabeçalho  TAMANHO_CABECALHO bytes: MAGIC, versão, quantidade, altura, largura,
+#              blocos_largura, blocos_altura (uint64 cada, após o MAGIC)
+#   índice     quantidade registros DTYPE_INDICE: seed, nível e estatísticas de cada labirinto
+#   células    quantidade x altura x largura bytes, uma célula por byte (valores do maze_generator)
+# Todas as partes começam alinhadas em 64 bytes, então podem ser lidas direto com memmap.
+MAGIC = b"PDLABS01"
+VERSAO = 1
+TAMANHO_CABECALHO = 64
+DTYPE_INDICE = [
+    ("seed", "<i8"),
+    ("nivel", "<i4"),
+    ("pontos", "<i4"),          # Pontos comuns
+    ("power_pellets", "<i4"),
+    ("paredes", "<i4"),
+    ("corredores", "<i4"),      # Células por onde o Pacman anda (fora paredes e casa)
+    ("becos", "<i4"),           # Corredores com uma única saída
+]
+LOTE = 500  # Labirintos gerados por tarefa do pool
+
+def _alinhar(tamanho):
+    return (tamanho + 63) & ~63
+
+def _deslocamentos(quantidade):
+    """(deslocamento do índice, deslocamento das células) no arquivo."""
+    inicio_indice = TAMANHO_CABECALHO
+    inicio_celulas = _alinhar(inicio_indice + quantidade * numpy.dtype(DTYPE_INDICE).itemsize)
+    return inicio_indice, inicio_celulas
+
+def nivel_do_labirinto(indice, niveis):
+    """Nível do labirinto `indice` do corpus: os níveis de `niveis` (mínimo, máximo) em sequência."""
+    nivel_minimo, nivel_maximo = niveis
+    return nivel_minimo + indice % (nivel_maximo - nivel_minimo + 1)
+
+def estatisticas(celulas):
+    """Estatísticas de um labirinto (array altura x largura), na ordem dos campos de DTYPE_INDICE após o nível."""
+    andavel = (celulas != PAREDE) & (celulas != CASA_FANTASMA)
+    # Vizinhos andáveis de cada célula (bordas contam como parede)
+    vizinhos = numpy.zeros(celulas.shape, dtype=numpy.int8)
+    vizinhos[1:, :] += andavel[:-1, :]
+    vizinhos[:-1, :] += andavel[1:, :]
+    vizinhos[:, 1:] += andavel[:, :-1]
+    vizinhos[:, :-1] += andavel[:, 1:]
+    return (int(numpy.count_nonzero(celulas == PONTO)),
+            int(numpy.count_nonzero(celulas == POWER_PELLET)),
+            int(numpy.count_nonzero(celulas == PAREDE)),
+            int(numpy.count_nonzero(andavel)),
+            int(numpy.count_nonzero(andavel & (vizinhos == 1))))
+
+def _gerar_lote(caminho, inicio, fim, seed, niveis, blocos):
+    """Gera os labirintos [inicio, fim) e os escreve direto no arquivo (executado nos processos do pool)."""
+    corpus = CorpusLabirintos(caminho, modo="r+")
+    try:
+        for indice in range(inicio, fim):
+            nivel = nivel_do_labirinto(indice, niveis)
+            celulas = corpus.celulas[indice]
+            celulas[:] = gerar_labirinto(blocos[0], blocos[1], nivel, seed=seed + indice)
+            corpus.indice[indice] = (seed + indice, nivel) + estatisticas(celulas)
+        corpus.memoria.flush()
+    finally:
+        corpus.fechar()
+    return fim - inicio
+
+def gerar_corpus(caminho, quantidade, seed=0, niveis=(1, 1), blocos=(4, 3), processos=None, lote=LOTE):
+    """
+    Gera um corpus de labirintos em um arquivo.
+
+    O labirinto i usa a seed `seed + i` e o nível nivel_do_labirinto(i, niveis), então o
+    conteúdo não depende do número de processos. O arquivo é criado com o tamanho final
+    e cada processo do pool escreve seus lotes diretamente nele (nada volta pelo pool).
+
+    Args:
+        niveis: (nível mínimo, nível máximo) dos labirintos
+        blocos: (largura, altura) em blocos, como em gerar_labirinto
+        processos: Número de processos do pool (os núcleos da máquina se não informado)
+        lote: Labirintos por tarefa
+    """
+    altura, largura = numpy.asarray(gerar_labirinto(blocos[0], blocos[1], niveis[0], seed=seed)).shape
+    _, inicio_celulas = _deslocamentos(quantidade)
+    with open(caminho, "wb") as arquivo:
+        cabecalho = MAGIC + numpy.array([VERSAO, quantidade, altura, largura, blocos[0], blocos[1]],
+                                        dtype="<u8").tobytes()
+        arquivo.write(cabecalho.ljust(TAMANHO_CABECALHO, b"\0"))
+        arquivo.truncate(inicio_celulas + quantidade * altura * largura)
+
+    lotes = [(inicio, min(inicio + lote, quantidade)) for inicio in range(0, quantidade, lote)]
+    with ProcessPoolExecutor(processos) as pool:
+        tarefas = [pool.submit(_gerar_lote, caminho, inicio, fim, seed, niveis, blocos) for inicio, fim in lotes]
+        for tarefa in tarefas:
+            tarefa.result()
+
+class CorpusLabirintos:
+    """
+    Leitura de um corpus de labirintos mapeado em memória.
+
+    `indice` é um array estruturado (DTYPE_INDICE) com a seed, o nível e as estatísticas
+    de cada labirinto, e `celulas` um array uint8 (quantidade, altura, largura); ambos são
+    views do arquivo, sem cópia e sem decodificação. corpus[i] é a view do labirinto i.
+    """
+    def __init__(self, caminho, modo="r"):
+        """
+        Args:
+            caminho: Arquivo gerado por gerar_corpus
+            modo: "r" para leitura ou "r+" para escrita (usado na geração)
+        """
+        self.memoria = numpy.memmap(caminho, dtype=numpy.uint8, mode=modo)
+        if bytes(self.memoria[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{caminho} não é um corpus de labirintos")
+        cabecalho = self.memoria[len(MAGIC):len(MAGIC) + 48].view("<u8")
+        versao, self.quantidade, self.altura, self.largura, blocos_largura, blocos_altura = (int(v) for v in cabecalho)
+        if versao != VERSAO:
+            raise ValueError(f"Versão do corpus não suportada: {versao}")
+        self.blocos = (blocos_largura, blocos_altura)
+
+        inicio_indice, inicio_celulas = _deslocamentos(self.quantidade)
+        tamanho_indice = self.quantidade * numpy.dtype(DTYPE_INDICE).itemsize
+        self.indice = self.memoria[inicio_indice:inicio_indice + tamanho_indice].view(DTYPE_INDICE)
+        self.celulas = self.memoria[inicio_celulas:inicio_celulas + self.quantidade * self.altura * self.largura] \
+            .reshape(self.quantidade, self.altura, self.largura)
+
+    def __len__(self):
+        return self.quantidade
+
+    def __getitem__(self, indice):
+        """View (altura, largura) do labirinto, sem cópia."""
+        return self.celulas[indice]
+
+    def amostrar(self, gerador):
+        """View de um labirinto sorteado com `gerador` (random.Random ou o módulo random)."""
+        return self.celulas[gerador.randrange(self.quantidade)]
+
+    def mapa(self, indice):
+        """Labirinto como lista de listas, no formato de gerar_labirinto (para EstadoJogo e o renderizador)."""
+        return self.celulas[indice].tolist()
+
+    def fechar(self):
+        """Libera o mapeamento do arquivo."""
+        self.indice = None
+        self.celulas = None
+        self.memoria = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera ou inspeciona um corpus de labirintos do PacDevs")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    gerar = subcomandos.add_parser("gerar", help="gera um corpus")
+    gerar.add_argument("arquivo")
+    gerar.add_argument("--quantidade", type=int, default=100000)
+    gerar.add_argument("--seed", type=int, default=0, help="seed do primeiro labirinto")
+    gerar.add_argument("--niveis", type=int, nargs=2, default=(1, 1), metavar=("MIN", "MAX"))
+    gerar.add_argument("--blocos", type=int, nargs=2, default=(4, 3), metavar=("LARGURA", "ALTURA"))
+    gerar.add_argument("--processos", type=int, help="processos do pool (padrão: núcleos da máquina)")
+    info = subcomandos.add_parser("info", help="mostra o tamanho e as estatísticas de um corpus")
+    info.add_argument("arquivo")
+    args = parser.parse_args()
+
+    if args.comando == "gerar":
+        inicio = time.perf_counter()
+        gerar_corpus(args.arquivo, args.quantidade, args.seed, tuple(args.niveis), tuple(args.blocos), args.processos)
+        duracao = time.perf_counter() - inicio
+        print(f"{args.quantidade} labirintos em {duracao:.1f} s ({args.quantidade / duracao:.0f}/s), "
+              f"{os.path.getsize(args.arquivo) / 2**20:.1f} MiB")
+    else:
+        corpus = CorpusLabirintos(args.arquivo)
+        print(f"{len(corpus)} labirintos {corpus.altura}x{corpus.largura} (blocos {corpus.blocos[0]}x{corpus.blocos[1]})")
+        if len(corpus) == 0:
+            print("  corpus vazio, sem estatísticas")
+        else:
+            for campo, _ in DTYPE_INDICE[1:]:
+                valores = corpus.indice[campo]
+                print(f"  {campo:<14} min {valores.min():5d}   média {valores.mean():8.1f}   max {valores.max():5d}")
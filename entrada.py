@@ -0,0 +1,74 @@
+from collections import deque
+import pygame
+
+TECLAS_DIRECAO = {
+    pygame.K_UP: "up",
+    pygame.K_DOWN: "down",
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+}
+MAX_LATENCIAS = 1000  # Últimas latências guardadas para as métricas
+
+class FilaEntrada:
+    """
+    Fila de entradas do jogador com o instante de cada tecla.
+
+    Os eventos KEYDOWN são guardados em vez de consultar pygame.key.get_pressed() uma vez
+    por tick, então um toque mais curto que um frame não se perde. A cada tick a curva
+    mais antiga que já pode ser feita é usada; curvas que ainda não podem ser feitas são
+    substituídas pelas mais novas, e a última fica como direção desejada do Pacman até
+    que pode_mover_para permita a curva. O tempo entre a tecla e o Pacman começar a
+    andar na direção é registrado como latência, no relógio do SDL (ms desde o início
+    do pygame): o instante é o do próprio evento quando o pygame o informa
+    (evento.timestamp); senão, o da chegada do evento a processar_evento, e a espera na
+    fila do SDL até a leitura não entra na medida.
+    """
+    def __init__(self):
+        self.fila = deque()  # (instante da tecla, direção)
+        self.latencias = deque(maxlen=MAX_LATENCIAS)  # Em ms
+        self._aguardando = None  # (instante, direção) da última curva entregue ao Pacman
+
+    def processar_evento(self, evento):
+        """Guarda o evento se for uma tecla de direção pressionada. Retorna True se foi guardado."""
+        if evento.type == pygame.KEYDOWN and evento.key in TECLAS_DIRECAO:
+            instante = getattr(evento, "timestamp", None)
+            if instante is None:
+                instante = pygame.time.get_ticks()
+            self.fila.append((instante, TECLAS_DIRECAO[evento.key]))
+            return True
+        return False
+
+    def direcao_do_tick(self, pacman, mapa):
+        """
+        Retorna a direção desejada do Pacman para o próximo tick, ou None para manter a atual.
+
+        Args:
+            pacman: Pacman controlado pelo jogador
+            mapa: Mapa do nível, para verificar se a curva já é possível
+        """
+        fila = self.fila
+        # Curvas impossíveis agora são descartadas se já há uma entrada mais nova
+        while len(fila) > 1 and not pacman.pode_mover_para(fila[0][1], mapa):
+            fila.popleft()
+        if not fila:
+            return None
+
+        self._aguardando = fila.popleft()
+        return self._aguardando[1]
+
+    def apos_tick(self, pacman):
+        """Registra a latência se o Pacman começou a andar na direção pedida neste tick."""
+        if self._aguardando is not None and pacman.direcao == self._aguardando[1]:
+            instante = self._aguardando[0]
+            # Instante 0: tecla lida antes de o temporizador do SDL ser iniciado (pelo
+            # primeiro Clock.tick), sem um tempo real para comparar
+            if instante:
+                self.latencias.append(pygame.time.get_ticks() - instante)
+            self._aguardando = None
+
+    def percentis_latencia(self, percentis=(50, 95, 99)):
+        """Retorna os percentis das latências registradas, em ms (0 se não há registros)."""
+        ordenadas = sorted(self.latencias)
+        if not ordenadas:
+            return tuple(0.0 for _ in percentis)
+        return tuple(ordenadas[min(len(ordenadas) - 1, len(ordenadas) * p // 100)] for p in percentis)
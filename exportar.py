@@ -0,0 +1,156 @@
+import argparse
+import os
+import queue
+import threading
+import time
+import pygame
+import pacman_sprite
+from camera import Camera
+from hud import Hud
+from renderizador import CamadaLabirinto, desenhar_jogo, iniciar_pygame
+from replay import carregar_replay
+
+FORMATOS = ("png", "rgb")
+TAMANHO_PADRAO = (768, 768)  # Mesmo tamanho da janela do jogo
+FPS_VIDEO = 10  # Ticks por segundo do jogo, usado no tempo da animação
+
+# Superfícies de 24 bits com os bytes na ordem R, G, B: o buffer já é um quadro RGB
+MASCARAS_RGB = (0x0000FF, 0x00FF00, 0xFF0000, 0)
+
+class EscritorQuadros:
+    """
+    Grava quadros em disco em uma thread separada.
+
+    Os quadros são desenhados diretamente em superfícies de um pool e entregues à thread
+    de gravação sem cópia: a superfície só volta ao pool depois de gravada. Se o disco
+    ficar para trás, o pool cresce até `max_quadros`; só então o desenho espera.
+    """
+    def __init__(self, destino, formato, tamanho, max_quadros=64):
+        """
+        Args:
+            destino: Pasta dos PNGs (formato "png") ou arquivo do fluxo RGB bruto (formato "rgb")
+            formato: "png" para uma sequência de imagens, "rgb" para quadros RGB24 concatenados
+            tamanho: (largura, altura) dos quadros
+            max_quadros: Número máximo de quadros aguardando gravação
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de exportação desconhecido: {formato}")
+        self.destino = destino
+        self.formato = formato
+        self.tamanho = tamanho
+        self.max_quadros = max_quadros
+        self.total_superficies = 0
+        self.livres = queue.SimpleQueue()
+        self.fila = queue.SimpleQueue()
+
+        if formato == "png":
+            os.makedirs(destino, exist_ok=True)
+            self.arquivo = None
+        else:
+            self.arquivo = open(destino, "wb")  # pylint: disable=consider-using-with
+
+        self.thread = threading.Thread(target=self._gravar, daemon=True)
+        self.thread.start()
+
+    def obter_superficie(self):
+        """Retorna uma superfície livre do pool para desenhar o próximo quadro."""
+        try:
+            return self.livres.get_nowait()
+        except queue.Empty:
+            if self.total_superficies < self.max_quadros:
+                self.total_superficies += 1
+                return pygame.Surface(self.tamanho, 0, 24, MASCARAS_RGB)
+            return self.livres.get()
+
+    def enviar(self, superficie):
+        """Entrega um quadro desenhado para gravação. A superfície não deve mais ser alterada."""
+        self.fila.put(superficie)
+
+    def fechar(self):
+        """Espera a gravação dos quadros pendentes e fecha o destino."""
+        self.fila.put(None)
+        self.thread.join()
+        if self.arquivo is not None:
+            self.arquivo.close()
+
+    def _gravar(self):
+        """Laço da thread de gravação: grava os quadros na ordem em que chegam até receber None."""
+        numero = 0
+        while True:
+            superficie = self.fila.get()
+            if superficie is None:
+                return
+            if self.formato == "png":
+                pygame.image.save(superficie, os.path.join(self.destino, f"quadro_{numero:06d}.png"))
+            else:
+                self._gravar_rgb(superficie)
+            numero += 1
+            self.livres.put(superficie)
+
+    def _gravar_rgb(self, superficie):
+        """Grava os pixels da superfície direto do buffer dela, linha a linha se houver preenchimento."""
+        largura, altura = self.tamanho
+        bytes_linha = largura * 3
+        pitch = superficie.get_pitch()
+        dados = memoryview(superficie.get_buffer())
+        try:
+            if pitch == bytes_linha:
+                self.arquivo.write(dados)
+            else:
+                for y in range(altura):
+                    self.arquivo.write(dados[y * pitch:y * pitch + bytes_linha])
+        finally:
+            dados.release()
+
+def exportar(replay, destino, formato="png", tamanho=TAMANHO_PADRAO, max_quadros=64):
+    """
+    Re-simula um replay desenhando cada tick fora da tela, o mais rápido possível,
+    e grava os quadros como PNGs ou como um fluxo RGB24 bruto.
+
+    Funciona sem janela: se nenhum driver de vídeo foi escolhido, usa o driver "dummy" do SDL.
+    A animação dos power pellets segue o tempo do jogo (tick / FPS_VIDEO), então o mesmo
+    replay gera sempre os mesmos quadros.
+
+    Returns:
+        O número de quadros exportados
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    iniciar_pygame()
+    # A janela (invisível no driver dummy) é necessária para converter os sprites
+    pygame.display.set_mode(tamanho)
+    estado = replay.criar_estado(pacman_sprites=pacman_sprite.PacmanSprite("assets/pacman"))
+    camada = CamadaLabirinto()
+    camada.relogio = lambda: estado.tick * 1000 // FPS_VIDEO
+    hud = Hud()
+    camera = Camera(*tamanho)
+    escritor = EscritorQuadros(destino, formato, tamanho, max_quadros)
+
+    quadros = 0
+    try:
+        for direcao in replay.direcoes():
+            estado.atualizar(direcao)
+            superficie = escritor.obter_superficie()
+            desenhar_jogo(superficie, estado, camada, hud, camera)
+            escritor.enviar(superficie)
+            quadros += 1
+    finally:
+        escritor.fechar()
+        pygame.quit()
+    return quadros
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta os quadros de um replay do PacDevs sem janela")
+    parser.add_argument("arquivo", help="arquivo de replay gravado com main.py --gravar")
+    parser.add_argument("destino", help="pasta dos PNGs ou arquivo do fluxo RGB bruto")
+    parser.add_argument("--formato", choices=FORMATOS, default="png",
+                        help="png: sequência de imagens; rgb: quadros RGB24 concatenados")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    total = exportar(carregar_replay(args.arquivo), args.destino, args.formato)
+    duracao = time.perf_counter() - inicio
+    print(f"{total} quadros em {duracao:.2f}s ({total / max(duracao, 1e-9):.0f} quadros/s)")
+    if args.formato == "rgb":
+        largura, altura = TAMANHO_PADRAO
+        print(f"Para converter: ffmpeg -f rawvideo -pixel_format rgb24 -video_size {largura}x{altura} "
+              f"-framerate {FPS_VIDEO} -i {args.destino} saida.mp4")
@@ -1,16 +1,29 @@
-import pygame
 import random
 import math
 from maze_generator import CASA_FANTASMA, PAREDE
 
+# O pygame e o atlas são importados só nos métodos de sprite e desenho, para que a
+# simulação sem gráficos não pague pela importação do pygame
+
+# Superfícies compostas dos fantasmas, compartilhadas entre fantasmas e níveis
+# Chave: (sprite, personalidade, tile_size, estado, piscando, direção)
+_superficies_compostas = {}
+
 class GhostSprite:
     """Gerencia os sprites dos fantasmas"""
     def __init__(self, image_path):
-        self.image = pygame.image.load(image_path).convert_alpha()
-        # Redimensionar para o tamanho apropriado se necessário
-        # Assumindo que queremos fantasmas de tamanho 30x30 pixels
-        target_size = (30, 30)
-        self.image = pygame.transform.scale(self.image, target_size)
+        import pygame
+        from atlas import obter_atlas
+
+        # O atlas já guarda o sprite redimensionado; sem ele, carrega e redimensiona o PNG
+        atlas = obter_atlas()
+        self.image = atlas.get_frame(image_path) if atlas else None
+        if self.image is None:
+            self.image = pygame.image.load(image_path).convert_alpha()
+            # Redimensionar para o tamanho apropriado se necessário
+            # Assumindo que queremos fantasmas de tamanho 30x30 pixels
+            target_size = (30, 30)
+            self.image = pygame.transform.scale(self.image, target_size)
 
 class Ghost:
     """Classe que representa um fantasma no jogo"""
@@ -24,38 +37,61 @@ class Ghost:
     DISPERSAR = 1  # Ir para cantos específicos
     ASSUSTADO = 2  # Movimento aleatório quando vulnerável
     
-    def __init__(self, x, y, sprite_path, tile_size, personalidade="perseguidor"):
+    def __init__(self, x, y, sprite_path, tile_size, personalidade="perseguidor", gerador=None):
         """
         Inicializa um novo fantasma.
         
         Args:
             x, y: Posição inicial
-            sprite_path: Caminho para a imagem do fantasma
+            sprite_path: Caminho para a imagem do fantasma (None para simulação sem gráficos)
             tile_size: Tamanho de cada bloco do labirinto
             personalidade: Define o comportamento do fantasma ('perseguidor', 'emboscador', 
                           'vagante' ou 'imprevisível')
+            gerador: Gerador de números aleatórios (usa o módulo random se não informado)
         """
+        # Se não foi fornecido gerador, usa o módulo random padrão
+        if gerador is None:
+            gerador = random
+        self.gerador = gerador
+        
         self.x = x
         self.y = y
         self.tile_size = tile_size
-        self.sprite = GhostSprite(sprite_path)
+        self.sprite_path = sprite_path
+        self.sprite = GhostSprite(sprite_path) if sprite_path else None
         self.velocidade = 4  # Velocidade aumentada para movimento mais fluido
         self.estado = self.NORMAL
         self.modo = self.PERSEGUIR
         self.personalidade = personalidade
-        self.direcao_atual = random.choice(["up", "down", "left", "right"])
+        self.direcao_atual = self.gerador.choice(["up", "down", "left", "right"])
         self.tempo_vulneravel = 0
         self.tempo_modo_atual = 0
         self.tempo_total = 0
         self.posicao_inicio = (x, y)
         self.comido = False
         
+        # Cache da saída da casa dos fantasmas (ver _encontrar_saida_casa)
+        self._saida_casa_mapa = None
+        self._saida_casa = None
+        
         # Cada fantasma tem uma posição alvo diferente no modo dispersar
         self.posicao_dispersar = self._definir_posicao_dispersar()
         
         # Cor para desenhar em modo de debug
         self.cor = (255, 0, 0)  # Vermelho por padrão
     
+    def snapshot(self):
+        """Retorna o estado numérico do fantasma (sem o sprite) como uma tupla."""
+        return (self.x, self.y, self.velocidade, self.estado, self.modo, self.direcao_atual,
+                self.tempo_vulneravel, self.tempo_modo_atual, self.tempo_total,
+                self.posicao_inicio, self.comido)
+
+    def restore(self, dados):
+        """Restaura um estado retornado por snapshot()."""
+        (self.x, self.y, self.velocidade, self.estado, self.modo, self.direcao_atual,
+         self.tempo_vulneravel, self.tempo_modo_atual, self.tempo_total,
+         self.posicao_inicio, self.comido) = dados
+    
     def _definir_posicao_dispersar(self):
         """Define para onde o fantasma vai quando está no modo dispersar"""
         if self.personalidade == "perseguidor":
@@ -84,7 +120,16 @@ class Ghost:
         return False
         
     def _encontrar_saida_casa(self, mapa):
-        """Encontra a saída da casa dos fantasmas"""
+        """Encontra a saída da casa dos fantasmas (calculada uma vez por mapa)"""
+        # As paredes não mudam durante o nível, então a saída só muda quando o mapa muda
+        if self._saida_casa_mapa is mapa:
+            return self._saida_casa
+        self._saida_casa_mapa = mapa
+        self._saida_casa = self._procurar_saida_casa(mapa)
+        return self._saida_casa
+
+    def _procurar_saida_casa(self, mapa):
+        """Procura no mapa a saída da casa dos fantasmas"""
         altura = len(mapa)
         largura = len(mapa[0])
         
@@ -142,7 +187,7 @@ class Ghost:
             self.direcao_atual = "up"  # Quando volta ao normal na casa, vai para cima
         else:
             # Escolher direção inicial aleatória quando volta ao normal para evitar padrões repetitivos
-            self.direcao_atual = random.choice(["up", "down", "left", "right"])
+            self.direcao_atual = self.gerador.choice(["up", "down", "left", "right"])
         
         # Pequeno atraso antes de começar a perseguir novamente (alternância de modos)
         self.tempo_modo_atual = 0
@@ -221,7 +266,7 @@ class Ghost:
             chance_aleatoria = 0.6  # Menos aleatório quando vulnerável para fuga mais eficiente
         
         # Decidir se vai fazer um movimento aleatório
-        movimento_aleatorio = random.random() < chance_aleatoria
+        movimento_aleatorio = self.gerador.random() < chance_aleatoria
         
         # Etapa 1: Verificar todas as direções (exceto a oposta em corredores) 
         # para encontrar caminhos válidos
@@ -294,7 +339,7 @@ class Ghost:
                         distancia = -distancia  # Inverte para preferir distâncias maiores
                     elif movimento_aleatorio and self.estado == self.NORMAL:
                         # Adicionar ruído para comportamento mais imprevisível
-                        fator_aleatorio = 0.7 + random.random() * 0.6  # Entre 0.7 e 1.3
+                        fator_aleatorio = 0.7 + self.gerador.random() * 0.6  # Entre 0.7 e 1.3
                         distancia = distancia * fator_aleatorio
                     
                     # Dar preferência à direção atual em corredores para movimento mais fluido
@@ -330,7 +375,7 @@ class Ghost:
         if not direcoes_validas:
             print("AVISO: Fantasma sem saída. Usando direção aleatória.")
             # Tentar qualquer direção, mesmo que pareça inválida
-            return random.choice(["up", "down", "left", "right"])
+            return self.gerador.choice(["up", "down", "left", "right"])
         
         # Comportamento baseado no estado e personalidade
         if self.estado == self.VULNERAVEL:
@@ -339,9 +384,9 @@ class Ghost:
             direcoes_validas.sort(key=lambda x: x[1])  # Menor valor primeiro (que na verdade é a maior distância)
             
             # Adicionar aleatoriedade para evitar padrões previsíveis
-            if len(direcoes_validas) > 1 and random.random() < 0.4:
+            if len(direcoes_validas) > 1 and self.gerador.random() < 0.4:
                 # Escolher aleatoriamente entre as duas melhores opções de fuga
-                return random.choice(direcoes_validas[:2])[0]
+                return self.gerador.choice(direcoes_validas[:2])[0]
             return direcoes_validas[0][0]  # Melhor opção para fugir
             
         elif self.estado == self.COMIDO:
@@ -360,7 +405,7 @@ class Ghost:
                 
             elif self.personalidade == "emboscador":
                 # Emboscador (Pinky): tenta interceptar o pacman, mas é bastante direto
-                if len(direcoes_validas) > 1 and random.random() < 0.15:
+                if len(direcoes_validas) > 1 and self.gerador.random() < 0.15:
                     # Ocasionalmente escolhe a segunda melhor opção para ser menos previsível
                     return direcoes_validas[1][0]
                 return direcoes_validas[0][0]  # Normalmente a melhor opção
@@ -369,15 +414,15 @@ class Ghost:
                 # Vagante (Inky): comportamento mais indireto e errático
                 if len(direcoes_validas) > 1:
                     # 50% de chance de escolher entre as duas melhores opções
-                    if random.random() < 0.5:
-                        return random.choice(direcoes_validas[:2])[0]
+                    if self.gerador.random() < 0.5:
+                        return self.gerador.choice(direcoes_validas[:2])[0]
                 return direcoes_validas[0][0]
                 
             else:  # "imprevisível" (Clyde)
                 # Completamente imprevisível, mas ainda com tendência a se aproximar
                 # 70% de chance de escolher aleatoriamente entre as direções válidas
-                if len(direcoes_validas) > 1 and random.random() < 0.7:
-                    return random.choice(direcoes_validas)[0]  # Completamente aleatório
+                if len(direcoes_validas) > 1 and self.gerador.random() < 0.7:
+                    return self.gerador.choice(direcoes_validas)[0]  # Completamente aleatório
                 return direcoes_validas[0][0]  # 30% de chance de escolher o melhor caminho
         
         # Fallback: continuar na direção atual ou escolher aleatoriamente
@@ -610,7 +655,7 @@ class Ghost:
                     else:
                         # Se não pode mover para cima, tentar outras direções
                         direcoes = ["left", "right", "down"]
-                        random.shuffle(direcoes)
+                        self.gerador.shuffle(direcoes)
                         
                         for dir in direcoes:
                             nova_x, nova_y = self.x, self.y
@@ -717,7 +762,7 @@ class Ghost:
             # Se não pode mover, escolher uma direção aleatória como último recurso
             direcoes = ["up", "down", "left", "right"]
             direcoes.remove(self.direcao_atual)  # Remover a direção atual
-            random.shuffle(direcoes)
+            self.gerador.shuffle(direcoes)
             
             for dir in direcoes:
                 nova_x, nova_y = self.x, self.y
@@ -849,7 +894,7 @@ class Ghost:
         
         # Se temos direções viáveis, escolher uma aleatoriamente
         if direcoes_viaveis:
-            nova_direcao = random.choice(direcoes_viaveis)
+            nova_direcao = self.gerador.choice(direcoes_viaveis)
             self.direcao_atual = nova_direcao
             nova_x, nova_y = self._calcular_nova_posicao(nova_direcao)
             
@@ -872,38 +917,59 @@ class Ghost:
             if self.pode_mover_para(nova_x, nova_y, mapa):
                 self.x, self.y = nova_x, nova_y
     
-    def desenhar(self, screen):
-        """Desenha o fantasma na tela"""
-        # Desenhar sprite base
-        screen.blit(self.sprite.image, (self.x, self.y))
+    def desenhar(self, screen, deslocamento=(0, 0)):
+        """
+        Desenha o fantasma na tela. Retorna o retângulo da tela ocupado pelo fantasma.
+        `deslocamento` é somado à posição (ex.: deslocamento da câmera).
+        """
+        import pygame
+
+        # Sprite, overlay de estado, olhos e seta já compostos em uma única superfície
+        return screen.blit(self._superficie_composta(),
+                           (self.x + deslocamento[0], self.y + deslocamento[1]),
+                           special_flags=pygame.BLEND_PREMULTIPLIED)
+    
+    def _superficie_composta(self):
+        """Retorna a superfície do fantasma para o estado, piscada e direção atuais (em cache)."""
+        # Piscar quando o tempo de vulnerabilidade estiver acabando
+        piscando = (self.estado == self.VULNERAVEL and
+                    self.tempo_vulneravel < 100 and self.tempo_vulneravel % 20 < 10)
+        # Fantasma comido não mostra a seta de direção
+        direcao = self.direcao_atual if self.estado != self.COMIDO else None
+        
+        chave = (self.sprite_path, self.personalidade, self.tile_size, self.estado, piscando, direcao)
+        superficie = _superficies_compostas.get(chave)
+        if superficie is None:
+            superficie = self._compor_superficie(piscando, direcao)
+            _superficies_compostas[chave] = superficie
+        return superficie
+    
+    def _compor_superficie(self, piscando, direcao):
+        """
+        Compõe sprite, overlay de estado, olhos e seta em uma superfície com alfa pré-multiplicado,
+        que desenhada com BLEND_PREMULTIPLIED tem o mesmo resultado de desenhar cada camada na tela.
+        """
+        import pygame
+
+        superficie = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        
+        # Desenhar sprite base (copiado antes: premul_alpha() de uma subsuperfície do atlas
+        # devolve pixels errados)
+        superficie.blit(self.sprite.image.copy().premul_alpha(), (0, 0),
+                        special_flags=pygame.BLEND_PREMULTIPLIED)
         
         # Mostrar estado visualmente com overlays
         overlay = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
         
         if self.estado == self.VULNERAVEL:
-            # Piscar quando o tempo de vulnerabilidade estiver acabando
-            if self.tempo_vulneravel < 100 and self.tempo_vulneravel % 20 < 10:
+            if piscando:
                 overlay.fill((255, 255, 255, 100))  # Branco piscando (vulnerabilidade acabando)
             else:
                 overlay.fill((0, 0, 255, 150))  # Azul semi-transparente (vulnerável)
-            screen.blit(overlay, (self.x, self.y))
             
         elif self.estado == self.COMIDO:
             # Fantasma comido (apenas olhos)
             overlay.fill((0, 0, 0, 200))  # Preto semi-transparente
-            screen.blit(overlay, (self.x, self.y))
-            
-            # Desenhar olhos brancos
-            olho_raio = self.tile_size // 6
-            olho_y = self.y + self.tile_size // 3
-            
-            # Olho esquerdo
-            olho_esq_x = self.x + self.tile_size // 3 - olho_raio // 2
-            pygame.draw.circle(screen, (255, 255, 255), (olho_esq_x + olho_raio, olho_y + olho_raio), olho_raio)
-            
-            # Olho direito
-            olho_dir_x = self.x + 2 * self.tile_size // 3 - olho_raio // 2
-            pygame.draw.circle(screen, (255, 255, 255), (olho_dir_x + olho_raio, olho_y + olho_raio), olho_raio)
             
         else:  # NORMAL
             # Adicionar efeito de brilho sutil de acordo com a personalidade
@@ -916,24 +982,37 @@ class Ghost:
             else:  # "imprevisível"
                 overlay.fill((255, 165, 0, 50))  # Laranja sutil
                 
-            screen.blit(overlay, (self.x, self.y))
+        superficie.blit(overlay.premul_alpha(), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+        
+        if self.estado == self.COMIDO:
+            # Desenhar olhos brancos
+            olho_raio = self.tile_size // 6
+            olho_y = self.tile_size // 3
+            
+            # Olho esquerdo
+            olho_esq_x = self.tile_size // 3 - olho_raio // 2
+            pygame.draw.circle(superficie, (255, 255, 255), (olho_esq_x + olho_raio, olho_y + olho_raio), olho_raio)
+            
+            # Olho direito
+            olho_dir_x = 2 * self.tile_size // 3 - olho_raio // 2
+            pygame.draw.circle(superficie, (255, 255, 255), (olho_dir_x + olho_raio, olho_y + olho_raio), olho_raio)
             
         # Indicador de direção (pequena seta na direção atual)
-        if self.estado != self.COMIDO:
+        if direcao is not None:
             seta_tamanho = self.tile_size // 6
             seta_cor = (255, 255, 255)
-            centro_x = self.x + self.tile_size // 2
-            centro_y = self.y + self.tile_size // 2
+            centro_x = self.tile_size // 2
+            centro_y = self.tile_size // 2
             
-            if self.direcao_atual == "right":
+            if direcao == "right":
                 pontos = [(centro_x, centro_y), 
                          (centro_x + seta_tamanho, centro_y - seta_tamanho // 2),
                          (centro_x + seta_tamanho, centro_y + seta_tamanho // 2)]
-            elif self.direcao_atual == "left":
+            elif direcao == "left":
                 pontos = [(centro_x, centro_y), 
                          (centro_x - seta_tamanho, centro_y - seta_tamanho // 2),
                          (centro_x - seta_tamanho, centro_y + seta_tamanho // 2)]
-            elif self.direcao_atual == "up":
+            elif direcao == "up":
                 pontos = [(centro_x, centro_y), 
                          (centro_x - seta_tamanho // 2, centro_y - seta_tamanho),
                          (centro_x + seta_tamanho // 2, centro_y - seta_tamanho)]
@@ -942,7 +1021,9 @@ class Ghost:
                          (centro_x - seta_tamanho // 2, centro_y + seta_tamanho),
                          (centro_x + seta_tamanho // 2, centro_y + seta_tamanho)]
                 
-            pygame.draw.polygon(screen, seta_cor, pontos)
+            pygame.draw.polygon(superficie, seta_cor, pontos)
+        
+        return superficie
         
     def _centralizar_na_grade(self):
         """Centraliza o fantasma na grade para melhor navegação nos corredores"""
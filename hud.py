@@ -0,0 +1,44 @@
+import pygame
+
+COR_TEXTO = (255, 255, 255)
+
+class Hud:
+    """
+    HUD de nível e pontuação.
+
+    A fonte é carregada uma única vez e o texto de cada linha fica em cache junto com o
+    valor exibido, então o texto só é renderizado de novo quando o nível ou a pontuação
+    mudam. Nos outros frames o HUD custa apenas dois blits.
+    """
+    def __init__(self, fonte=None):
+        """
+        Args:
+            fonte: pygame.font.Font a usar (Arial 24 negrito se não informada; requer pygame.font iniciado)
+        """
+        self.fonte = fonte if fonte is not None else pygame.font.SysFont('Arial', 24, bold=True)
+        # Linha -> (valor exibido, Surface renderizada)
+        self._cache = {}
+
+    def desenhar(self, screen, estado):
+        """Desenha o HUD do estado. Retorna os retângulos desenhados."""
+        return self.exibir_informacoes(screen, estado.nivel, estado.pontuacao)
+
+    def exibir_informacoes(self, screen, nivel, pontuacao):
+        """Exibe informações de nível e pontuação na tela. Retorna os retângulos desenhados."""
+        # Informação de nível
+        rect_nivel = screen.blit(self._texto("nivel", "Nível", nivel), (20, 20))
+
+        # Informação de pontuação
+        rect_pontuacao = screen.blit(self._texto("pontuacao", "Pontuação", pontuacao), (20, 50))
+
+        return [rect_nivel, rect_pontuacao]
+
+    def _texto(self, linha, rotulo, valor):
+        """Retorna a Surface da linha, renderizando-a só se o valor mudou."""
+        em_cache = self._cache.get(linha)
+        if em_cache is not None and em_cache[0] == valor:
+            return em_cache[1]
+
+        superficie = self.fonte.render(f'{rotulo}: {valor}', True, COR_TEXTO)
+        self._cache[linha] = (valor, superficie)
+        return superficie
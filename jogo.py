@@ -0,0 +1,398 @@
+import copy
+import glob
+import random
+from bisect import bisect_right
+import pacman as modulo_pacman
+from pacman import Pacman
+from ghost import Ghost
+from maze_generator import gerar_labirinto, CASA_FANTASMA, POWER_PELLET
+from pontos import PontosNivel
+
+TILE_SIZE = 34
+
+# Distância Manhattan, em pixels, a partir da qual dois fantasmas nem são testados para colisão
+DISTANCIA_COLISAO_FANTASMAS = TILE_SIZE * 1.5
+# A partir de quantos fantasmas os pares são procurados em uma grade
+# (ver EstadoJogo._verificar_colisoes_fantasmas)
+MIN_FANTASMAS_GRADE = 16
+
+# Personalidades dos fantasmas, atribuídas em ordem na criação
+PERSONALIDADES = ["perseguidor", "emboscador", "vagante", "imprevisível"]
+
+class EstadoJogo:
+    """
+    Estado completo de uma partida (mapa, Pacman, fantasmas, pontuação e nível).
+
+    Toda a aleatoriedade da partida vem de um único gerador criado a partir de `seed`,
+    então a mesma seed com as mesmas entradas reproduz exatamente a mesma partida.
+    A simulação não depende de janela: sem sprites, roda totalmente sem gráficos.
+    """
+    def __init__(self, seed=None, seed_labirinto=None, nivel=1, pacman_sprites=None,
+                 carregar_sprites=True, blocos_labirinto=(4, 3)):
+        """
+        Args:
+            seed: Seed do gerador da partida (sorteada se não informada)
+            seed_labirinto: Seed do labirinto do primeiro nível (derivada de `seed` se não informada)
+            nivel: Nível inicial
+            pacman_sprites: Sprites do Pacman (None para simulação sem gráficos)
+            carregar_sprites: Se False, os fantasmas são criados sem carregar imagens
+            blocos_labirinto: (largura, altura) em blocos dos labirintos gerados (ver gerar_labirinto)
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.gerador = random.Random(self.seed)
+        self.carregar_sprites = carregar_sprites
+        self.blocos_labirinto = blocos_labirinto
+        self.nivel = nivel
+        self.pontuacao = 0
+        self.tick = 0
+
+        # Direção do Pacman vista pelos fantasmas (ver pacman.direcao_pacman_global)
+        self.direcao_pacman = "right"
+
+        # perfil.PerfilFrame que mede as etapas do tick (None = sem medição)
+        self.perfil = None
+
+        # lod_fantasmas.AgendadorLOD que simplifica os fantasmas distantes (None = IA completa)
+        self.lod = None
+
+        # movimento_segmentos.MovimentoSegmentos que move as entidades pelo grafo de
+        # corredores (None = movimento original, pixel a pixel); tem precedência sobre o LOD
+        self.movimento = None
+
+        self._gerar_nivel(seed_labirinto)
+        self.seed_labirinto_inicial = self.seed_labirinto
+
+        start_pos = encontrar_posicao_inicial(self.mapa)
+        self.pacman = Pacman(x=start_pos[0], y=start_pos[1], sprites=pacman_sprites)
+
+    def _gerar_nivel(self, seed_labirinto=None):
+        """Gera o labirinto e os fantasmas do nível atual."""
+        # A seed é sempre sorteada para que o gerador avance igual com ou sem seed explícita
+        seed_sorteada = self.nivel * 1000 + self.gerador.randint(0, 999)
+        self.seed_labirinto = seed_labirinto if seed_labirinto is not None else seed_sorteada
+
+        blocos_largura, blocos_altura = self.blocos_labirinto
+        self.mapa, self.mascaras_parede = gerar_labirinto(blocos_largura, blocos_altura, self.nivel,
+                                                          seed=self.seed_labirinto, com_mascaras=True)
+
+        # Bitset dos pontos ainda não coletados
+        self.pontos = PontosNivel(self.mapa)
+
+        self.fantasmas = criar_fantasmas(self.mapa, self.gerador, self.carregar_sprites)
+
+    def atualizar(self, direcao=None):
+        """
+        Avança a simulação em um tick.
+
+        Args:
+            direcao: Direção desejada do Pacman neste tick (mantém a atual se None)
+        """
+        pacman = self.pacman
+        perfil = self.perfil
+
+        # Cada partida tem sua própria direção global do Pacman
+        modulo_pacman.direcao_pacman_global = self.direcao_pacman
+
+        if direcao is not None:
+            pacman.direcao_desejada = direcao
+        if pacman.direcao_desejada == pacman.direcao:
+            modulo_pacman.direcao_pacman_global = pacman.direcao
+
+        movimento = self.movimento
+        if movimento is None:
+            pacman.mover(self.mapa)
+        else:
+            movimento.mover_pacman(pacman, self.mapa, TILE_SIZE)
+        pacman.atualizar_animacao()
+        if perfil is not None:
+            perfil.marcar("pacman")
+
+        # Verificar coleta de pontos - usando o centro do Pac-Man
+        centro_x = pacman.x + TILE_SIZE // 2
+        centro_y = pacman.y + TILE_SIZE // 2
+        col = centro_x // TILE_SIZE
+        row = centro_y // TILE_SIZE
+
+        pontos = self.pontos
+        if 0 <= row < pontos.altura and 0 <= col < pontos.largura and pontos.remover(row, col):
+            if self.mapa[row][col] != POWER_PELLET:  # É um ponto comum
+                self.pontuacao += 10       # Incrementa pontuação
+            else:  # É um power pellet
+                self.pontuacao += 50       # Power pellets valem mais pontos
+
+                # Quando o Pacman come um power pellet, os fantasmas ficam vulneráveis
+                for fantasma in self.fantasmas:
+                    fantasma.tornar_vulneravel(500)  # Vulnerável por 500 frames
+        if perfil is not None:
+            perfil.marcar("pontos")
+
+        # Mover fantasmas e verificar colisões
+        lod = self.lod if movimento is None else None
+        if lod is not None:
+            lod.preparar(pacman.x, pacman.y, self.mapa, TILE_SIZE)
+        for fantasma in self.fantasmas:
+            if movimento is not None:
+                movimento.mover_fantasma(fantasma, pacman.x, pacman.y, self.mapa)
+            elif lod is None:
+                fantasma.mover(pacman.x, pacman.y, self.mapa)
+            else:
+                lod.mover(fantasma, pacman.x, pacman.y, self.mapa)
+            if perfil is not None:
+                perfil.marcar("fantasmas")
+            resultado_colisao = fantasma.verificar_colisao_pacman(pacman.x, pacman.y)
+
+            if resultado_colisao == 1:  # Colisão normal - Pacman perde vida
+                # Resetar posição do Pacman
+                start_pos = encontrar_posicao_inicial(self.mapa)
+                pacman.x, pacman.y = start_pos
+
+                # Manter os fantasmas onde estão, apenas devolvê-los ao estado normal
+                # Isso é mais realista e evita problemas com fantasmas presos
+                for f in self.fantasmas:
+                    f.voltar_ao_normal()
+                break
+
+            if resultado_colisao == 2:  # Fantasma é comido
+                fantasma.foi_comido()
+                self.pontuacao += 200  # Pontuação por comer um fantasma
+            if perfil is not None:
+                perfil.marcar("colisoes")
+
+        self._verificar_colisoes_fantasmas()
+        if perfil is not None:
+            perfil.marcar("colisoes")
+
+        # Verificar se todos os pontos foram coletados
+        if self.pontos.limpo():
+            # Avançar para o próximo nível com um novo mapa procedural
+            self.nivel += 1
+            self._gerar_nivel()
+
+            # Posicionar o Pacman em um novo ponto inicial
+            start_pos = encontrar_posicao_inicial(self.mapa)
+            pacman.x, pacman.y = start_pos
+        if perfil is not None:
+            perfil.marcar("pontos")
+
+        self.direcao_pacman = modulo_pacman.direcao_pacman_global
+        self.tick += 1
+
+    def snapshot(self, incluir_gerador=False):
+        """
+        Captura o estado da partida para ser restaurado depois com restore().
+
+        Apenas o estado numérico das entidades é copiado: sprites não são copiados e o
+        bitset de pontos é compartilhado com o estado, sendo copiado só na próxima coleta
+        de ponto (copy-on-write).
+
+        Args:
+            incluir_gerador: Se True, inclui o estado do gerador aleatório, para que a
+                continuação após restore() seja idêntica (custa ~10µs e alguns KB)
+
+        Returns:
+            Uma tupla opaca com o estado da partida
+        """
+        return (self.tick, self.nivel, self.pontuacao, self.direcao_pacman,
+                self.seed_labirinto, self.mapa, self.mascaras_parede,
+                self.pontos, self.pontos.snapshot(),
+                tuple(self.fantasmas),
+                self.pacman.snapshot(),
+                tuple(fantasma.snapshot() for fantasma in self.fantasmas),
+                (self.movimento.snapshot([self.pacman] + self.fantasmas)
+                 if self.movimento is not None else None),
+                self.gerador.getstate() if incluir_gerador else None)
+
+    def restore(self, snapshot):
+        """
+        Restaura um estado retornado por snapshot(). Um snapshot pode ser restaurado várias
+        vezes, inclusive em outra partida: os pontos e os fantasmas de outra partida são
+        copiados, e os fantasmas passam a usar o gerador desta.
+        """
+        (self.tick, self.nivel, self.pontuacao, self.direcao_pacman,
+         self.seed_labirinto, self.mapa, self.mascaras_parede, pontos, estado_pontos,
+         fantasmas, estado_pacman, estados_fantasmas, estado_movimento, estado_gerador) = snapshot
+
+        if pontos is not self.pontos:
+            pontos = copy.copy(pontos)
+        self.pontos = pontos
+        self.pontos.restore(estado_pontos)
+        self.fantasmas = list(fantasmas)
+        for indice, fantasma in enumerate(self.fantasmas):
+            if fantasma.gerador is not self.gerador:
+                fantasma = self.fantasmas[indice] = copy.copy(fantasma)
+                fantasma.gerador = self.gerador
+        self.pacman.restore(estado_pacman)
+        for fantasma, estado_fantasma in zip(self.fantasmas, estados_fantasmas):
+            fantasma.restore(estado_fantasma)
+        if self.movimento is not None:
+            self.movimento.restore(estado_movimento, [self.pacman] + self.fantasmas)
+        if estado_gerador is not None:
+            self.gerador.setstate(estado_gerador)
+
+    def _verificar_colisoes_fantasmas(self):
+        """
+        Verifica colisões entre fantasmas e faz os envolvidos mudarem de direção.
+
+        Os pares são testados na ordem (i, j) de percorrer todos os pares, mas com muitos
+        fantasmas só os de células vizinhas de uma grade com o tamanho do filtro de
+        distância: os demais nunca passariam no filtro. Quem reage a uma colisão sai dos pares
+        seguintes, então as posições dos demais (e suas células) não mudam durante o laço.
+        """
+        fantasmas = self.fantasmas
+        fantasmas_colidiram = set()  # Conjunto para rastrear quais fantasmas já colidiram
+
+        # Otimização: só verificar colisões se tivermos mais de um fantasma
+        if len(fantasmas) <= 1:
+            return
+
+        # Com poucos fantasmas é mais barato testar todos os pares
+        grade = None
+        regioes = {}  # Célula da grade -> índices dos fantasmas nela e nas 8 vizinhas
+        if len(fantasmas) > MIN_FANTASMAS_GRADE:
+            grade = {}  # Célula da grade -> índices dos fantasmas nela, em ordem crescente
+            for indice, fantasma in enumerate(fantasmas):
+                celula = (int(fantasma.x // DISTANCIA_COLISAO_FANTASMAS),
+                          int(fantasma.y // DISTANCIA_COLISAO_FANTASMAS))
+                grade.setdefault(celula, []).append(indice)
+
+        for i, fantasma1 in enumerate(fantasmas):
+            # Ignorar se ele já colidiu neste frame ou está em estado COMIDO
+            if i in fantasmas_colidiram or fantasma1.estado == Ghost.COMIDO:
+                continue
+            # Evitar verificar o mesmo par duas vezes
+            if grade is None:
+                vizinhos = range(i + 1, len(fantasmas))
+            else:
+                celula = (int(fantasma1.x // DISTANCIA_COLISAO_FANTASMAS),
+                          int(fantasma1.y // DISTANCIA_COLISAO_FANTASMAS))
+                regiao = regioes.get(celula)
+                if regiao is None:
+                    # Montada uma vez e compartilhada por quem está na célula
+                    regiao = regioes[celula] = sorted(
+                        j for vizinha_x in (celula[0] - 1, celula[0], celula[0] + 1)
+                        for vizinha_y in (celula[1] - 1, celula[1], celula[1] + 1)
+                        for j in grade.get((vizinha_x, vizinha_y), ()))
+                vizinhos = regiao[bisect_right(regiao, i):]
+
+            for j in vizinhos:
+                fantasma2 = fantasmas[j]
+                if j in fantasmas_colidiram or fantasma2.estado == Ghost.COMIDO:
+                    continue
+
+                # Otimização: pré-verificação de distância para evitar cálculos desnecessários
+                # Se os fantasmas estão longe um do outro, não precisamos verificar colisão
+                dist_aprox = abs(fantasma1.x - fantasma2.x) + abs(fantasma1.y - fantasma2.y)
+                # Distância de Manhattan como filtro rápido
+                if dist_aprox > DISTANCIA_COLISAO_FANTASMAS:
+                    continue
+
+                # Verificar colisão precisa
+                if fantasma1.verificar_colisao_com_fantasma(fantasma2):
+                    # Ambos os fantasmas mudam de direção
+                    fantasma1.reagir_a_colisao(self.mapa)
+                    fantasma2.reagir_a_colisao(self.mapa)
+
+                    # Adicionar ao conjunto de fantasmas que já colidiram; os pares
+                    # seguintes de fantasma1 seriam todos ignorados
+                    fantasmas_colidiram.add(i)
+                    fantasmas_colidiram.add(j)
+                    break
+
+def encontrar_posicao_inicial(mapa):
+    """Encontra uma posição válida (corredor) para o Pacman começar."""
+    # No Pac-Man original, ele começa em uma posição específica na parte inferior central do mapa
+    altura = len(mapa)
+    largura = len(mapa[0])
+
+    # Posição clássica do Pac-Man (pouco abaixo do centro do mapa, similar ao jogo original)
+    posicao_y_preferida = altura * 3 // 4  # 3/4 da altura do mapa
+    centro_x = largura // 2
+
+    # Verificar a posição preferida
+    if 0 <= posicao_y_preferida < altura and mapa[posicao_y_preferida][centro_x] in [0, 2]:
+        # Retorna posição preferida do jogo original (centralizada no tile)
+        return centro_x * TILE_SIZE, posicao_y_preferida * TILE_SIZE
+
+    # Se a posição preferida não funcionar, verificar um pouco acima e abaixo
+    for offset in range(1, 5):
+        if posicao_y_preferida - offset >= 0 and mapa[posicao_y_preferida - offset][centro_x] in [0, 2]:
+            return centro_x * TILE_SIZE, (posicao_y_preferida - offset) * TILE_SIZE
+        if posicao_y_preferida + offset < altura and mapa[posicao_y_preferida + offset][centro_x] in [0, 2]:
+            return centro_x * TILE_SIZE, (posicao_y_preferida + offset) * TILE_SIZE
+
+    # Opção de backup: verificar o portal lateral
+    meio_y = altura // 2
+
+    # Verificar lado esquerdo primeiro (portal)
+    for x in range(3):
+        if mapa[meio_y][x] in [0, 2]:  # Corredor ou ponto
+            return x * TILE_SIZE, meio_y * TILE_SIZE
+
+    # Verificar lado direito (portal)
+    for x in range(largura - 3, largura):
+        if mapa[meio_y][x] in [0, 2]:
+            return x * TILE_SIZE, meio_y * TILE_SIZE
+
+    # Se ainda não encontrou, procura por qualquer corredor
+    for row in range(altura):
+        for col in range(largura):
+            if mapa[row][col] in [0, 2]:  # Corredor ou ponto
+                return col * TILE_SIZE, row * TILE_SIZE
+
+    # Se não encontrar, retorna posição padrão
+    return TILE_SIZE, TILE_SIZE
+
+def encontrar_posicao_fantasma(mapa, gerador=None):
+    """Encontra uma posição válida para um fantasma dentro da casa dos fantasmas."""
+    # Se não foi fornecido gerador, usa o módulo random padrão
+    if gerador is None:
+        gerador = random
+    altura = len(mapa)
+    largura = len(mapa[0])
+
+    # Procurar por células marcadas como CASA_FANTASMA
+    posicoes_casa = []
+    for y in range(altura):
+        for x in range(largura):
+            if mapa[y][x] == CASA_FANTASMA:
+                posicoes_casa.append((x, y))
+
+    # Se encontrou posições da casa, escolher uma aleatoriamente
+    if posicoes_casa:
+        x, y = gerador.choice(posicoes_casa)
+        return x * TILE_SIZE, y * TILE_SIZE
+
+    # Se não encontrou, retornar o centro do mapa
+    return (largura // 2) * TILE_SIZE, (altura // 2) * TILE_SIZE
+
+def criar_fantasmas(mapa, gerador=None, carregar_sprites=True):
+    """
+    Cria os fantasmas para o jogo usando os sprites disponíveis.
+    Com `carregar_sprites=False` as imagens não são carregadas (simulação sem gráficos).
+    """
+    # Se não foi fornecido gerador, usa o módulo random padrão
+    if gerador is None:
+        gerador = random
+    fantasmas = []
+
+    # Lista de todos os arquivos de sprite de fantasmas (ordenada para ser igual em qualquer sistema)
+    sprite_paths = sorted(glob.glob("assets/ghosts/*.png"))
+
+    # Criar um fantasma para cada sprite disponível (até 5)
+    for i, sprite_path in enumerate(sprite_paths[:5]):
+        # Encontrar uma posição inicial para o fantasma na casa dos fantasmas
+        pos_x, pos_y = encontrar_posicao_fantasma(mapa, gerador)
+
+        # Pequeno deslocamento para evitar sobreposição exata
+        pos_x += gerador.randint(-5, 5)
+        pos_y += gerador.randint(-5, 5)
+
+        # Criar fantasma com personalidade específica
+        personalidade = PERSONALIDADES[i % len(PERSONALIDADES)]
+        fantasma = Ghost(pos_x, pos_y, sprite_path if carregar_sprites else None,
+                         TILE_SIZE, personalidade, gerador)
+
+        # Adicionar à lista
+        fantasmas.append(fantasma)
+
+    return fantasmas
@@ -0,0 +1,177 @@
+from collections import deque
+from ghost import Ghost
+from maze_generator import PAREDE, CASA_FANTASMA
+
+RAIO_PADRAO = 8  # Distância, em células pelo labirinto, até onde os fantasmas usam só Ghost.mover
+
+DESLOCAMENTOS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+class AgendadorLOD:
+    """
+    Nível de detalhe da atualização dos fantasmas.
+
+    Fantasmas a até `raio` células do Pacman (distância pelos corredores), visíveis na
+    câmera ou comidos rodam Ghost.mover a cada tick. Os demais também são atualizados
+    todo tick, mas nos ticks em que só seguem reto pelo corredor (sem interseção, sem a
+    decisão periódica no centro da célula, sem parede à frente, sem ajuste de
+    centralização e sem voltar ao normal) o agendador aplica o passo diretamente, com
+    os mesmos contadores e portais de Ghost.mover, sem passar pela IA. Em qualquer
+    outro tick o fantasma roda Ghost.mover: as decisões continuam sendo da IA completa,
+    na mesma ordem de uso do gerador da partida, porque os fantasmas compartilham o
+    gerador e colidem uns com os outros a cada tick.
+
+    O resultado é o mesmo da IA completa para todos os fantasmas, então a simulação
+    continua determinística e o agendador não tem estado que precise entrar no snapshot
+    da partida. O ganho se limita aos ticks de corredor dos fantasmas distantes: os
+    ticks de decisão, os fantasmas na casa e os comidos custam o mesmo que sem o LOD.
+
+    Uso: EstadoJogo.lod = AgendadorLOD(...) (None = Ghost.mover para todos).
+    """
+    def __init__(self, raio=RAIO_PADRAO, camera=None):
+        """
+        Args:
+            raio: Distância máxima, em células pelo labirinto, para sempre usar Ghost.mover
+            camera: camera.Camera cujos fantasmas visíveis sempre usam Ghost.mover (opcional)
+        """
+        self.raio = raio
+        self.camera = camera
+        self._mapa = None
+        self._intersecoes = None  # Por célula: True se Ghost._esta_em_intersecao decide nela
+        self._origem = None
+        self._proximas = set()  # Células a até `raio` do Pacman
+        # Atualizações do último tick, para medição
+        self.completas = 0
+        self.simplificadas = 0
+
+    def preparar(self, pacman_x, pacman_y, mapa, tile_size):
+        """Começa um tick: recalcula a região próxima do Pacman se ele mudou de célula."""
+        if mapa is not self._mapa:
+            # Novo nível: as interseções são outras
+            self._mapa = mapa
+            self._intersecoes = _calcular_intersecoes(mapa)
+            self._origem = None
+        if self.camera is not None:
+            # A visibilidade depende só da posição do Pacman, não de quando a tela foi desenhada
+            self.camera.seguir(pacman_x, pacman_y, mapa)
+        origem = (int(pacman_y + tile_size // 2) // tile_size, int(pacman_x + tile_size // 2) // tile_size)
+        if origem != self._origem:
+            self._origem = origem
+            self._proximas = self._regiao(origem, mapa)
+        self.completas = 0
+        self.simplificadas = 0
+
+    def _regiao(self, origem, mapa):
+        """Células alcançáveis a partir de `origem` em até `raio` passos (busca em largura limitada)."""
+        altura, largura = len(mapa), len(mapa[0])
+        proximas = {origem}
+        fronteira = deque([(origem, 0)])
+        while fronteira:
+            (row, col), distancia = fronteira.popleft()
+            if distancia == self.raio:
+                continue
+            for d_row, d_col in DESLOCAMENTOS.values():
+                vizinha = ((row + d_row) % altura, (col + d_col) % largura)  # Portais nas bordas
+                if vizinha not in proximas and mapa[vizinha[0]][vizinha[1]] != PAREDE:
+                    proximas.add(vizinha)
+                    fronteira.append((vizinha, distancia + 1))
+        return proximas
+
+    def mover(self, fantasma, pacman_x, pacman_y, mapa):
+        """Atualiza o fantasma neste tick, com Ghost.mover ou o passo direto pelo corredor."""
+        if not self._ativo(fantasma, mapa) and self._seguir_corredor(fantasma, mapa):
+            self.simplificadas += 1
+            return
+        fantasma.mover(pacman_x, pacman_y, mapa)
+        self.completas += 1
+
+    def _ativo(self, fantasma, mapa):
+        """True se o fantasma precisa da IA completa neste tick."""
+        if fantasma.estado == Ghost.COMIDO:
+            return True
+        tile_size = fantasma.tile_size
+        row = int(fantasma.y + tile_size // 2) // tile_size
+        col = int(fantasma.x + tile_size // 2) // tile_size
+        if not (0 <= row < len(mapa) and 0 <= col < len(mapa[0])):
+            return True  # Atravessando um portal
+        if (row, col) in self._proximas:
+            return True
+        return self.camera is not None and self.camera.visivel(fantasma.x, fantasma.y, tile_size)
+
+    def _seguir_corredor(self, fantasma, mapa):
+        """
+        Aplica o tick de Ghost.mover de um fantasma que só segue reto pelo corredor.
+
+        Returns:
+            False, sem alterar o fantasma, se neste tick Ghost.mover tomaria alguma decisão
+            ou faria algo além do passo
+        """
+        deslocamento = DESLOCAMENTOS.get(fantasma.direcao_atual)
+        if deslocamento is None:
+            return False
+        if fantasma.estado == Ghost.VULNERAVEL and fantasma.tempo_vulneravel <= 1:
+            return False  # Volta ao normal neste tick, sorteando uma direção
+
+        tile_size = fantasma.tile_size
+        x, y = fantasma.x, fantasma.y
+        row = int((y + tile_size // 2) // tile_size)
+        col = int((x + tile_size // 2) // tile_size)
+        if not (0 <= row < len(mapa) and 0 <= col < len(mapa[0])):
+            return False
+        if mapa[row][col] == CASA_FANTASMA:
+            return False  # A saída da casa é feita por Ghost.mover
+
+        # Distância do centro da célula, como em Ghost.mover
+        dif_x = x - col * tile_size
+        dif_y = y - row * tile_size
+        if abs(dif_x) <= 3 and abs(dif_y) <= 3 and self._intersecoes[row][col]:
+            return False  # Decide a direção na interseção
+        if abs(dif_x) < 4 and abs(dif_y) < 4 and (fantasma.tempo_total + 1) % 20 == 0:
+            return False  # Decisão periódica no centro da célula
+        d_row, d_col = deslocamento
+        if abs(dif_y if d_col else dif_x) > 2:
+            return False  # Seria centralizado no corredor
+
+        nova_x = x + d_col * fantasma.velocidade
+        nova_y = y + d_row * fantasma.velocidade
+        # Ghost.pode_mover_para de quem está fora da casa: fora do mapa (portal) sempre pode
+        nova_row = int((nova_y + tile_size // 2) // tile_size)
+        nova_col = int((nova_x + tile_size // 2) // tile_size)
+        if (0 <= nova_row < len(mapa) and 0 <= nova_col < len(mapa[0])
+                and mapa[nova_row][nova_col] in (PAREDE, CASA_FANTASMA)):
+            return False  # Parede ou casa à frente
+
+        fantasma.tempo_total += 1
+        if fantasma.estado == Ghost.VULNERAVEL:
+            fantasma.tempo_vulneravel -= 1
+
+        # Portais nas bordas do mapa, como em Ghost.mover
+        largura_tela = len(mapa[0]) * tile_size
+        altura_tela = len(mapa) * tile_size
+        if nova_x < -tile_size:
+            nova_x = largura_tela - fantasma.velocidade
+        elif nova_x >= largura_tela:
+            nova_x = 0
+        if nova_y < -tile_size:
+            nova_y = altura_tela - fantasma.velocidade
+        elif nova_y >= altura_tela:
+            nova_y = 0
+        fantasma.x, fantasma.y = nova_x, nova_y
+        return True
+
+def _calcular_intersecoes(mapa):
+    """
+    Tabela, por célula, do teste de vizinhas de Ghost._esta_em_intersecao: mais de duas
+    saídas, ou duas que não são opostas (curva). Vizinhas fora do mapa contam como saída.
+    """
+    altura, largura = len(mapa), len(mapa[0])
+    intersecoes = []
+    for row in range(altura):
+        linha = []
+        for col in range(largura):
+            saidas = {direcao for direcao, (d_row, d_col) in DESLOCAMENTOS.items()
+                      if not (0 <= row + d_row < altura and 0 <= col + d_col < largura)
+                      or mapa[row + d_row][col + d_col] != PAREDE}
+            linha.append(len(saidas) > 2 or
+                         (len(saidas) == 2 and saidas not in ({"up", "down"}, {"left", "right"})))
+        intersecoes.append(linha)
+    return intersecoes
@@ -9,6 +9,12 @@ PONTO = 2
 CASA_FANTASMA = 3
 POWER_PELLET = 4
 
+# Bits da máscara de conexão de uma parede com as paredes vizinhas
+CONEXAO_CIMA = 1
+CONEXAO_BAIXO = 2
+CONEXAO_ESQUERDA = 4
+CONEXAO_DIREITA = 8
+
 # Mapa base inspirado no Pac-Man original
 MAPA_PACMAN_ORIGINAL = [
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
@@ -35,7 +41,7 @@ MAPA_PACMAN_ORIGINAL = [
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
 ]
 
-def gerar_labirinto(blocos_largura=4, blocos_altura=3, nivel=1):
+def gerar_labirinto(blocos_largura=4, blocos_altura=3, nivel=1, seed=None, com_mascaras=False):
     """
     Gera um labirinto estilo Pac-Man proceduralmente.
     O parâmetro nível permite criar mapas diferentes para cada fase.
@@ -44,9 +50,12 @@ def gerar_labirinto(blocos_largura=4, blocos_altura=3, nivel=1):
         blocos_largura: Número de blocos na largura do mapa
         blocos_altura: Número de blocos na altura do mapa
         nivel: Nível atual do jogo (influencia a geração)
+        seed: Seed do gerador (sorteada a partir do nível se não informada)
+        com_mascaras: Se True, retorna também as máscaras de conexão das paredes
         
     Returns:
-        Uma matriz 2D representando o labirinto
+        Uma matriz 2D representando o labirinto, ou (labirinto, máscaras) se com_mascaras
+        (ver calcular_mascaras_parede)
     """
     # Dimensões do mapa - garantir tamanhos mínimos e que a largura seja ímpar
     largura = max(19, blocos_largura * 4 + 1)
@@ -57,7 +66,8 @@ def gerar_labirinto(blocos_largura=4, blocos_altura=3, nivel=1):
     altura = altura if altura % 2 == 0 else altura + 1
     
     # Usamos o nível como seed para ter geração consistente mas diferente por fase
-    seed = nivel * 1000 + random.randint(0, 999)
+    if seed is None:
+        seed = nivel * 1000 + random.randint(0, 999)
     gerador = random.Random(seed)
     
     # Inicializa o mapa com corredores
@@ -144,8 +154,37 @@ def gerar_labirinto(blocos_largura=4, blocos_altura=3, nivel=1):
     # Combinar os mapas de paredes e pontos
     mapa_final = combinar_mapas(mapa, mapa_pontos, nivel, gerador)
     
+    if com_mascaras:
+        return mapa_final, calcular_mascaras_parede(mapa_final)
     return mapa_final
 
+def mascara_parede(mapa, row, col):
+    """Retorna a máscara de 4 bits (CONEXAO_*) das paredes vizinhas a uma parede (0 se não for parede)."""
+    if mapa[row][col] != PAREDE:
+        return 0
+    mascara = 0
+    if row > 0 and mapa[row-1][col] == PAREDE:
+        mascara |= CONEXAO_CIMA
+    if row < len(mapa)-1 and mapa[row+1][col] == PAREDE:
+        mascara |= CONEXAO_BAIXO
+    if col > 0 and mapa[row][col-1] == PAREDE:
+        mascara |= CONEXAO_ESQUERDA
+    if col < len(mapa[0])-1 and mapa[row][col+1] == PAREDE:
+        mascara |= CONEXAO_DIREITA
+    return mascara
+
+def calcular_mascaras_parede(mapa):
+    """
+    Calcula a máscara de conexão de cada célula do labirinto, uma única vez por mapa.
+    Renderizadores e exportadores leem a máscara em vez de consultar os vizinhos.
+
+    Returns:
+        Uma matriz 2D do tamanho do mapa; paredes têm os bits CONEXAO_* das paredes
+        vizinhas e as demais células têm 0
+    """
+    return [[mascara_parede(mapa, row, col) for col in range(len(mapa[0]))]
+            for row in range(len(mapa))]
+
 def criar_casa_fantasmas(mapa, largura, altura, gerador=None):
     """
     Cria a área central para os fantasmas, típica do Pac-Man.
@@ -377,20 +416,24 @@ def garantir_conectividade(mapa, gerador=None):
     largura = len(mapa[0])
     
     # Algoritmo Flood Fill para marcar áreas conectadas
+    # (iterativo, com pilha explícita, para não estourar a recursão em mapas grandes)
     def flood_fill(mapa, matriz_visitados, x, y, area_atual):
-        # Verificar limites e se a célula é válida para visita
-        if (x < 0 or y < 0 or x >= largura or y >= altura or
-            mapa[y][x] == PAREDE or matriz_visitados[y][x] != -1):
-            return
-        
-        # Marcar como visitado com o ID da área atual
-        matriz_visitados[y][x] = area_atual
-        
-        # Visitar os 4 vizinhos (cima, baixo, esquerda, direita)
-        flood_fill(mapa, matriz_visitados, x, y-1, area_atual)
-        flood_fill(mapa, matriz_visitados, x, y+1, area_atual)
-        flood_fill(mapa, matriz_visitados, x-1, y, area_atual)
-        flood_fill(mapa, matriz_visitados, x+1, y, area_atual)
+        pilha = [(x, y)]
+        while pilha:
+            x, y = pilha.pop()
+            # Verificar limites e se a célula é válida para visita
+            if (x < 0 or y < 0 or x >= largura or y >= altura or
+                mapa[y][x] == PAREDE or matriz_visitados[y][x] != -1):
+                continue
+            
+            # Marcar como visitado com o ID da área atual
+            matriz_visitados[y][x] = area_atual
+            
+            # Visitar os 4 vizinhos (cima, baixo, esquerda, direita)
+            pilha.append((x, y-1))
+            pilha.append((x, y+1))
+            pilha.append((x-1, y))
+            pilha.append((x+1, y))
     
     # Criar matriz para marcar áreas (-1 = não visitado)
     matriz_visitados = [[-1 for _ in range(largura)] for _ in range(altura)]
@@ -0,0 +1,258 @@
+import argparse
+import time
+from multiprocessing import shared_memory
+from jogo import EstadoJogo, PERSONALIDADES
+from observacao import Observador, NUM_PLANOS, ESCALARES, ALTURA_PADRAO, LARGURA_PADRAO, numpy
+from replay import DIRECOES, CODIGO_DIRECAO
+
+# Canal de observações e ações entre partidas e agentes em outros processos.
+#
+# Layout do bloco de memória compartilhada (tudo alinhado em 8 bytes):
+#   cabeçalho   uint64[8]: MAGIC, num_jogos, altura, largura, profundidade, max_fantasmas
+#   escritos    uint64[num_jogos]: número de quadros completos publicados por partida
+#   sequencias  uint64[num_jogos, profundidade]: seqlock de cada quadro (ímpar = em escrita)
+#   acoes       uint8[num_jogos]: direção desejada escrita pelo agente (SEM_ACAO = manter)
+#   planos      uint8[num_jogos, profundidade, NUM_PLANOS, altura, largura] (ver observacao.py)
+#   escalares   int32[num_jogos, profundidade, len(ESCALARES)]
+#   entidades   int32[num_jogos, profundidade, 1 + max_fantasmas, CAMPOS_ENTIDADE]
+# Cada partida tem um anel de `profundidade` quadros: o quadro n fica na posição
+# n % profundidade, então o agente pode ler um quadro enquanto os seguintes são escritos.
+MAGIC = 0x50444D43  # "PDMC"
+MAX_FANTASMAS = 5  # Capacidade padrão de fantasmas por quadro (criar_fantasmas cria até 5)
+# Colunas de cada entidade: linha 0 = Pacman, demais = fantasmas (linhas vazias ficam zeradas)
+ENTIDADE_X = 0
+ENTIDADE_Y = 1
+ENTIDADE_DIRECAO = 2        # Código de replay.DIRECOES, ou SEM_DIRECAO
+ENTIDADE_ESTADO = 3         # Estado do fantasma (Ghost.NORMAL...); 0 para o Pacman
+ENTIDADE_PERSONALIDADE = 4  # Índice em jogo.PERSONALIDADES; -1 para o Pacman
+ENTIDADE_PRESENTE = 5       # 1 se a linha tem uma entidade
+CAMPOS_ENTIDADE = 6
+SEM_DIRECAO = len(DIRECOES)
+SEM_ACAO = 255
+PROFUNDIDADE_PADRAO = 4
+
+def _alinhar(tamanho):
+    return (tamanho + 7) & ~7
+
+def _layout(num_jogos, altura, largura, profundidade, max_fantasmas):
+    """Retorna {nome: (deslocamento, dtype, forma)} das regiões do bloco e o tamanho total."""
+    regioes = [
+        ("cabecalho", numpy.uint64, (8,)),
+        ("escritos", numpy.uint64, (num_jogos,)),
+        ("sequencias", numpy.uint64, (num_jogos, profundidade)),
+        ("acoes", numpy.uint8, (num_jogos,)),
+        ("planos", numpy.uint8, (num_jogos, profundidade, NUM_PLANOS, altura, largura)),
+        ("escalares", numpy.int32, (num_jogos, profundidade, len(ESCALARES))),
+        ("entidades", numpy.int32, (num_jogos, profundidade, 1 + max_fantasmas, CAMPOS_ENTIDADE)),
+    ]
+    layout = {}
+    deslocamento = 0
+    for nome, dtype, forma in regioes:
+        layout[nome] = (deslocamento, dtype, forma)
+        deslocamento += _alinhar(int(numpy.prod(forma)) * numpy.dtype(dtype).itemsize)
+    return layout, deslocamento
+
+class CanalObservacoes:
+    """
+    Observações e ações de várias partidas em memória compartilhada, sem serialização.
+
+    O processo do jogo cria o canal (criar) e publica um quadro por tick; os agentes se
+    conectam pelo nome (conectar), leem os quadros direto da memória e escrevem a direção
+    desejada de cada partida. Cada quadro é protegido por um seqlock: o escritor incrementa
+    a sequência antes (fica ímpar) e depois (volta a par) de escrever, e o leitor copia o
+    quadro e confere que a sequência não mudou; se mudou, lê de novo. Nenhum lado espera
+    pelo outro. As ações são um byte por partida, escrito de forma atômica.
+
+    A tabela de entidades tem espaço para `max_fantasmas` fantasmas, definido ao criar o
+    canal; publicar uma partida com mais fantasmas que isso é um erro (ValueError), em vez
+    de o quadro sair incompleto.
+    """
+    def __init__(self, memoria, criador):
+        self.memoria = memoria
+        self.criador = criador
+        cabecalho = numpy.ndarray((8,), numpy.uint64, memoria.buf)
+        if int(cabecalho[0]) != MAGIC:
+            raise ValueError(f"Memória compartilhada {memoria.name} não é um canal do PacDevs")
+        (self.num_jogos, self.altura, self.largura, self.profundidade,
+         self.max_fantasmas) = (int(valor) for valor in cabecalho[1:6])
+
+        layout, _ = _layout(self.num_jogos, self.altura, self.largura, self.profundidade, self.max_fantasmas)
+        views = {nome: numpy.ndarray(forma, dtype, memoria.buf, deslocamento)
+                 for nome, (deslocamento, dtype, forma) in layout.items()}
+        self.cabecalho = views["cabecalho"]
+        self.escritos = views["escritos"]
+        self.sequencias = views["sequencias"]
+        self.acoes = views["acoes"]
+        self.planos = views["planos"]
+        self.escalares = views["escalares"]
+        self.entidades = views["entidades"]
+        self._observadores = None
+        self._personalidades = {personalidade: i for i, personalidade in enumerate(PERSONALIDADES)}
+
+    @classmethod
+    def criar(cls, nome, num_jogos, altura=ALTURA_PADRAO, largura=LARGURA_PADRAO,
+              profundidade=PROFUNDIDADE_PADRAO, max_fantasmas=MAX_FANTASMAS):
+        """Cria o canal (lado do jogo). O nome é usado pelos agentes para se conectar."""
+        _, tamanho = _layout(num_jogos, altura, largura, profundidade, max_fantasmas)
+        memoria = shared_memory.SharedMemory(name=nome, create=True, size=tamanho)
+        cabecalho = numpy.ndarray((8,), numpy.uint64, memoria.buf)
+        cabecalho[:] = 0
+        cabecalho[:6] = (MAGIC, num_jogos, altura, largura, profundidade, max_fantasmas)
+        canal = cls(memoria, criador=True)
+        canal.escritos[:] = 0
+        canal.sequencias[:] = 0
+        canal.acoes[:] = SEM_ACAO
+        return canal
+
+    @classmethod
+    def conectar(cls, nome):
+        """Conecta a um canal existente (lado do agente)."""
+        memoria = shared_memory.SharedMemory(name=nome)
+        try:
+            # Só o criador deve remover o bloco; sem isto o processo do agente o removeria ao sair
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memoria._name, "shared_memory")  # pylint: disable=protected-access
+        except (ImportError, AttributeError):
+            pass
+        return cls(memoria, criador=False)
+
+    def fechar(self):
+        """Desconecta do canal; o criador também remove o bloco de memória."""
+        # As views NumPy precisam ser liberadas antes de fechar o bloco
+        self.cabecalho = self.escritos = self.sequencias = self.acoes = None
+        self.planos = self.escalares = self.entidades = None
+        self._observadores = None
+        self.memoria.close()
+        if self.criador:
+            self.memoria.unlink()
+
+    # Lado do jogo
+
+    def publicar(self, indice, estado):
+        """Publica o quadro do tick atual da partida `indice`."""
+        if len(estado.fantasmas) > self.max_fantasmas:
+            raise ValueError(f"Partida {indice} tem {len(estado.fantasmas)} fantasmas; "
+                             f"o canal comporta {self.max_fantasmas} (ver CanalObservacoes.criar)")
+        if self._observadores is None:
+            # Um observador por posição do anel, escrevendo direto na memória compartilhada
+            self._observadores = [Observador(self.num_jogos, self.altura, self.largura,
+                                             self.planos[:, posicao], self.escalares[:, posicao])
+                                  for posicao in range(self.profundidade)]
+
+        numero = int(self.escritos[indice])
+        posicao = numero % self.profundidade
+        sequencias = self.sequencias[indice]
+        sequencias[posicao] += 1  # Ímpar: quadro em escrita
+
+        self._observadores[posicao].observar_jogo(indice, estado)
+        entidades = self.entidades[indice, posicao]
+        entidades.fill(0)
+        pacman = estado.pacman
+        entidades[0] = (pacman.x, pacman.y, CODIGO_DIRECAO.get(pacman.direcao, SEM_DIRECAO), 0, -1, 1)
+        for linha, fantasma in enumerate(estado.fantasmas, start=1):
+            entidades[linha] = (fantasma.x, fantasma.y, CODIGO_DIRECAO.get(fantasma.direcao_atual, SEM_DIRECAO),
+                                fantasma.estado, self._personalidades.get(fantasma.personalidade, -1), 1)
+
+        sequencias[posicao] += 1  # Par: quadro completo
+        self.escritos[indice] = numero + 1
+
+    def acao(self, indice):
+        """Direção desejada escrita pelo agente para a partida, ou None para manter a atual."""
+        codigo = int(self.acoes[indice])
+        return DIRECOES[codigo] if codigo < len(DIRECOES) else None
+
+    # Lado do agente
+
+    def criar_destino(self):
+        """Buffers do agente para receber um quadro com ler()."""
+        return {
+            "planos": numpy.empty(self.planos.shape[2:], numpy.uint8),
+            "escalares": numpy.empty(self.escalares.shape[2:], numpy.int32),
+            "entidades": numpy.empty(self.entidades.shape[2:], numpy.int32),
+        }
+
+    def ler(self, indice, destino, numero=None):
+        """
+        Copia para `destino` (ver criar_destino) o quadro `numero` da partida, ou o mais recente.
+
+        Returns:
+            O número do quadro lido, ou None se ele já foi sobrescrito no anel ou ainda não existe
+        """
+        while True:
+            escritos = int(self.escritos[indice])
+            if escritos == 0:
+                return None
+            if numero is None:
+                alvo = escritos - 1
+            elif numero >= escritos or numero < escritos - self.profundidade:
+                return None
+            else:
+                alvo = numero
+            posicao = alvo % self.profundidade
+
+            sequencia = int(self.sequencias[indice, posicao])
+            if sequencia & 1:
+                continue  # Quadro sendo escrito
+            numpy.copyto(destino["planos"], self.planos[indice, posicao])
+            numpy.copyto(destino["escalares"], self.escalares[indice, posicao])
+            numpy.copyto(destino["entidades"], self.entidades[indice, posicao])
+            if int(self.sequencias[indice, posicao]) == sequencia and int(self.escritos[indice]) - alvo <= self.profundidade:
+                return alvo
+
+    def esperar_quadro(self, indice, numero, timeout=1.0, intervalo=0.0005):
+        """Espera até que o quadro `numero` da partida seja publicado. Retorna False se o tempo acabar."""
+        limite = time.monotonic() + timeout
+        while int(self.escritos[indice]) <= numero:
+            if time.monotonic() > limite:
+                return False
+            time.sleep(intervalo)
+        return True
+
+    def escrever_acao(self, indice, direcao):
+        """Define a direção desejada do Pacman na partida (None = manter a atual)."""
+        self.acoes[indice] = CODIGO_DIRECAO[direcao] if direcao is not None else SEM_ACAO
+
+def hospedar(nome, num_jogos, fps=None, ticks=None, seed=None):
+    """
+    Executa `num_jogos` partidas sem gráficos publicando cada tick no canal `nome`.
+
+    A cada tick, a ação de cada partida é lida do canal antes de avançar a simulação.
+
+    Args:
+        fps: Ticks por segundo (None = o mais rápido possível)
+        ticks: Número de ticks a executar (None = até ser interrompido)
+        seed: Seed da primeira partida; as demais usam seed + índice (None = sorteadas)
+    """
+    estados = [EstadoJogo(seed=seed + indice if seed is not None else None, carregar_sprites=False)
+               for indice in range(num_jogos)]
+    canal = CanalObservacoes.criar(nome, num_jogos)
+    try:
+        for indice, estado in enumerate(estados):
+            canal.publicar(indice, estado)
+        tick = 0
+        proximo = time.monotonic()
+        while ticks is None or tick < ticks:
+            for indice, estado in enumerate(estados):
+                estado.atualizar(canal.acao(indice))
+                canal.publicar(indice, estado)
+            tick += 1
+            if fps:
+                proximo += 1 / fps
+                espera = proximo - time.monotonic()
+                if espera > 0:
+                    time.sleep(espera)
+    finally:
+        canal.fechar()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hospeda partidas sem gráficos em um canal de memória compartilhada")
+    parser.add_argument("--nome", default="pacdevs", help="nome do bloco de memória compartilhada")
+    parser.add_argument("--jogos", type=int, default=1, help="número de partidas")
+    parser.add_argument("--fps", type=float, help="ticks por segundo (padrão: o mais rápido possível)")
+    parser.add_argument("--ticks", type=int, help="encerra após este número de ticks")
+    parser.add_argument("--seed", type=int, help="seed da primeira partida")
+    args = parser.parse_args()
+    try:
+        hospedar(args.nome, args.jogos, args.fps, args.ticks, args.seed)
+    except KeyboardInterrupt:
+        pass
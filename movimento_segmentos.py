@@ -0,0 +1,278 @@
+import pacman as modulo_pacman
+from ghost import Ghost
+from maze_generator import PAREDE, CASA_FANTASMA
+
+DESLOCAMENTOS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+OPOSTAS = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+class GrafoCorredores:
+    """
+    Grafo dos corredores de um labirinto.
+
+    Os nós são as células andáveis (fora paredes e a casa dos fantasmas) que não estão
+    no meio de um corredor reto: cruzamentos, curvas e becos. Cada segmento liga um nó,
+    saindo em uma direção, ao próximo nó naquela direção; como entre dois nós o corredor
+    é reto, a posição ao longo dele é só a distância percorrida. As bordas do mapa dão a
+    volta (portais).
+    """
+    def __init__(self, mapa, tile_size):
+        self.mapa = mapa
+        self.tile_size = tile_size
+        self.altura = len(mapa)
+        self.largura = len(mapa[0])
+        # Célula andável -> direções com vizinho andável
+        self.saidas = {}
+        for row in range(self.altura):
+            for col in range(self.largura):
+                if self.andavel(row, col):
+                    self.saidas[(row, col)] = tuple(direcao for direcao in DESLOCAMENTOS
+                                                    if self.andavel(*self.vizinha(row, col, direcao)))
+        self.nos = {celula for celula, saidas in self.saidas.items() if not self._corredor_reto(saidas)}
+        # (nó, direção) -> (nó de destino, comprimento em pixels)
+        self.segmentos = {}
+        cobertas = set(self.nos)
+        for no in list(self.nos):
+            self._ligar(no, cobertas)
+        # Corredores em anel sem nenhum nó (possível com os portais) ganham um
+        for celula in sorted(self.saidas):
+            if celula not in cobertas:
+                self.nos.add(celula)
+                cobertas.add(celula)
+                self._ligar(celula, cobertas)
+
+    def andavel(self, row, col):
+        return self.mapa[row][col] not in (PAREDE, CASA_FANTASMA)
+
+    def vizinha(self, row, col, direcao):
+        d_row, d_col = DESLOCAMENTOS[direcao]
+        return (row + d_row) % self.altura, (col + d_col) % self.largura
+
+    @staticmethod
+    def _corredor_reto(saidas):
+        return len(saidas) == 2 and OPOSTAS[saidas[0]] == saidas[1]
+
+    def _ligar(self, no, cobertas):
+        """Cria os segmentos que saem de `no`, seguindo cada corredor reto até o próximo nó."""
+        for direcao in self.saidas[no]:
+            celula = self.vizinha(*no, direcao)
+            celulas = 1
+            while celula not in self.nos:
+                cobertas.add(celula)
+                celula = self.vizinha(*celula, direcao)
+                celulas += 1
+            self.segmentos[(no, direcao)] = (celula, celulas * self.tile_size)
+
+class PosicaoSegmento:
+    """Posição de uma entidade no grafo: segmento (nó de origem e direção) e distância percorrida."""
+    __slots__ = ("origem", "direcao", "destino", "comprimento", "deslocamento", "x", "y")
+
+    def __init__(self, origem, direcao, destino, comprimento, deslocamento=0):
+        self.origem = origem
+        self.direcao = direcao
+        self.destino = destino
+        self.comprimento = comprimento
+        self.deslocamento = deslocamento
+        self.x = self.y = None  # Última posição em pixels escrita na entidade
+
+class MovimentoSegmentos:
+    """
+    Movimento do Pacman e dos fantasmas por segmentos do grafo de corredores.
+
+    Cada entidade guarda (segmento, deslocamento, direção); a cada tick o deslocamento
+    avança `velocidade` pixels e só ao chegar a um nó há trabalho: escolher a próxima
+    direção (a desejada pelo jogador, ou Ghost.decidir_direcao para os fantasmas) e
+    passar ao segmento seguinte. Paredes e centralização não precisam ser verificadas,
+    porque a entidade está sempre no eixo de um corredor, e avancar() percorre qualquer
+    distância com custo proporcional aos nós cruzados. A posição em pixels (x, y) das
+    entidades é atualizada a cada passo, então colisões, desenho e observações
+    continuam iguais.
+
+    Fantasmas comidos ou na casa e entidades fora dos corredores continuam usando o
+    movimento original (mover). Se a posição de uma entidade for alterada por fora
+    (colisão, volta ao início), ela é recolocada no grafo pela célula atual; a posição
+    exata no segmento entra no snapshot da partida (ver snapshot/restore).
+
+    O ganho depende de onde os fantasmas estão: com 200 fantasmas espalhados pelos
+    corredores de um labirinto 24x20, o tick cai de ~2,0 para ~1,4 ms; no cenário
+    centenas_de_fantasmas (benchmarks/cenarios.py) quase todos ficam na casa, ~97% dos
+    movimentos de fantasma caem em Ghost.mover e não há ganho (o tick fica ~10% mais lento).
+
+    Uso: EstadoJogo.movimento = MovimentoSegmentos() (None = movimento original).
+    """
+    def __init__(self):
+        self.grafo = None
+        self._posicoes = {}  # Entidade -> PosicaoSegmento
+
+    def snapshot(self, entidades):
+        """
+        Estado do movimento para EstadoJogo.snapshot, com a posição no grafo de cada
+        entidade pelo índice em `entidades` (os objetos podem ser outros no restore).
+        """
+        dados = []
+        for entidade in entidades:
+            posicao = self._posicoes.get(entidade)
+            dados.append(None if posicao is None else
+                         (posicao.origem, posicao.direcao, posicao.destino, posicao.comprimento,
+                          posicao.deslocamento, posicao.x, posicao.y))
+        return (self.grafo, tuple(dados))
+
+    def restore(self, snapshot, entidades):
+        """Restaura um estado retornado por snapshot() (None = sem posições) para `entidades`."""
+        self._posicoes = {}
+        if snapshot is None:
+            return
+        self.grafo, dados = snapshot
+        for entidade, dados_entidade in zip(entidades, dados):
+            if dados_entidade is not None:
+                origem, direcao, destino, comprimento, deslocamento, x, y = dados_entidade
+                posicao = self._posicoes[entidade] = PosicaoSegmento(origem, direcao, destino,
+                                                                     comprimento, deslocamento)
+                posicao.x, posicao.y = x, y
+
+    def _preparar(self, mapa, tile_size):
+        if self.grafo is None or self.grafo.mapa is not mapa:
+            self.grafo = GrafoCorredores(mapa, tile_size)
+            self._posicoes = {}
+        return self.grafo
+
+    def _posicao(self, entidade, direcao):
+        """Posição da entidade no grafo, recolocando-a se foi movida por fora. None se não está em um corredor."""
+        posicao = self._posicoes.get(entidade)
+        if posicao is not None and posicao.x == entidade.x and posicao.y == entidade.y:
+            return posicao
+
+        grafo = self.grafo
+        tile_size = grafo.tile_size
+        # Célula do centro da entidade; fora do mapa ela está atravessando um portal
+        centro_row = int(entidade.y + tile_size // 2) // tile_size
+        centro_col = int(entidade.x + tile_size // 2) // tile_size
+        row, col = centro_row % grafo.altura, centro_col % grafo.largura
+        if (row, col) not in grafo.saidas:
+            self._posicoes.pop(entidade, None)
+            return None
+
+        saidas = grafo.saidas[(row, col)]
+        if direcao not in saidas:
+            direcao = saidas[0]
+        # Volta pelo corredor até o nó de origem do segmento
+        origem, celulas = (row, col), 0
+        while origem not in grafo.nos:
+            origem = grafo.vizinha(*origem, OPOSTAS[direcao])
+            celulas += 1
+        destino, comprimento = grafo.segmentos[(origem, direcao)]
+        # Mantém a distância exata ao longo do corredor (só o eixo transversal é centralizado)
+        d_row, d_col = DESLOCAMENTOS[direcao]
+        resto = d_row * (entidade.y - centro_row * tile_size) + d_col * (entidade.x - centro_col * tile_size)
+        deslocamento = min(max(celulas * tile_size + resto, 0), comprimento)
+        posicao = PosicaoSegmento(origem, direcao, destino, comprimento, deslocamento)
+        self._posicoes[entidade] = posicao
+        self._escrever(entidade, posicao)
+        return posicao
+
+    def _escrever(self, entidade, posicao):
+        """Atualiza a posição em pixels da entidade."""
+        grafo = self.grafo
+        tile_size = grafo.tile_size
+        d_row, d_col = DESLOCAMENTOS[posicao.direcao]
+        row, col = posicao.origem
+        entidade.x = (col * tile_size + d_col * posicao.deslocamento) % (grafo.largura * tile_size)
+        entidade.y = (row * tile_size + d_row * posicao.deslocamento) % (grafo.altura * tile_size)
+        posicao.x, posicao.y = entidade.x, entidade.y
+
+    def _entrar(self, posicao, no, direcao):
+        """Coloca a posição no início do segmento que sai de `no` em `direcao`."""
+        posicao.origem = no
+        posicao.direcao = direcao
+        posicao.destino, posicao.comprimento = self.grafo.segmentos[(no, direcao)]
+        posicao.deslocamento = 0
+
+    def inverter(self, posicao):
+        """Inverte o sentido no meio do segmento."""
+        deslocamento = posicao.comprimento - posicao.deslocamento
+        self._entrar(posicao, posicao.destino, OPOSTAS[posicao.direcao])
+        posicao.deslocamento = deslocamento
+
+    def avancar(self, posicao, pixels, escolher):
+        """
+        Avança `pixels` pixels pelo grafo.
+
+        Args:
+            escolher: Função (nó, direção de chegada) -> direção de saída, ou None para
+                parar no nó; chamada só ao chegar a um nó
+        """
+        saidas = self.grafo.saidas
+        while pixels > 0:
+            restante = posicao.comprimento - posicao.deslocamento
+            if pixels < restante:
+                posicao.deslocamento += pixels
+                return
+            pixels -= restante
+            no = posicao.destino
+            direcao = escolher(no, posicao.direcao)
+            if direcao is None or direcao not in saidas[no]:
+                posicao.deslocamento = posicao.comprimento  # Parado no nó
+                return
+            self._entrar(posicao, no, direcao)
+
+    def mover_pacman(self, pacman, mapa, tile_size):
+        """Substitui Pacman.mover por um tick de movimento por segmentos."""
+        self._preparar(mapa, tile_size)
+        posicao = self._posicao(pacman, pacman.direcao)
+        if posicao is None:
+            pacman.mover(mapa)
+            return
+
+        saidas = self.grafo.saidas
+        desejada = pacman.direcao_desejada
+        if desejada == OPOSTAS[posicao.direcao]:
+            self.inverter(posicao)
+        elif posicao.deslocamento == posicao.comprimento:
+            # Parado no nó de destino: sai pela direção desejada, se houver
+            if desejada in saidas[posicao.destino]:
+                self._entrar(posicao, posicao.destino, desejada)
+        elif posicao.deslocamento == 0 and desejada != posicao.direcao and desejada in saidas[posicao.origem]:
+            self._entrar(posicao, posicao.origem, desejada)
+
+        def escolher(no, chegada):
+            if pacman.direcao_desejada in saidas[no]:
+                return pacman.direcao_desejada
+            return chegada if chegada in saidas[no] else None
+
+        self.avancar(posicao, pacman.velocidade, escolher)
+        if posicao.direcao != pacman.direcao:
+            pacman.direcao = posicao.direcao
+            modulo_pacman.direcao_pacman_global = pacman.direcao
+        self._escrever(pacman, posicao)
+
+    def mover_fantasma(self, fantasma, pacman_x, pacman_y, mapa):
+        """Substitui Ghost.mover por um tick de movimento por segmentos."""
+        self._preparar(mapa, fantasma.tile_size)
+        posicao = None
+        if fantasma.estado != Ghost.COMIDO:
+            posicao = self._posicao(fantasma, fantasma.direcao_atual)
+        if posicao is None:
+            fantasma.mover(pacman_x, pacman_y, mapa)
+            return
+
+        # Os mesmos contadores de Ghost.mover
+        fantasma.tempo_total += 1
+        if fantasma.estado == Ghost.VULNERAVEL:
+            fantasma.tempo_vulneravel -= 1
+            if fantasma.tempo_vulneravel <= 0:
+                fantasma.voltar_ao_normal()
+
+        grafo = self.grafo
+        saidas = grafo.saidas
+
+        def escolher(no, chegada):
+            # A IA do fantasma decide com ele posicionado no nó
+            fantasma.x, fantasma.y = no[1] * grafo.tile_size, no[0] * grafo.tile_size
+            direcao = fantasma.decidir_direcao(pacman_x, pacman_y, mapa)
+            if direcao in saidas[no]:
+                return direcao
+            opcoes = [saida for saida in saidas[no] if saida != OPOSTAS[chegada]] or list(saidas[no])
+            return fantasma.gerador.choice(opcoes)
+
+        self.avancar(posicao, fantasma.velocidade, escolher)
+        fantasma.direcao_atual = posicao.direcao
+        self._escrever(fantasma, posicao)
@@ -0,0 +1,154 @@
+from jogo import PERSONALIDADES, TILE_SIZE
+from ghost import Ghost
+from maze_generator import PAREDE, PONTO, CASA_FANTASMA, POWER_PELLET
+
+try:
+    import numpy
+except ImportError:  # As observações exigem NumPy; o resto do jogo funciona sem ele
+    numpy = None
+
+# Planos da observação, um por canal
+PLANO_PAREDES = 0
+PLANO_PONTOS = 1
+PLANO_POWER_PELLETS = 2
+PLANO_CASA = 3
+PLANO_PACMAN = 4
+PLANO_FANTASMAS_ESTADO = 5  # Um plano por estado: normal, vulnerável, comido
+PLANO_FANTASMAS_PERSONALIDADE = PLANO_FANTASMAS_ESTADO + 3  # Um plano por personalidade
+NUM_PLANOS = PLANO_FANTASMAS_PERSONALIDADE + len(PERSONALIDADES)
+
+ESCALARES = ("pontuacao", "nivel", "tempo_vulneravel")
+
+# Tamanho dos labirintos padrão (gerar_labirinto(4, 3))
+ALTURA_PADRAO = 22
+LARGURA_PADRAO = 19
+
+def _celula(x, y, altura, largura):
+    """Célula (row, col) ocupada pelo centro de uma entidade em (x, y), limitada ao mapa."""
+    row = (int(y) + TILE_SIZE // 2) // TILE_SIZE
+    col = (int(x) + TILE_SIZE // 2) // TILE_SIZE
+    return min(max(row, 0), altura - 1), min(max(col, 0), largura - 1)
+
+class _CacheNivel:
+    """Dados de um nível usados a cada tick: índices das células com pontos e o bitset."""
+    def __init__(self, mapa, pontos, largura_buffer):
+        self.mapa = mapa
+        self.bits = None
+        self.visao_bits = None
+        self.pontos = self._indices(mapa, pontos, PONTO, largura_buffer)
+        self.power_pellets = self._indices(mapa, pontos, POWER_PELLET, largura_buffer)
+
+    @staticmethod
+    def _indices(mapa, pontos, tipo, largura_buffer):
+        """(byte do bitset, máscara do bit, índice no plano, buffer de trabalho) das células do tipo."""
+        celulas = [(row, col) for row in range(len(mapa)) for col in range(len(mapa[0]))
+                   if mapa[row][col] == tipo]
+        indices_bits = numpy.array([row * pontos.largura + col for row, col in celulas], dtype=numpy.intp)
+        return (indices_bits >> 3,
+                (1 << (indices_bits & 7)).astype(numpy.uint8),
+                numpy.array([row * largura_buffer + col for row, col in celulas], dtype=numpy.intp),
+                numpy.empty(len(celulas), dtype=numpy.uint8))
+
+    def visao(self, bits):
+        """Array NumPy sobre o bitset atual (recriada só quando o bitset é trocado, ex.: copy-on-write)."""
+        if bits is not self.bits:
+            self.bits = bits
+            self.visao_bits = numpy.frombuffer(bits, dtype=numpy.uint8)
+        return self.visao_bits
+
+class Observador:
+    """
+    Observações de tamanho fixo de uma ou mais partidas, para bots.
+
+    Cada partida vira um conjunto de planos uint8 (altura x largura, 1 onde há algo):
+    paredes, pontos, power pellets, casa dos fantasmas, Pacman, fantasmas por estado e
+    fantasmas por personalidade, e um vetor de escalares (pontuação, nível e o maior tempo
+    de vulnerabilidade dos fantasmas). Tudo é escrito em buffers alocados uma única vez:
+    os planos estáticos só são refeitos quando o nível muda, os pontos são lidos do bitset
+    com operações NumPy sem alocação e as entidades são marcadas célula a célula.
+    Labirintos menores que o buffer ficam no canto superior esquerdo. Requer NumPy.
+    """
+    def __init__(self, num_jogos=1, altura=ALTURA_PADRAO, largura=LARGURA_PADRAO, planos=None, escalares=None):
+        """
+        Args:
+            num_jogos: Número de partidas do lote
+            altura, largura: Tamanho dos planos, em células
+            planos, escalares: Buffers já alocados onde escrever (ex.: em memória compartilhada),
+                com as formas de `planos` e `escalares` abaixo; alocados aqui se não informados
+        """
+        self.altura = altura
+        self.largura = largura
+        if planos is None:
+            planos = numpy.zeros((num_jogos, NUM_PLANOS, altura, largura), dtype=numpy.uint8)
+        if escalares is None:
+            escalares = numpy.zeros((num_jogos, len(ESCALARES)), dtype=numpy.int32)
+        self.planos = planos
+        self.escalares = escalares
+        self._caches = [None] * num_jogos
+        self._personalidades = {personalidade: i for i, personalidade in enumerate(PERSONALIDADES)}
+
+    def observar(self, estados):
+        """
+        Escreve as observações de uma lista de partidas (uma por posição do lote).
+
+        Returns:
+            (planos, escalares): os próprios buffers, com formas
+            (num_jogos, NUM_PLANOS, altura, largura) e (num_jogos, len(ESCALARES))
+        """
+        for indice, estado in enumerate(estados):
+            self.observar_jogo(indice, estado)
+        return self.planos, self.escalares
+
+    def observar_jogo(self, indice, estado):
+        """Escreve a observação de uma partida na posição `indice` do lote."""
+        planos = self.planos[indice]
+        cache = self._caches[indice]
+        if cache is None or cache.mapa is not estado.mapa:
+            cache = self._novo_nivel(indice, estado)
+
+        # Pontos restantes, direto do bitset
+        bits = cache.visao(estado.pontos.bits)
+        for plano, (bytes_bits, mascaras, destino, trabalho) in ((PLANO_PONTOS, cache.pontos),
+                                                                 (PLANO_POWER_PELLETS, cache.power_pellets)):
+            numpy.take(bits, bytes_bits, out=trabalho)
+            numpy.bitwise_and(trabalho, mascaras, out=trabalho)
+            numpy.minimum(trabalho, 1, out=trabalho)
+            planos[plano].put(destino, trabalho)
+
+        # Entidades
+        planos[PLANO_PACMAN:].fill(0)
+        altura, largura = len(estado.mapa), len(estado.mapa[0])
+        row, col = _celula(estado.pacman.x, estado.pacman.y, altura, largura)
+        planos[PLANO_PACMAN, row, col] = 1
+
+        tempo_vulneravel = 0
+        for fantasma in estado.fantasmas:
+            row, col = _celula(fantasma.x, fantasma.y, altura, largura)
+            planos[PLANO_FANTASMAS_ESTADO + fantasma.estado, row, col] = 1
+            personalidade = self._personalidades.get(fantasma.personalidade)
+            if personalidade is not None:
+                planos[PLANO_FANTASMAS_PERSONALIDADE + personalidade, row, col] = 1
+            if fantasma.estado == Ghost.VULNERAVEL:
+                tempo_vulneravel = max(tempo_vulneravel, fantasma.tempo_vulneravel)
+
+        escalares = self.escalares[indice]
+        escalares[0] = estado.pontuacao
+        escalares[1] = estado.nivel
+        escalares[2] = tempo_vulneravel
+
+    def _novo_nivel(self, indice, estado):
+        """Refaz os planos estáticos da partida para o nível atual."""
+        mapa = estado.mapa
+        altura, largura = len(mapa), len(mapa[0])
+        if altura > self.altura or largura > self.largura:
+            raise ValueError(f"Labirinto {altura}x{largura} maior que a observação {self.altura}x{self.largura}")
+
+        planos = self.planos[indice]
+        planos.fill(0)
+        grade = numpy.asarray(mapa, dtype=numpy.uint8)
+        planos[PLANO_PAREDES, :altura, :largura] = grade == PAREDE
+        planos[PLANO_CASA, :altura, :largura] = grade == CASA_FANTASMA
+
+        cache = _CacheNivel(mapa, estado.pontos, self.largura)
+        self._caches[indice] = cache
+        return cache
@@ -1,5 +1,3 @@
-from pacman_sprite import PacmanSprite
-import pygame
 import os
 from maze_generator import gerar_labirinto
 
@@ -16,14 +14,28 @@ ANIMACAO = {
 }
 
 # O mapa é gerado dinamicamente pelo maze_generator
-# Usamos este como fallback ou para testes
-MAPA = gerar_labirinto(4, 3)
+# Usamos este como fallback ou para testes; só é gerado quando usado pela primeira vez
+_mapa_padrao = None
+
+def mapa_padrao():
+    """Retorna o mapa usado quando nenhum mapa é informado, gerando-o na primeira chamada."""
+    global _mapa_padrao
+    if _mapa_padrao is None:
+        _mapa_padrao = gerar_labirinto(4, 3)
+    return _mapa_padrao
+
+def __getattr__(nome):
+    # Compatibilidade com pacman.MAPA, agora gerado sob demanda
+    if nome == "MAPA":
+        return mapa_padrao()
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
 
 # Variável global para compartilhar a direção do Pacman com os fantasmas
 direcao_pacman_global = "right"
 
 class Pacman:
-    def __init__(self, x, y, sprites: PacmanSprite):
+    def __init__(self, x, y, sprites):
+        # sprites: pacman_sprite.PacmanSprite (None na simulação sem gráficos)
         self.x = x
         self.y = y
         self.sprites = sprites
@@ -34,26 +46,20 @@ class Pacman:
         self.direcao_desejada = "right"
         self.pontos = 0
 
-    def processar_input(self, teclas):
-        global direcao_pacman_global
-        
-        if teclas[pygame.K_UP]:
-            self.direcao_desejada = "up"
-        elif teclas[pygame.K_DOWN]:
-            self.direcao_desejada = "down"
-        elif teclas[pygame.K_LEFT]:
-            self.direcao_desejada = "left"
-        elif teclas[pygame.K_RIGHT]:
-            self.direcao_desejada = "right"
-            
-        # Atualizar a variável global quando a direção mudar
-        if self.direcao_desejada == self.direcao:
-            direcao_pacman_global = self.direcao
+    def snapshot(self):
+        """Retorna o estado numérico do Pacman (sem sprites) como uma tupla."""
+        return (self.x, self.y, self.direcao, self.direcao_desejada, self.anim_index,
+                self.velocidade, self.tempo_animacao, self.pontos)
+
+    def restore(self, dados):
+        """Restaura um estado retornado por snapshot()."""
+        (self.x, self.y, self.direcao, self.direcao_desejada, self.anim_index,
+         self.velocidade, self.tempo_animacao, self.pontos) = dados
 
     def pode_mover_para(self, direcao, mapa=None):
         # Use o mapa fornecido ou o mapa padrão
         if mapa is None:
-            mapa = MAPA
+            mapa = mapa_padrao()
             
         # Inicializar valores padrão
         nova_x = self.x
@@ -107,7 +113,7 @@ class Pacman:
     def mover(self, mapa=None):
         # Use o mapa fornecido ou o mapa padrão
         if mapa is None:
-            mapa = MAPA
+            mapa = mapa_padrao()
         
         # Centralizar o pacman nos corredores
         self.centralizar_nos_corredores()
@@ -183,7 +189,7 @@ class Pacman:
     def atualizar_animacao(self):
         self.anim_index = (self.anim_index + 1) % len(ANIMACAO[self.direcao])
 
-    def desenhar(self, screen):
+    def desenhar(self, screen, deslocamento=(0, 0)):
         frame_name = ANIMACAO[self.direcao][self.anim_index]
         frame = self.sprites.get_frame(frame_name)
-        screen.blit(frame, (self.x, self.y))
\ No newline at end of file
+        return screen.blit(frame, (self.x + deslocamento[0], self.y + deslocamento[1]))
\ No newline at end of file
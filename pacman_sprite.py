@@ -1,19 +1,21 @@
 import pygame
 import os
+from atlas import obter_atlas
+
+NOMES_FRAMES = ["closed", "half_up", "half_down", "half_left", "half_right",
+                "open_up", "open_down", "open_left", "open_right"]
 
 class PacmanSprite:
     def __init__(self, base_path):
-        self.frames = {
-            "closed": pygame.image.load(os.path.join(base_path, "pacman_closed.png")).convert_alpha(),
-            "half_up": pygame.image.load(os.path.join(base_path, "pacman_half_up.png")).convert_alpha(),
-            "half_down": pygame.image.load(os.path.join(base_path, "pacman_half_down.png")).convert_alpha(),
-            "half_left": pygame.image.load(os.path.join(base_path, "pacman_half_left.png")).convert_alpha(),
-            "half_right": pygame.image.load(os.path.join(base_path, "pacman_half_right.png")).convert_alpha(),
-            "open_up": pygame.image.load(os.path.join(base_path, "pacman_open_up.png")).convert_alpha(),
-            "open_down": pygame.image.load(os.path.join(base_path, "pacman_open_down.png")).convert_alpha(),
-            "open_left": pygame.image.load(os.path.join(base_path, "pacman_open_left.png")).convert_alpha(),
-            "open_right": pygame.image.load(os.path.join(base_path, "pacman_open_right.png")).convert_alpha(),
-        }
+        # Os frames vêm do atlas quando disponível; senão cada PNG é carregado separadamente
+        atlas = obter_atlas()
+        self.frames = {}
+        for nome in NOMES_FRAMES:
+            caminho = os.path.join(base_path, f"pacman_{nome}.png")
+            frame = atlas.get_frame(caminho) if atlas else None
+            if frame is None:
+                frame = pygame.image.load(caminho).convert_alpha()
+            self.frames[nome] = frame
 
     def get_frame(self, state):
-        return self.frames.get(state, self.frames["closed"])
\ No newline at end of file
+        return self.frames.get(state, self.frames["closed"])
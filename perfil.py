@@ -0,0 +1,162 @@
+import csv
+import queue
+import threading
+import time
+from collections import deque
+import pygame
+
+# Etapas de um frame, na ordem em que acontecem
+ETAPAS = ("espera", "entrada", "pacman", "fantasmas", "colisoes", "pontos",
+          "labirinto", "entidades", "hud", "apresentacao")
+PERCENTIS = (50, 95, 99)
+JANELA_FRAMES = 120  # Frames usados nos percentis da sobreposição
+
+COR_TEXTO_PERFIL = (0, 255, 0)
+COR_FUNDO_PERFIL = (0, 0, 0, 180)
+
+class PerfilFrame:
+    """
+    Mede o tempo de cada etapa do frame.
+
+    Uso: inicio_frame() no começo do frame, marcar(etapa) ao fim de cada trecho (o tempo
+    desde a marca anterior é somado à etapa, então um trecho repetido, como o laço dos
+    fantasmas, acumula) e fim_frame() depois de clock.tick. Os últimos frames ficam em
+    uma janela para os percentis, e cada frame pode ser enviado a um EscritorTrace.
+    """
+    def __init__(self, trace=None, janela=JANELA_FRAMES):
+        """
+        Args:
+            trace: EscritorTrace que recebe uma linha por frame (None = sem arquivo)
+            janela: Número de frames considerados nos percentis
+        """
+        self.trace = trace
+        self.frame = 0
+        self.tempos = dict.fromkeys(ETAPAS, 0.0)
+        # Etapa -> últimos tempos em ms ("total" é o frame inteiro)
+        self.historico = {etapa: deque(maxlen=janela) for etapa in ETAPAS + ("total",)}
+        self._inicio = 0.0
+        self._ultima_marca = 0.0
+
+    def inicio_frame(self):
+        """Começa a medir um novo frame."""
+        for etapa in self.tempos:
+            self.tempos[etapa] = 0.0
+        self._inicio = self._ultima_marca = time.perf_counter()
+
+    def marcar(self, etapa):
+        """Soma à etapa o tempo decorrido desde a marca anterior."""
+        agora = time.perf_counter()
+        self.tempos[etapa] += agora - self._ultima_marca
+        self._ultima_marca = agora
+
+    def fim_frame(self, nivel, entidades):
+        """
+        Encerra o frame, guardando os tempos na janela e no trace.
+
+        Args:
+            nivel: Nível da partida neste frame
+            entidades: Número de entidades (Pacman e fantasmas) simuladas
+        """
+        total = (time.perf_counter() - self._inicio) * 1000
+        tempos_ms = [self.tempos[etapa] * 1000 for etapa in ETAPAS]
+        for etapa, tempo in zip(ETAPAS, tempos_ms):
+            self.historico[etapa].append(tempo)
+        self.historico["total"].append(total)
+
+        if self.trace is not None:
+            self.trace.escrever([self.frame, nivel, entidades] + tempos_ms + [total])
+        self.frame += 1
+
+    def percentis(self, etapa):
+        """Retorna os percentis (PERCENTIS) dos tempos da etapa na janela, em ms."""
+        ordenados = sorted(self.historico[etapa])
+        if not ordenados:
+            return tuple(0.0 for _ in PERCENTIS)
+        return tuple(ordenados[min(len(ordenados) - 1, len(ordenados) * p // 100)] for p in PERCENTIS)
+
+class EscritorTrace:
+    """
+    Grava o trace de frames em CSV sem atrasar o jogo.
+
+    escrever() só coloca a linha em uma fila; uma thread separada formata e grava as
+    linhas em lote, então o frame nunca espera pelo disco.
+    """
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "w", newline="", encoding="utf-8")  # pylint: disable=consider-using-with
+        self.escritor = csv.writer(self.arquivo)
+        self.escritor.writerow(["frame", "nivel", "entidades"] + [f"{etapa}_ms" for etapa in ETAPAS] + ["total_ms"])
+        self.fila = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._gravar, daemon=True)
+        self.thread.start()
+
+    def escrever(self, linha):
+        """Enfileira uma linha do trace."""
+        self.fila.put(linha)
+
+    def fechar(self):
+        """Grava as linhas pendentes e fecha o arquivo."""
+        self.fila.put(None)
+        self.thread.join()
+        self.arquivo.close()
+
+    def _gravar(self):
+        """Laço da thread de gravação: esvazia a fila em lotes até receber None."""
+        while True:
+            lote = [self.fila.get()]
+            while not self.fila.empty():
+                lote.append(self.fila.get())
+            fim = None in lote
+            self.escritor.writerows(
+                [[linha[0], linha[1], linha[2]] + [f"{tempo:.3f}" for tempo in linha[3:]]
+                 for linha in lote if linha is not None])
+            if fim:
+                return
+
+class SobreposicaoPerfil:
+    """
+    Painel na tela com p50/p95/p99 de cada etapa do frame.
+
+    O texto é renderizado de novo só a cada `intervalo` frames; nos demais o painel em
+    cache é apenas copiado para a tela.
+    """
+    def __init__(self, perfil, entrada=None, fonte=None, intervalo=10):
+        """
+        Args:
+            perfil: PerfilFrame com os tempos medidos
+            entrada: entrada.FilaEntrada cuja latência entre tecla e movimento é exibida (opcional)
+            fonte: pygame.font.Font a usar (monoespaçada 14 se não informada)
+            intervalo: Frames entre atualizações do painel
+        """
+        self.perfil = perfil
+        self.entrada = entrada
+        self.fonte = fonte if fonte is not None else pygame.font.SysFont("monospace", 14)
+        self.intervalo = intervalo
+        self.painel = None
+        self._frame_painel = None
+
+    def desenhar(self, screen):
+        """Desenha o painel no canto superior direito. Retorna o retângulo desenhado."""
+        frame = self.perfil.frame
+        if self.painel is None or frame - self._frame_painel >= self.intervalo:
+            self.painel = self._renderizar()
+            self._frame_painel = frame
+        return screen.blit(self.painel, (screen.get_width() - self.painel.get_width() - 10, 10))
+
+    def _renderizar(self):
+        """Renderiza o painel com os percentis atuais."""
+        cabecalho = "etapa (ms)   " + "".join(f"p{p:<6}" for p in PERCENTIS)
+        linhas = [cabecalho]
+        for etapa in ETAPAS + ("total",):
+            linhas.append(f"{etapa:<12} " + "".join(f"{tempo:<7.2f}" for tempo in self.perfil.percentis(etapa)))
+        if self.entrada is not None:
+            linhas.append(f"{'tecla->mov':<12} " +
+                          "".join(f"{tempo:<7.1f}" for tempo in self.entrada.percentis_latencia(PERCENTIS)))
+
+        textos = [self.fonte.render(linha, True, COR_TEXTO_PERFIL) for linha in linhas]
+        altura_linha = self.fonte.get_linesize()
+        largura = max(texto.get_width() for texto in textos) + 10
+        painel = pygame.Surface((largura, altura_linha * len(textos) + 10), pygame.SRCALPHA)
+        painel.fill(COR_FUNDO_PERFIL)
+        for i, texto in enumerate(textos):
+            painel.blit(texto, (5, 5 + i * altura_linha))
+        return painel
@@ -0,0 +1,70 @@
+from maze_generator import PONTO, POWER_PELLET
+
+class PontosNivel:
+    """
+    Pontos (comuns e power pellets) de um nível guardados como bitset, um bit por célula.
+
+    Mantém um contador de pontos restantes atualizado a cada coleta, então saber se o
+    nível terminou não exige percorrer o mapa. O tipo do ponto (comum ou power pellet)
+    continua vindo do mapa do nível, que não muda durante a fase.
+    """
+    def __init__(self, mapa):
+        self.altura = len(mapa)
+        self.largura = len(mapa[0])
+
+        bits = bytearray((self.altura * self.largura + 7) // 8)
+        total = 0
+        for row in range(self.altura):
+            for col in range(self.largura):
+                if mapa[row][col] == PONTO or mapa[row][col] == POWER_PELLET:
+                    indice = row * self.largura + col
+                    bits[indice >> 3] |= 1 << (indice & 7)
+                    total += 1
+
+        # Bitset inicial do nível (imutável) usado para reiniciar rapidamente
+        self.iniciais = bytes(bits)
+        self.total = total
+
+        self.bits = bytearray(self.iniciais)
+        self.restantes = total
+        self._compartilhado = False
+
+    def tem_ponto(self, row, col):
+        """Retorna True se ainda há um ponto na célula."""
+        indice = row * self.largura + col
+        return self.bits[indice >> 3] & (1 << (indice & 7)) != 0
+
+    def remover(self, row, col):
+        """Remove o ponto da célula. Retorna True se havia um ponto lá."""
+        indice = row * self.largura + col
+        mascara = 1 << (indice & 7)
+        if not self.bits[indice >> 3] & mascara:
+            return False
+
+        # Copy-on-write: o bitset pode estar sendo referenciado por um snapshot
+        if self._compartilhado:
+            self.bits = bytearray(self.bits)
+            self._compartilhado = False
+        self.bits[indice >> 3] &= ~mascara
+        self.restantes -= 1
+        return True
+
+    def limpo(self):
+        """Retorna True se todos os pontos do nível foram coletados."""
+        return self.restantes == 0
+
+    def reiniciar(self):
+        """Recoloca todos os pontos do nível."""
+        self.bits = bytearray(self.iniciais)
+        self.restantes = self.total
+        self._compartilhado = False
+
+    def snapshot(self):
+        """Retorna o estado dos pontos sem copiá-lo (copiado só na próxima remoção)."""
+        self._compartilhado = True
+        return (self.bits, self.restantes)
+
+    def restore(self, dados):
+        """Restaura um estado retornado por snapshot()."""
+        self.bits, self.restantes = dados
+        self._compartilhado = True
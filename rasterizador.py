@@ -0,0 +1,110 @@
+import pygame
+from jogo import TILE_SIZE
+from maze_generator import PAREDE, PONTO, CASA_FANTASMA
+from renderizador import COR_FUNDO, COR_CASA, desenhar_parede, desenhar_ponto
+
+try:
+    import numpy
+except ImportError:  # Sem NumPy a camada é desenhada tile a tile (renderizador.CamadaLabirinto)
+    numpy = None
+
+# Índices da tabela de carimbos: 0 = vazio, 1 + máscara = parede, depois casa e ponto
+CARIMBO_VAZIO = 0
+CARIMBO_PAREDE = 1
+CARIMBO_CASA = CARIMBO_PAREDE + 16
+CARIMBO_PONTO = CARIMBO_CASA + 1
+NUM_CARIMBOS = CARIMBO_PONTO + 1
+
+def disponivel():
+    """Retorna True se o NumPy está instalado e o rasterizador pode ser usado."""
+    return numpy is not None
+
+class RasterizadorTiles:
+    """
+    Rasteriza a camada de tiles do labirinto de uma vez, com indexação de arrays.
+
+    Cada tipo de tile (vazio, parede em cada uma das 16 variações de conexão, casa dos
+    fantasmas e ponto comum) é desenhado uma única vez com as mesmas funções de
+    renderizador.py, formando uma tabela de carimbos. Para montar a camada, o mapa vira
+    uma grade de índices nessa tabela e os pixels são copiados em uma única operação
+    vetorizada, em vez de milhares de chamadas a pygame.draw. O resultado já fica na
+    ordem de linhas de uma imagem RGB e entra no pygame com image.frombuffer, sem cópia
+    pixel a pixel. Requer NumPy.
+    """
+    def __init__(self, tile_size=TILE_SIZE):
+        self.tile_size = tile_size
+        # Carimbos na ordem de uma imagem: (índice, y, x, canal)
+        self.carimbos = numpy.empty((NUM_CARIMBOS, tile_size, tile_size, 3), dtype=numpy.uint8)
+
+        tile = pygame.Surface((tile_size, tile_size))
+        for indice in range(NUM_CARIMBOS):
+            tile.fill(COR_FUNDO)
+            if CARIMBO_PAREDE <= indice < CARIMBO_CASA:
+                desenhar_parede(tile, 0, 0, indice - CARIMBO_PAREDE, tile_size)
+            elif indice == CARIMBO_CASA:
+                tile.fill(COR_CASA)
+            elif indice == CARIMBO_PONTO:
+                desenhar_ponto(tile, 0, 0, tile_size)
+            self.carimbos[indice] = pygame.surfarray.array3d(tile).transpose(1, 0, 2)
+
+    def indices(self, mapa, mascaras, pontos=None, janela=None):
+        """
+        Calcula o índice do carimbo de cada célula da janela. Só as células da janela são
+        lidas do mapa, das máscaras e do bitset de pontos.
+
+        Args:
+            mapa: Matriz do labirinto
+            mascaras: Máscaras de conexão das paredes (maze_generator.calcular_mascaras_parede)
+            pontos: PontosNivel cujos pontos comuns restantes são incluídos (None = sem pontos)
+            janela: (row_inicio, row_fim, col_inicio, col_fim) a rasterizar (None = mapa inteiro)
+
+        Returns:
+            Array (linhas, colunas) da janela com os índices na tabela de carimbos
+        """
+        largura_mapa = len(mapa[0])
+        row_inicio, row_fim, col_inicio, col_fim = janela or (0, len(mapa), 0, largura_mapa)
+        grade = numpy.asarray([linha[col_inicio:col_fim] for linha in mapa[row_inicio:row_fim]],
+                              dtype=numpy.uint8)
+        parede = grade == PAREDE
+
+        indices = numpy.full(grade.shape, CARIMBO_VAZIO, dtype=numpy.uint8)
+        conexoes = numpy.asarray([linha[col_inicio:col_fim]
+                                  for linha in mascaras[row_inicio:row_fim]], dtype=numpy.uint8)
+        indices[parede] = CARIMBO_PAREDE + conexoes[parede]
+        indices[grade == CASA_FANTASMA] = CARIMBO_CASA
+        if pontos is not None:
+            # Bytes do bitset que cobrem as linhas da janela; o bit da célula (row, col) é
+            # o row * largura + col do mapa inteiro
+            primeiro_bit = row_inicio * largura_mapa
+            bits = numpy.frombuffer(pontos.bits, dtype=numpy.uint8,
+                                    count=(row_fim * largura_mapa + 7) // 8 - primeiro_bit // 8,
+                                    offset=primeiro_bit // 8)
+            bits = numpy.unpackbits(bits, bitorder="little")[primeiro_bit % 8:]
+            linhas = bits[:(row_fim - row_inicio) * largura_mapa].reshape(-1, largura_mapa)
+            com_ponto = linhas[:, col_inicio:col_fim].astype(bool)
+            indices[(grade == PONTO) & com_ponto] = CARIMBO_PONTO
+        return indices
+
+    def rasterizar(self, mapa, mascaras, pontos=None, janela=None, superficie=None):
+        """
+        Desenha a camada de tiles (ou a janela dela) em uma Surface.
+
+        Args:
+            superficie: Surface de destino com o tamanho da área rasterizada (None = cria uma nova)
+
+        Returns:
+            A Surface com a camada desenhada
+        """
+        indices = self.indices(mapa, mascaras, pontos, janela)
+        altura, largura = indices.shape
+        tile_size = self.tile_size
+        tamanho = (largura * tile_size, altura * tile_size)
+
+        # (row, col, y, x, canal) -> linhas da imagem: (row, y, col, x, canal)
+        pixels = numpy.ascontiguousarray(self.carimbos[indices].transpose(0, 2, 1, 3, 4))
+        imagem = pygame.image.frombuffer(pixels, tamanho, "RGB")
+
+        if superficie is None:
+            superficie = pygame.Surface(tamanho)
+        superficie.blit(imagem, (0, 0))
+        return superficie
@@ -0,0 +1,312 @@
+import pygame
+from jogo import TILE_SIZE
+from maze_generator import (PAREDE, PONTO, CASA_FANTASMA, POWER_PELLET,
+                            CONEXAO_CIMA, CONEXAO_BAIXO, CONEXAO_ESQUERDA, CONEXAO_DIREITA)
+
+# Cores do labirinto
+COR_FUNDO = (0, 0, 0)
+COR_PAREDE = (0, 0, 200)  # Azul escuro (como no Pac-Man original)
+COR_CASA = (150, 0, 0)
+COR_PONTO = (255, 255, 0)
+COR_POWER_PELLET = (255, 255, 255)
+
+class CamadaLabirinto:
+    """
+    Camada estática do labirinto pré-renderizada uma vez por nível.
+
+    Paredes, casa dos fantasmas e pontos comuns ficam em uma Surface em cache. A cada
+    frame só as células cujos pontos mudaram são atualizadas, copiando um pedaço do
+    fundo (ponto comido) ou redesenhando o ponto (ponto restaurado, ex.: restore()).
+    Os power pellets pulsam, então são desenhados a cada frame por cima da camada.
+    Com NumPy instalado a camada é montada de uma vez pelo rasterizador.RasterizadorTiles;
+    sem ele, tile a tile com pygame.draw.
+    """
+    def __init__(self, tile_size=TILE_SIZE):
+        # Importado aqui porque o rasterizador usa as funções de desenho deste módulo
+        import rasterizador
+        self.tile_size = tile_size
+        self.rasterizador = rasterizador.RasterizadorTiles(tile_size) if rasterizador.disponivel() else None
+        self.mapa = None
+        self.pontos = None
+        self.fundo = None       # Apenas paredes e casa dos fantasmas
+        self.superficie = None  # Fundo + pontos comuns ainda não coletados
+        self.bits_desenhados = None
+        self.power_pellets = []
+        # Tempo em ms usado na animação dos power pellets (a exportação usa o tempo do jogo)
+        self.relogio = pygame.time.get_ticks
+
+    def atualizar(self, estado):
+        """
+        Sincroniza a camada com o estado. Recria a camada quando o nível muda.
+
+        Returns:
+            Lista de retângulos (em coordenadas do mapa) que mudaram na camada
+        """
+        if estado.mapa is not self.mapa or estado.pontos is not self.pontos:
+            self._construir(estado.mapa, estado.mascaras_parede, estado.pontos)
+            return [self.superficie.get_rect()]
+
+        pontos = self.pontos
+        if pontos.bits == self.bits_desenhados:
+            return []
+
+        # Células cujo bit mudou desde o último frame desenhado
+        diferenca = int.from_bytes(pontos.bits, "little") ^ int.from_bytes(self.bits_desenhados, "little")
+        retangulos = []
+        while diferenca:
+            bit = diferenca & -diferenca
+            indice = bit.bit_length() - 1
+            diferenca ^= bit
+            row, col = divmod(indice, pontos.largura)
+            if self.mapa[row][col] == PONTO:
+                retangulos.append(self._atualizar_ponto(row, col, pontos.tem_ponto(row, col)))
+
+        self.bits_desenhados = bytes(pontos.bits)
+        return retangulos
+
+    def desenhar(self, screen, estado, camera):
+        """Atualiza a camada e desenha a parte visível pela câmera, junto com os power pellets."""
+        self.atualizar(estado)
+        screen.blit(self.superficie, (0, 0), camera.retangulo)
+        self.desenhar_power_pellets(screen, camera)
+
+    def power_pellets_visiveis(self, camera):
+        """Retorna as células (row, col) dos power pellets dentro da janela da câmera."""
+        row_inicio, row_fim, col_inicio, col_fim = camera.janela_tiles(self.mapa)
+        return [(row, col) for row, col in self.power_pellets
+                if row_inicio <= row < row_fim and col_inicio <= col < col_fim]
+
+    def desenhar_power_pellets(self, screen, camera):
+        """Desenha os power pellets visíveis ainda não coletados, com a animação de pulsar."""
+        tile_size = self.tile_size
+        desloc_x, desloc_y = camera.deslocamento
+        # Power pellets pulsantes (animação simples)
+        tamanho = tile_size // 3.5 + (tile_size // 20) * abs(self.relogio() % 1000 - 500) / 500
+        for row, col in self.power_pellets_visiveis(camera):
+            if self.pontos.tem_ponto(row, col):
+                pygame.draw.circle(screen, COR_POWER_PELLET,
+                                   (desloc_x + col * tile_size + tile_size // 2,
+                                    desloc_y + row * tile_size + tile_size // 2),
+                                   tamanho)
+
+    def _construir(self, mapa, mascaras, pontos):
+        """Renderiza as paredes, a casa dos fantasmas e os pontos do nível."""
+        tile_size = self.tile_size
+        altura = len(mapa)
+        largura = len(mapa[0])
+
+        self.mapa = mapa
+        self.pontos = pontos
+        self.power_pellets = [(row, col) for row in range(altura) for col in range(largura)
+                              if mapa[row][col] == POWER_PELLET]
+        self.bits_desenhados = bytes(pontos.bits)
+
+        if self.rasterizador is not None:
+            self.fundo = self.rasterizador.rasterizar(mapa, mascaras)
+            self.superficie = self.rasterizador.rasterizar(mapa, mascaras, pontos)
+            return
+
+        self.fundo = pygame.Surface((largura * tile_size, altura * tile_size))
+        self.fundo.fill(COR_FUNDO)
+        for row in range(altura):
+            for col in range(largura):
+                desenhar_tile_estatico(self.fundo, mapa, mascaras, row, col, tile_size)
+
+        self.superficie = self.fundo.copy()
+        for row in range(altura):
+            for col in range(largura):
+                if mapa[row][col] == PONTO and pontos.tem_ponto(row, col):
+                    desenhar_ponto(self.superficie, row, col, tile_size)
+
+    def _atualizar_ponto(self, row, col, tem_ponto):
+        """Apaga ou redesenha o ponto de uma célula. Retorna o retângulo da célula."""
+        rect = pygame.Rect(col * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size)
+        if tem_ponto:
+            desenhar_ponto(self.superficie, row, col, self.tile_size)
+        else:
+            self.superficie.blit(self.fundo, rect, rect)
+        return rect
+
+class RenderizadorRetangulosSujos:
+    """
+    Modo de renderização que redesenha e envia à tela apenas as áreas que mudaram.
+
+    A cada frame as áreas ocupadas no frame anterior pelo Pacman, fantasmas e HUD são
+    restauradas a partir da camada do labirinto, os pontos comidos e os power pellets são
+    atualizados e as entidades são desenhadas de novo. O resultado é a lista de
+    retângulos para pygame.display.update(), em vez de enviar a tela inteira com flip().
+    Útil com SDL renderizado por software e em displays remotos (X11 encaminhado).
+    Quando a câmera se move, a área visível inteira é redesenhada.
+    """
+    def __init__(self, camada, desenhar_hud, camera):
+        """
+        Args:
+            camada: CamadaLabirinto usada como fundo
+            desenhar_hud: Função (screen, estado) que desenha o HUD e retorna seus retângulos
+                (ex.: Hud.desenhar)
+            camera: Camera que define a área visível do mapa
+        """
+        self.camada = camada
+        self.desenhar_hud = desenhar_hud
+        self.camera = camera
+        self.mapa = None
+        self.posicao_camera = None
+        self.retangulos_anteriores = []
+
+    def desenhar(self, screen, estado, perfil=None):
+        """
+        Desenha o frame e retorna os retângulos da tela que precisam ser atualizados.
+
+        Args:
+            perfil: perfil.PerfilFrame que mede as etapas do desenho (None = sem medição)
+        """
+        camada = self.camada
+        camera = self.camera
+        camera.seguir(estado.pacman.x, estado.pacman.y, estado.mapa)
+        mudancas = camada.atualizar(estado)
+
+        if estado.mapa is not self.mapa or (camera.x, camera.y) != self.posicao_camera:
+            # Primeiro frame, novo nível ou câmera em movimento: redesenho completo
+            self.mapa = estado.mapa
+            self.posicao_camera = (camera.x, camera.y)
+            screen.fill(COR_FUNDO)
+            screen.blit(camada.superficie, (0, 0), camera.retangulo)
+            sujos = [screen.get_rect()]
+        else:
+            # Apagar as entidades do frame anterior e os pontos visíveis que mudaram
+            sujos = self.retangulos_anteriores + [rect.move(camera.deslocamento) for rect in mudancas
+                                                  if rect.colliderect(camera.retangulo)]
+            for rect in sujos:
+                self._restaurar_fundo(screen, rect)
+
+        # Power pellets pulsam, então suas células são sempre redesenhadas
+        tile_size = camada.tile_size
+        desloc_x, desloc_y = camera.deslocamento
+        for row, col in camada.power_pellets_visiveis(camera):
+            rect = pygame.Rect(desloc_x + col * tile_size, desloc_y + row * tile_size, tile_size, tile_size)
+            self._restaurar_fundo(screen, rect)
+            sujos.append(rect)
+        camada.desenhar_power_pellets(screen, camera)
+        if perfil is not None:
+            perfil.marcar("labirinto")
+
+        # Entidades visíveis e HUD, na mesma ordem do desenho completo
+        novos = [fantasma.desenhar(screen, camera.deslocamento) for fantasma in estado.fantasmas
+                 if camera.visivel(fantasma.x, fantasma.y)]
+        if camera.visivel(estado.pacman.x, estado.pacman.y):
+            novos.append(estado.pacman.desenhar(screen, camera.deslocamento))
+        if perfil is not None:
+            perfil.marcar("entidades")
+        novos.extend(self.desenhar_hud(screen, estado))
+        if perfil is not None:
+            perfil.marcar("hud")
+
+        self.retangulos_anteriores = novos
+        return sujos + novos
+
+    def registrar(self, rect):
+        """
+        Registra uma área desenhada por cima depois de desenhar() (ex.: um painel
+        semitransparente), para que o fundo dela seja restaurado no próximo frame.
+        Retorna o próprio retângulo.
+        """
+        self.retangulos_anteriores.append(rect)
+        return rect
+
+    def _restaurar_fundo(self, screen, rect):
+        """Copia a área correspondente da camada do labirinto de volta para a tela."""
+        screen.fill(COR_FUNDO, rect)
+        screen.blit(self.camada.superficie, rect, rect.move(self.camera.x, self.camera.y))
+
+def iniciar_pygame():
+    """
+    Inicia só os subsistemas do pygame usados pelo jogo (vídeo e fontes), em vez de
+    pygame.init(), que também inicia áudio e joystick. O temporizador do SDL é iniciado
+    pelo pygame.time.Clock no primeiro tick.
+    """
+    pygame.display.init()
+    pygame.font.init()
+
+def desenhar_jogo(screen, estado, camada, hud, camera, perfil=None):
+    """
+    Desenha o labirinto, os fantasmas, o Pacman e as informações do estado na tela.
+    Só a parte do mapa visível pela câmera (que segue o Pacman) é desenhada.
+
+    Args:
+        camada: CamadaLabirinto com as partes estáticas do labirinto em cache
+        hud: Hud com a fonte e os textos de nível e pontuação em cache
+        camera: Camera que define a área visível do mapa
+        perfil: perfil.PerfilFrame que mede as etapas do desenho (None = sem medição)
+    """
+    screen.fill((0, 0, 0))
+    camera.seguir(estado.pacman.x, estado.pacman.y, estado.mapa)
+
+    # Labirinto pré-renderizado (paredes, casa e pontos) e power pellets pulsantes
+    camada.desenhar(screen, estado, camera)
+    if perfil:
+        perfil.marcar("labirinto")
+
+    # Desenhar fantasmas visíveis
+    for fantasma in estado.fantasmas:
+        if camera.visivel(fantasma.x, fantasma.y):
+            fantasma.desenhar(screen, camera.deslocamento)
+        
+    # Desenhar o Pacman por último para que fique por cima dos fantasmas quando os come
+    estado.pacman.desenhar(screen, camera.deslocamento)
+    if perfil:
+        perfil.marcar("entidades")
+    
+    # Exibir informações de nível e pontuação
+    hud.desenhar(screen, estado)
+    if perfil:
+        perfil.marcar("hud")
+
+def desenhar_tile_estatico(superficie, mapa, mascaras, row, col, tile_size=TILE_SIZE):
+    """
+    Desenha uma célula que não muda durante o nível (parede ou casa dos fantasmas).
+    As conexões das paredes vêm das máscaras geradas com o labirinto.
+    """
+    tile_x = col * tile_size
+    tile_y = row * tile_size
+
+    if mapa[row][col] == PAREDE:
+        desenhar_parede(superficie, tile_x, tile_y, mascaras[row][col], tile_size)
+
+    elif mapa[row][col] == CASA_FANTASMA:
+        # Porta da casa dos fantasmas em vermelho escuro
+        pygame.draw.rect(superficie, COR_CASA, (tile_x, tile_y, tile_size, tile_size))
+
+def desenhar_parede(superficie, tile_x, tile_y, mascara, tile_size=TILE_SIZE):
+    """Desenha uma parede em (tile_x, tile_y) conectada às vizinhas indicadas pela máscara."""
+    # Desenhar paredes mais finas, estilo Pac-Man
+    margem = tile_size // 6  # Margem para paredes mais finas
+
+    # Desenhar o bloco central
+    pygame.draw.rect(superficie, COR_PAREDE,
+                     (tile_x + margem, tile_y + margem,
+                      tile_size - 2*margem, tile_size - 2*margem))
+
+    # Conectar com paredes adjacentes
+    if mascara & CONEXAO_CIMA:
+        pygame.draw.rect(superficie, COR_PAREDE,
+                         (tile_x + margem, tile_y,
+                          tile_size - 2*margem, margem))
+    if mascara & CONEXAO_BAIXO:
+        pygame.draw.rect(superficie, COR_PAREDE,
+                         (tile_x + margem, tile_y + tile_size - margem,
+                          tile_size - 2*margem, margem))
+    if mascara & CONEXAO_ESQUERDA:
+        pygame.draw.rect(superficie, COR_PAREDE,
+                         (tile_x, tile_y + margem,
+                          margem, tile_size - 2*margem))
+    if mascara & CONEXAO_DIREITA:
+        pygame.draw.rect(superficie, COR_PAREDE,
+                         (tile_x + tile_size - margem, tile_y + margem,
+                          margem, tile_size - 2*margem))
+
+def desenhar_ponto(superficie, row, col, tile_size=TILE_SIZE):
+    """Desenha um ponto comum no centro da célula."""
+    # Pontos menores e mais brilhantes
+    pygame.draw.circle(superficie, COR_PONTO,
+                       (col * tile_size + tile_size // 2, row * tile_size + tile_size // 2),
+                       tile_size // 10)
@@ -0,0 +1,200 @@
+import argparse
+import struct
+import time
+from jogo import EstadoJogo
+from lod_fantasmas import AgendadorLOD
+from movimento_segmentos import MovimentoSegmentos
+
+# Formato do arquivo de replay:
+#   cabeçalho: magic, versão, seed da partida, seed do labirinto inicial, nível inicial,
+#              total de ticks, número de trechos, modos de simulação (MODO_*), raio do
+#              LOD, largura e altura da câmera do LOD (0 = sem câmera)
+#   corpo: um varint por trecho, com (comprimento << 2) | código da direção
+# Cada trecho é uma sequência de ticks com a mesma direção desejada do Pacman.
+MAGIC = b"PDRP"
+VERSAO = 4
+CABECALHO = struct.Struct("<4sBIIIIIBHHH")
+
+# Modos de simulação da partida, repetidos na reprodução
+MODO_SEGMENTOS = 1  # EstadoJogo.movimento = MovimentoSegmentos()
+MODO_LOD = 2        # EstadoJogo.lod = AgendadorLOD(raio, câmera)
+
+DIRECOES = ["up", "down", "left", "right"]
+CODIGO_DIRECAO = {direcao: codigo for codigo, direcao in enumerate(DIRECOES)}
+
+def _modos(estado):
+    """(modos, raio, largura da câmera, altura da câmera) da simulação de `estado`."""
+    modos = MODO_SEGMENTOS if estado.movimento is not None else 0
+    lod = estado.lod
+    if lod is None:
+        return modos, 0, 0, 0
+    camera = lod.camera
+    return (modos | MODO_LOD, lod.raio,
+            camera.largura if camera is not None else 0, camera.altura if camera is not None else 0)
+
+class GravadorReplay:
+    """Grava as entradas de uma partida tick a tick, compactadas em trechos (run-length)."""
+    def __init__(self, seed, seed_labirinto, nivel=1, estado=None):
+        """
+        Args:
+            estado: EstadoJogo gravado, do qual vêm os modos de simulação (movimento por
+                segmentos, LOD) que a reprodução precisa repetir (None = modos padrão)
+        """
+        self.seed = seed
+        self.seed_labirinto = seed_labirinto
+        self.nivel = nivel
+        self.modos = _modos(estado) if estado is not None else (0, 0, 0, 0)
+        self.execucoes = []  # Lista de [direcao, comprimento]
+        self.total_ticks = 0
+
+    def registrar(self, direcao):
+        """Registra a direção desejada do Pacman em um tick."""
+        if self.execucoes and self.execucoes[-1][0] == direcao:
+            self.execucoes[-1][1] += 1
+        else:
+            self.execucoes.append([direcao, 1])
+        self.total_ticks += 1
+
+    def para_bytes(self):
+        """Serializa o replay no formato binário."""
+        dados = bytearray(CABECALHO.pack(MAGIC, VERSAO, self.seed, self.seed_labirinto, self.nivel,
+                                         self.total_ticks, len(self.execucoes), *self.modos))
+        for direcao, comprimento in self.execucoes:
+            escrever_varint(dados, (comprimento << 2) | CODIGO_DIRECAO[direcao])
+        return bytes(dados)
+
+    def salvar(self, caminho):
+        """Grava o replay em disco."""
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(self.para_bytes())
+
+class Replay:
+    """Replay carregado: seeds, nível inicial e modos de simulação da partida e a sequência de entradas."""
+    def __init__(self, seed, seed_labirinto, execucoes, total_ticks, nivel=1, modos=(0, 0, 0, 0)):
+        self.seed = seed
+        self.seed_labirinto = seed_labirinto
+        self.nivel = nivel
+        self.modos = modos  # (MODO_*, raio do LOD, largura e altura da câmera do LOD)
+        self.execucoes = execucoes  # Lista de (direcao, comprimento)
+        self.total_ticks = total_ticks
+
+    @classmethod
+    def de_bytes(cls, dados):
+        """Lê um replay do formato binário."""
+        magic, versao = struct.unpack_from("<4sB", dados)
+        if magic != MAGIC:
+            raise ValueError("Arquivo não é um replay do PacDevs")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de replay não suportada: {versao}")
+        _, _, seed, seed_labirinto, nivel, total_ticks, num_execucoes, *modos = CABECALHO.unpack_from(dados)
+
+        pos = CABECALHO.size
+        execucoes = []
+        for _ in range(num_execucoes):
+            valor, pos = ler_varint(dados, pos)
+            execucoes.append((DIRECOES[valor & 3], valor >> 2))
+        return cls(seed, seed_labirinto, execucoes, total_ticks, nivel, tuple(modos))
+
+    def direcoes(self):
+        """Gera a direção desejada do Pacman para cada tick, em ordem."""
+        for direcao, comprimento in self.execucoes:
+            for _ in range(comprimento):
+                yield direcao
+
+    def criar_estado(self, **kwargs):
+        """Cria o estado inicial da partida gravada, com os mesmos modos de simulação."""
+        estado = EstadoJogo(seed=self.seed, seed_labirinto=self.seed_labirinto, nivel=self.nivel, **kwargs)
+        modos, raio, largura_camera, altura_camera = self.modos
+        if modos & MODO_SEGMENTOS:
+            estado.movimento = MovimentoSegmentos()
+        if modos & MODO_LOD:
+            camera = None
+            if largura_camera:
+                from camera import Camera  # Só quando necessário: importa o pygame
+                camera = Camera(largura_camera, altura_camera)
+            estado.lod = AgendadorLOD(raio, camera)
+        return estado
+
+def carregar_replay(caminho):
+    """Carrega um replay do disco."""
+    with open(caminho, "rb") as arquivo:
+        return Replay.de_bytes(arquivo.read())
+
+def reproduzir(replay):
+    """
+    Re-simula a partida sem gráficos, o mais rápido possível.
+
+    Returns:
+        O estado da partida após o último tick gravado
+    """
+    estado = replay.criar_estado(carregar_sprites=False)
+    for direcao in replay.direcoes():
+        estado.atualizar(direcao)
+    return estado
+
+def reproduzir_na_tela(replay, fps=10):
+    """Re-simula a partida desenhando cada tick na janela, a `fps` ticks por segundo (0 = sem limite)."""
+    import pygame
+    import pacman_sprite
+    from camera import Camera
+    from hud import Hud
+    from renderizador import CamadaLabirinto, desenhar_jogo, iniciar_pygame
+
+    iniciar_pygame()
+    screen = pygame.display.set_mode((768, 768))
+    pygame.display.set_caption("PacDevs - Replay")
+    clock = pygame.time.Clock()
+    estado = replay.criar_estado(pacman_sprites=pacman_sprite.PacmanSprite("assets/pacman"))
+    camada = CamadaLabirinto()
+    hud = Hud()
+    camera = Camera(*screen.get_size())
+
+    try:
+        for direcao in replay.direcoes():
+            for evento in pygame.event.get():
+                if evento.type == pygame.QUIT:
+                    return estado
+
+            estado.atualizar(direcao)
+            desenhar_jogo(screen, estado, camada, hud, camera)
+            pygame.display.flip()
+            clock.tick(fps)
+    finally:
+        pygame.quit()
+    return estado
+
+def escrever_varint(dados, valor):
+    """Acrescenta um inteiro sem sinal codificado em LEB128 (7 bits por byte)."""
+    while valor >= 0x80:
+        dados.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    dados.append(valor)
+
+def ler_varint(dados, pos):
+    """Lê um inteiro LEB128 a partir de `pos`. Retorna (valor, nova posição)."""
+    valor = 0
+    deslocamento = 0
+    while True:
+        byte = dados[pos]
+        pos += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return valor, pos
+        deslocamento += 7
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduz um replay do PacDevs")
+    parser.add_argument("arquivo", help="arquivo de replay gravado com main.py --gravar")
+    parser.add_argument("--fps", type=int, default=10, help="ticks por segundo na tela (0 = sem limite)")
+    parser.add_argument("--sem-tela", action="store_true", help="re-simula sem gráficos, o mais rápido possível")
+    args = parser.parse_args()
+
+    replay = carregar_replay(args.arquivo)
+    if args.sem_tela:
+        inicio = time.perf_counter()
+        estado = reproduzir(replay)
+        duracao = time.perf_counter() - inicio
+        print(f"{replay.total_ticks} ticks em {duracao:.3f}s - "
+              f"nível {estado.nivel}, pontuação {estado.pontuacao}")
+    else:
+        reproduzir_na_tela(replay, args.fps)
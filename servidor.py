@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import time
+import traceback
+from jogo import EstadoJogo
+from replay import escrever_varint
+from transmissao import CodificadorEstado, pacote_mensagem
+
+FPS_PADRAO = 10  # Mesma velocidade do jogo em main.py
+DIRECOES = ("up", "down", "left", "right")
+BACKLOG = 1024  # Conexões pendentes aceitas de uma vez (muitos bots conectam juntos)
+MAX_LINHA = 1024  # Bytes de um comando; um cliente que passar disso sem "\n" é desconectado
+
+# Protocolo (uma mensagem por linha, UTF-8):
+#   cliente -> servidor: "DIR <up|down|left|right>", "NOVA [seed]" (reinicia a partida),
+#                        "DELTA" (passa a receber pacotes binários), "SAIR"
+#   servidor -> cliente: JSON compacto por linha
+#     {"t": "sessao", "id", "seed"}                      ao conectar e a cada NOVA
+#     {"t": "nivel", "nivel", "seed_labirinto", "mapa"}  no início de cada nível
+#     {"t": "tick", "tick", "nivel", "pontuacao", "restantes", "pacman": [x, y, direcao],
+#      "fantasmas": [[x, y, estado], ...]}               a cada tick
+#     {"t": "erro", "mensagem"}                          comando inválido
+#   Depois de "DELTA", toda mensagem do servidor é um pacote precedido do tamanho em varint
+#   LEB128: cada tick é um pacote de transmissao.CodificadorEstado (quadro-chave por nível e
+#   deltas nos demais ticks), e "sessao" e "erro" vão em pacotes transmissao.MENSAGEM com o
+#   mesmo JSON (sem a quebra de linha).
+
+def _json(mensagem):
+    """Codifica uma mensagem do protocolo como uma linha JSON."""
+    return (json.dumps(mensagem, separators=(",", ":")) + "\n").encode()
+
+class Sessao:
+    """
+    Uma partida sem gráficos ligada a uma conexão.
+
+    Cada sessão tem seu próprio EstadoJogo (gerador, mapa, entidades e a direção global do
+    Pacman, trocada a cada tick), então as sessões não interferem umas nas outras mesmo
+    sendo avançadas no mesmo laço de eventos.
+    """
+    def __init__(self, id_sessao, transporte, seed=None):
+        self.id = id_sessao
+        self.transporte = transporte
+        self.ativa = True
+        self.escrita_pausada = False  # Cliente lento: ticks continuam, mensagens são descartadas
+        self.estado = None
+        self.direcao = None
+        self.mapa_enviado = None
+        self.codificador = None  # CodificadorEstado depois do comando DELTA
+        self.iniciar(seed)
+
+    def iniciar(self, seed=None):
+        """(Re)inicia a partida da sessão."""
+        self.estado = EstadoJogo(seed=seed, carregar_sprites=False)
+        self.direcao = None
+        self.mapa_enviado = None
+        if self.codificador is not None:
+            self.codificador.forcar_quadro_chave()
+        self.enviar({"t": "sessao", "id": self.id, "seed": self.estado.seed})
+
+    def enviar(self, mensagem):
+        """Envia uma mensagem ao cliente, a menos que ele não esteja conseguindo receber."""
+        if self.escrita_pausada:
+            return
+        if self.codificador is not None:
+            self._enviar_pacote(pacote_mensagem(mensagem))
+        else:
+            self.transporte.write(_json(mensagem))
+
+    def _enviar_pacote(self, pacote):
+        """Envia um pacote do modo DELTA, precedido do tamanho."""
+        dados = bytearray()
+        escrever_varint(dados, len(pacote))
+        self.transporte.write(bytes(dados) + pacote)
+
+    def encerrar(self):
+        """Para de avançar a sessão e fecha a conexão (connection_lost a remove do servidor)."""
+        self.ativa = False
+        self.transporte.close()
+
+    def passo(self):
+        """Avança a partida um tick e envia o novo estado."""
+        estado = self.estado
+        estado.atualizar(self.direcao)
+        if self.escrita_pausada:
+            # Os deltas dependem do pacote anterior: ao voltar, recomeça com um quadro-chave
+            if self.codificador is not None:
+                self.codificador.forcar_quadro_chave()
+            return
+
+        if self.codificador is not None:
+            self._enviar_pacote(self.codificador.codificar(estado))
+            return
+
+        if estado.mapa is not self.mapa_enviado:
+            self.mapa_enviado = estado.mapa
+            self.enviar({"t": "nivel", "nivel": estado.nivel, "seed_labirinto": estado.seed_labirinto,
+                         "mapa": estado.mapa})
+        pacman = estado.pacman
+        self.enviar({"t": "tick", "tick": estado.tick, "nivel": estado.nivel,
+                     "pontuacao": estado.pontuacao, "restantes": estado.pontos.restantes,
+                     "pacman": [pacman.x, pacman.y, pacman.direcao],
+                     "fantasmas": [[fantasma.x, fantasma.y, fantasma.estado] for fantasma in estado.fantasmas]})
+
+    def comando(self, linha):
+        """Executa um comando recebido do cliente."""
+        partes = linha.split()
+        if not partes:
+            return
+        nome = partes[0].upper()
+        if nome == "DIR" and len(partes) == 2 and partes[1] in DIRECOES:
+            self.direcao = partes[1]
+        elif nome == "NOVA" and len(partes) <= 2:
+            try:
+                self.iniciar(int(partes[1]) if len(partes) == 2 else None)
+            except ValueError:
+                self.enviar({"t": "erro", "mensagem": f"seed inválida: {partes[1]}"})
+        elif nome == "DELTA" and len(partes) == 1:
+            self.codificador = CodificadorEstado()
+        elif nome == "SAIR":
+            self.transporte.close()
+        else:
+            self.enviar({"t": "erro", "mensagem": f"comando inválido: {linha}"})
+
+class AgendadorTicks:
+    """
+    Agenda os ticks de todas as sessões em uma única tarefa do laço de eventos.
+
+    As sessões ficam em um heap ordenado pelo instante do próximo tick. A cada despertar
+    todas as sessões vencidas são avançadas em lote, e a tarefa dorme até o próximo
+    vencimento. Uma sessão atrasada mais de um intervalo é reagendada a partir de agora,
+    em vez de acumular ticks atrasados.
+    """
+    def __init__(self, fps=FPS_PADRAO):
+        self.intervalo = 1 / fps
+        self.heap = []  # (instante do próximo tick, desempate, sessão)
+        self._contador = itertools.count()
+        self._novas = None  # asyncio.Event criado dentro do laço de eventos, em executar()
+        self.ticks = 0  # Total de ticks de sessão executados
+
+    def agendar(self, sessao):
+        """Coloca uma sessão nova na agenda, com o primeiro tick daqui a um intervalo."""
+        heapq.heappush(self.heap, (time.monotonic() + self.intervalo, next(self._contador), sessao))
+        if self._novas is not None:
+            self._novas.set()
+
+    async def executar(self):
+        """Laço do agendador (roda até a tarefa ser cancelada)."""
+        heap = self.heap
+        self._novas = asyncio.Event()
+        while True:
+            if not heap:
+                self._novas.clear()
+                await self._novas.wait()
+                continue
+
+            espera = heap[0][0] - time.monotonic()
+            if espera > 0:
+                # Acorda no próximo vencimento ou antes, se uma sessão for agendada
+                self._novas.clear()
+                try:
+                    await asyncio.wait_for(self._novas.wait(), espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            agora = time.monotonic()
+            while heap and heap[0][0] <= agora:
+                instante, _, sessao = heapq.heappop(heap)
+                if not sessao.ativa:
+                    continue
+                try:
+                    sessao.passo()
+                except Exception:  # pylint: disable=broad-except
+                    # Um erro em uma partida não pode parar as outras: só esta é encerrada
+                    print(f"AVISO: Sessão {sessao.id} encerrada por erro no tick:")
+                    traceback.print_exc()
+                    sessao.encerrar()
+                    continue
+                self.ticks += 1
+                proximo = instante + self.intervalo
+                if proximo < agora:
+                    proximo = agora + self.intervalo
+                heapq.heappush(heap, (proximo, next(self._contador), sessao))
+
+            # Deixa o laço de eventos processar a rede entre os lotes
+            await asyncio.sleep(0)
+
+class ProtocoloSessao(asyncio.Protocol):
+    """Conexão de um cliente: lê comandos por linha e repassa à sua sessão."""
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.sessao = None
+        self.buffer = b""
+
+    def connection_made(self, transport):
+        self.sessao = self.servidor.nova_sessao(transport)
+
+    def data_received(self, data):
+        self.buffer += data
+        *linhas, self.buffer = self.buffer.split(b"\n")
+        for linha in linhas:
+            self.sessao.comando(linha.decode("utf-8", "replace").strip())
+        if len(self.buffer) > MAX_LINHA:
+            # Linha sem fim: o buffer cresceria sem limite
+            print(f"AVISO: Sessão {self.sessao.id} desconectada: comando com mais de {MAX_LINHA} bytes")
+            self.buffer = b""
+            self.sessao.encerrar()
+
+    def connection_lost(self, exc):
+        self.servidor.remover_sessao(self.sessao)
+
+    def pause_writing(self):
+        self.sessao.escrita_pausada = True
+
+    def resume_writing(self):
+        self.sessao.escrita_pausada = False
+
+class ServidorJogo:
+    """Servidor de partidas sem gráficos: muitas sessões em um laço de eventos asyncio."""
+    def __init__(self, fps=FPS_PADRAO):
+        self.agendador = AgendadorTicks(fps)
+        self.sessoes = {}
+        self._ids = itertools.count(1)
+
+    def nova_sessao(self, transporte):
+        """Cria e agenda a sessão de uma nova conexão."""
+        sessao = Sessao(next(self._ids), transporte)
+        self.sessoes[sessao.id] = sessao
+        self.agendador.agendar(sessao)
+        return sessao
+
+    def remover_sessao(self, sessao):
+        """Encerra a sessão de uma conexão fechada (sai da agenda no próximo vencimento)."""
+        sessao.ativa = False
+        self.sessoes.pop(sessao.id, None)
+
+    async def servir(self, host="127.0.0.1", porta=8765, caminho_unix=None, intervalo_estatisticas=None):
+        """
+        Aceita conexões por TCP (host, porta) ou por socket Unix (caminho_unix) até ser cancelado.
+
+        Args:
+            intervalo_estatisticas: Se informado, mostra sessões e ticks/s a cada tantos segundos
+        """
+        loop = asyncio.get_running_loop()
+        if caminho_unix:
+            servidor = await loop.create_unix_server(lambda: ProtocoloSessao(self), caminho_unix,
+                                                     backlog=BACKLOG)
+        else:
+            servidor = await loop.create_server(lambda: ProtocoloSessao(self), host, porta, backlog=BACKLOG)
+
+        tarefas = [asyncio.ensure_future(self.agendador.executar())]
+        if intervalo_estatisticas:
+            tarefas.append(asyncio.ensure_future(self._mostrar_estatisticas(intervalo_estatisticas)))
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+
+    async def _mostrar_estatisticas(self, intervalo):
+        """Mostra periodicamente o número de sessões e de ticks de sessão por segundo."""
+        ticks_anteriores = self.agendador.ticks
+        while True:
+            await asyncio.sleep(intervalo)
+            ticks = self.agendador.ticks
+            print(f"{len(self.sessoes)} sessões, {(ticks - ticks_anteriores) / intervalo:.0f} ticks/s")
+            ticks_anteriores = ticks
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de partidas sem gráficos do PacDevs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--unix", metavar="CAMINHO", help="escuta em um socket Unix em vez de TCP")
+    parser.add_argument("--fps", type=int, default=FPS_PADRAO, help="ticks por segundo de cada sessão")
+    parser.add_argument("--estatisticas", type=float, metavar="SEGUNDOS",
+                        help="mostra sessões e ticks/s periodicamente")
+    args = parser.parse_args()
+    try:
+        asyncio.run(ServidorJogo(args.fps).servir(args.host, args.porta, args.unix, args.estatisticas))
+    except KeyboardInterrupt:
+        pass
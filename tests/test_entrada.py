@@ -0,0 +1,38 @@
+import pygame
+from entrada import FilaEntrada
+
+class PacmanFalso:
+    """Pacman que sempre pode fazer a curva e anda na direção desejada no tick seguinte."""
+    def __init__(self):
+        self.direcao = "right"
+
+    def pode_mover_para(self, direcao, mapa=None):
+        del direcao, mapa
+        return True
+
+def _tecla(key, **atributos):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, **atributos)
+
+def _curva(entrada, pacman):
+    pacman.direcao = entrada.direcao_do_tick(pacman, None)
+    entrada.apos_tick(pacman)
+
+def test_latencia_desde_o_instante_do_evento(monkeypatch):
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: 130)
+    entrada = FilaEntrada()
+    pacman = PacmanFalso()
+    entrada.processar_evento(_tecla(pygame.K_UP, timestamp=100))
+    _curva(entrada, pacman)
+    assert pacman.direcao == "up"
+    assert list(entrada.latencias) == [30]
+
+def test_tecla_antes_do_temporizador_nao_conta(monkeypatch):
+    ticks = [0]
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: ticks[0])
+    entrada = FilaEntrada()
+    pacman = PacmanFalso()
+    entrada.processar_evento(_tecla(pygame.K_LEFT))  # Sem timestamp, temporizador parado
+    ticks[0] = 250
+    _curva(entrada, pacman)
+    assert pacman.direcao == "left"
+    assert not entrada.latencias
@@ -0,0 +1,43 @@
+import glob
+import pygame
+import pytest
+import atlas
+import ghost
+from ghost import Ghost
+
+TILE_SIZE = 34
+ESTADOS = (Ghost.NORMAL, Ghost.VULNERAVEL, Ghost.COMIDO)
+
+@pytest.fixture(name="tela")
+def fixture_tela():
+    pygame.display.init()
+    yield pygame.display.set_mode((64, 64))
+    pygame.display.quit()
+
+def _carregar_atlas(monkeypatch, com_atlas):
+    """Força o próximo obter_atlas() a carregar o atlas (ou a não encontrá-lo)."""
+    monkeypatch.setattr(atlas, "_atlas", None)
+    monkeypatch.setattr(atlas, "_atlas_carregado", not com_atlas)
+    monkeypatch.setattr(ghost, "_superficies_compostas", {})
+
+def _desenhos(sprite_path):
+    """Pixels do fantasma desenhado sobre um fundo cinza em cada estado."""
+    fantasma = Ghost(0, 0, sprite_path, TILE_SIZE)
+    fantasma.direcao_atual = "left"
+    desenhos = []
+    for estado in ESTADOS:
+        fantasma.estado = estado
+        fundo = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        fundo.fill((40, 40, 40))
+        fantasma.desenhar(fundo)
+        desenhos.append(pygame.image.tobytes(fundo, "RGB"))
+    return desenhos
+
+@pytest.mark.usefixtures("tela")
+@pytest.mark.parametrize("sprite_path", sorted(glob.glob("assets/ghosts/*.png")))
+def test_fantasma_desenhado_igual_com_e_sem_atlas(monkeypatch, sprite_path):
+    _carregar_atlas(monkeypatch, com_atlas=False)
+    sem_atlas = _desenhos(sprite_path)
+    _carregar_atlas(monkeypatch, com_atlas=True)
+    assert atlas.obter_atlas() is not None
+    assert _desenhos(sprite_path) == sem_atlas
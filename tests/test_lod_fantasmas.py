@@ -0,0 +1,57 @@
+import pytest
+from jogo import EstadoJogo, criar_fantasmas
+from lod_fantasmas import AgendadorLOD
+
+DIRECOES = ("up", "left", "down", "right")
+
+def _estado(seed, lod=True):
+    """Labirinto grande com 40 fantasmas, para que a maioria fique longe do Pacman."""
+    estado = EstadoJogo(seed=seed, carregar_sprites=False, blocos_labirinto=(12, 10))
+    fantasmas = []
+    while len(fantasmas) < 40:
+        fantasmas += criar_fantasmas(estado.mapa, estado.gerador, carregar_sprites=False)
+    estado.fantasmas = fantasmas[:40]
+    estado.lod = AgendadorLOD(raio=5) if lod else None
+    return estado
+
+def _resumo(estado):
+    return (estado.tick, estado.nivel, estado.pontuacao, estado.pacman.x, estado.pacman.y,
+            [(fantasma.x, fantasma.y, fantasma.direcao_atual, fantasma.estado,
+              fantasma.tempo_total, fantasma.tempo_vulneravel) for fantasma in estado.fantasmas])
+
+def _rodar(estado, inicio, ticks):
+    """Roda `ticks` ticks a partir do tick `inicio` e retorna o resumo de cada um."""
+    historico = []
+    for tick in range(inicio, inicio + ticks):
+        estado.atualizar(DIRECOES[(tick // 11) % len(DIRECOES)])
+        historico.append(_resumo(estado))
+    return historico
+
+@pytest.mark.parametrize("seed", [4, 7, 11])
+def test_lod_tem_o_mesmo_resultado_da_ia_completa(seed):
+    com_lod = _estado(seed)
+    sem_lod = _estado(seed, lod=False)
+    simplificadas = 0
+    for tick in range(600):
+        direcao = DIRECOES[(tick // 11) % len(DIRECOES)]
+        com_lod.atualizar(direcao)
+        sem_lod.atualizar(direcao)
+        simplificadas += com_lod.lod.simplificadas
+        assert _resumo(com_lod) == _resumo(sem_lod), f"tick {tick}"
+    assert simplificadas > 0
+    assert com_lod.gerador.getstate() == sem_lod.gerador.getstate()
+
+def test_snapshot_restaurado_em_outra_partida():
+    estado = _estado(4)
+    _rodar(estado, 0, 150)
+    snapshot = estado.snapshot(incluir_gerador=True)
+    esperado = _rodar(estado, 150, 250)
+
+    # Partida nova, rodando intercalada com a original restaurada: não compartilham nada
+    outro = _estado(4)
+    outro.restore(snapshot)
+    estado.restore(snapshot)
+    assert not set(map(id, outro.fantasmas)) & set(map(id, estado.fantasmas))
+    for tick, resumo in enumerate(esperado, 150):
+        assert _rodar(outro, tick, 1) == [resumo], f"tick {tick}"
+        assert _rodar(estado, tick, 1) == [resumo], f"tick {tick}"
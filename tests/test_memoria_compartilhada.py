@@ -0,0 +1,59 @@
+import os
+import pytest
+from jogo import EstadoJogo, criar_fantasmas
+from memoria_compartilhada import (CanalObservacoes, ENTIDADE_PRESENTE, ENTIDADE_X, ENTIDADE_Y,
+                                   MAX_FANTASMAS, numpy)
+
+pytestmark = pytest.mark.skipif(numpy is None, reason="o canal exige NumPy")
+
+def _nome():
+    return f"pacdevs_teste_{os.getpid()}"
+
+def test_agente_le_o_quadro_publicado():
+    estado = EstadoJogo(seed=2, carregar_sprites=False)
+    canal = CanalObservacoes.criar(_nome(), num_jogos=2)
+    agente = CanalObservacoes.conectar(_nome())
+    try:
+        destino = agente.criar_destino()
+        assert agente.ler(0, destino) is None
+
+        for _ in range(6):  # Mais quadros que a profundidade do anel
+            estado.atualizar("left")
+            canal.publicar(0, estado)
+        assert agente.ler(0, destino) == 5
+        assert agente.ler(0, destino, numero=0) is None  # Já sobrescrito no anel
+
+        entidades = destino["entidades"]
+        assert tuple(entidades[0, [ENTIDADE_X, ENTIDADE_Y]]) == (estado.pacman.x, estado.pacman.y)
+        assert entidades[:, ENTIDADE_PRESENTE].sum() == 1 + len(estado.fantasmas)
+
+        agente.escrever_acao(1, "up")
+        assert canal.acao(1) == "up" and canal.acao(0) is None
+    finally:
+        agente.fechar()
+        canal.fechar()
+
+def test_fantasmas_alem_da_capacidade():
+    estado = EstadoJogo(seed=2, carregar_sprites=False)
+    estado.fantasmas += criar_fantasmas(estado.mapa, estado.gerador, carregar_sprites=False)
+    assert len(estado.fantasmas) > MAX_FANTASMAS
+
+    canal = CanalObservacoes.criar(_nome(), num_jogos=1)
+    try:
+        with pytest.raises(ValueError):
+            canal.publicar(0, estado)
+        assert int(canal.escritos[0]) == 0 and int(canal.sequencias[0, 0]) == 0
+    finally:
+        canal.fechar()
+
+    # Um canal criado com capacidade suficiente publica todos
+    canal = CanalObservacoes.criar(_nome(), num_jogos=1, max_fantasmas=len(estado.fantasmas))
+    agente = CanalObservacoes.conectar(_nome())
+    try:
+        canal.publicar(0, estado)
+        destino = agente.criar_destino()
+        agente.ler(0, destino)
+        assert destino["entidades"][:, ENTIDADE_PRESENTE].sum() == 1 + len(estado.fantasmas)
+    finally:
+        agente.fechar()
+        canal.fechar()
@@ -0,0 +1,44 @@
+import pytest
+from jogo import EstadoJogo
+from movimento_segmentos import MovimentoSegmentos
+
+DIRECOES = ("up", "left", "down", "right")
+
+def _estado(seed):
+    estado = EstadoJogo(seed=seed, carregar_sprites=False)
+    estado.movimento = MovimentoSegmentos()
+    return estado
+
+def _resumo(estado):
+    return (estado.tick, estado.nivel, estado.pontuacao, estado.pacman.x, estado.pacman.y,
+            estado.pacman.direcao,
+            [(fantasma.x, fantasma.y, fantasma.direcao_atual, fantasma.estado, fantasma.tempo_total)
+             for fantasma in estado.fantasmas])
+
+def _rodar(estado, inicio, ticks):
+    """Roda `ticks` ticks a partir do tick `inicio` e retorna o resumo de cada um."""
+    historico = []
+    for tick in range(inicio, inicio + ticks):
+        estado.atualizar(DIRECOES[(tick // 13) % len(DIRECOES)])
+        historico.append(_resumo(estado))
+    return historico
+
+@pytest.mark.parametrize("seed", range(8))
+def test_continuacao_do_snapshot_e_identica(seed):
+    estado = _estado(seed)
+    _rodar(estado, 0, 300)
+    snapshot = estado.snapshot(incluir_gerador=True)
+    esperado = _rodar(estado, 300, 400)
+
+    estado.restore(snapshot)
+    assert _rodar(estado, 300, 400) == esperado
+
+def test_snapshot_restaurado_em_outra_partida():
+    estado = _estado(3)
+    _rodar(estado, 0, 300)
+    snapshot = estado.snapshot(incluir_gerador=True)
+    esperado = _rodar(estado, 300, 400)
+
+    outro = _estado(3)
+    outro.restore(snapshot)
+    assert _rodar(outro, 300, 400) == esperado
@@ -0,0 +1,56 @@
+from maze_generator import PONTO, POWER_PELLET, PAREDE, gerar_labirinto
+from pontos import PontosNivel
+
+def _mapa():
+    return gerar_labirinto(4, 3, 1, seed=3)
+
+def _celulas_com_ponto(mapa):
+    return {(row, col) for row, linha in enumerate(mapa) for col, celula in enumerate(linha)
+            if celula in (PONTO, POWER_PELLET)}
+
+def test_bitset_igual_ao_mapa():
+    mapa = _mapa()
+    pontos = PontosNivel(mapa)
+    esperadas = _celulas_com_ponto(mapa)
+
+    assert pontos.total == pontos.restantes == len(esperadas)
+    assert {(row, col) for row in range(pontos.altura) for col in range(pontos.largura)
+            if pontos.tem_ponto(row, col)} == esperadas
+
+def test_remover_e_limpo():
+    mapa = _mapa()
+    pontos = PontosNivel(mapa)
+    parede = next((row, col) for row, linha in enumerate(mapa) for col, celula in enumerate(linha)
+                  if celula == PAREDE)
+    assert not pontos.remover(*parede)
+
+    for indice, celula in enumerate(sorted(_celulas_com_ponto(mapa))):
+        assert not pontos.limpo()
+        assert pontos.remover(*celula)
+        assert not pontos.remover(*celula)
+        assert not pontos.tem_ponto(*celula)
+        assert pontos.restantes == pontos.total - indice - 1
+    assert pontos.limpo()
+
+    pontos.reiniciar()
+    assert pontos.restantes == pontos.total
+    assert bytes(pontos.bits) == pontos.iniciais
+
+def test_snapshot_copy_on_write():
+    mapa = _mapa()
+    pontos = PontosNivel(mapa)
+    celulas = sorted(_celulas_com_ponto(mapa))
+    pontos.remover(*celulas[0])
+
+    salvo = pontos.snapshot()
+    bits_salvos = bytes(salvo[0])
+    pontos.remover(*celulas[1])
+    assert bytes(salvo[0]) == bits_salvos  # A remoção copiou o bitset em vez de alterar o snapshot
+
+    # O mesmo snapshot pode ser restaurado mais de uma vez
+    for _ in range(2):
+        pontos.restore(salvo)
+        assert pontos.restantes == pontos.total - 1
+        assert pontos.tem_ponto(*celulas[1])
+        pontos.remover(*celulas[1])
+        assert bytes(salvo[0]) == bits_salvos
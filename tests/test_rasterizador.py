@@ -0,0 +1,18 @@
+import pytest
+import rasterizador
+from jogo import EstadoJogo
+
+pytestmark = pytest.mark.skipif(not rasterizador.disponivel(), reason="o rasterizador exige NumPy")
+
+@pytest.mark.parametrize("janela", [(0, 5, 0, 7), (3, 11, 5, 19), (7, 8, 1, 2)])
+def test_janela_igual_ao_recorte_do_mapa_inteiro(janela):
+    estado = EstadoJogo(seed=4, carregar_sprites=False)
+    for _ in range(300):  # Come alguns pontos
+        estado.atualizar("left" if estado.tick < 150 else "up")
+    raster = rasterizador.RasterizadorTiles()
+
+    inteiro = raster.indices(estado.mapa, estado.mascaras_parede, estado.pontos)
+    row_inicio, row_fim, col_inicio, col_fim = janela
+    recorte = raster.indices(estado.mapa, estado.mascaras_parede, estado.pontos, janela)
+    assert (recorte == inteiro[row_inicio:row_fim, col_inicio:col_fim]).all()
+    assert (inteiro == rasterizador.CARIMBO_PONTO).sum() < estado.pontos.total
@@ -0,0 +1,80 @@
+import pytest
+from camera import Camera
+from jogo import EstadoJogo
+from lod_fantasmas import AgendadorLOD
+from movimento_segmentos import MovimentoSegmentos
+from replay import GravadorReplay, Replay, escrever_varint, ler_varint, reproduzir
+
+DIRECOES = ("up", "left", "down", "right")
+
+def _jogar(ticks, seed=7, nivel=1, preparar=None):
+    """Joga uma partida sem gráficos trocando de direção a cada 13 ticks, gravando as entradas."""
+    estado = EstadoJogo(seed=seed, nivel=nivel, carregar_sprites=False)
+    if preparar is not None:
+        preparar(estado)
+    gravador = GravadorReplay(estado.seed, estado.seed_labirinto_inicial, estado.nivel, estado)
+    for tick in range(ticks):
+        direcao = DIRECOES[(tick // 13) % len(DIRECOES)]
+        gravador.registrar(direcao)
+        estado.atualizar(direcao)
+    return estado, gravador
+
+def _resumo(estado):
+    return (estado.tick, estado.nivel, estado.pontuacao, estado.pontos.restantes,
+            estado.pacman.x, estado.pacman.y, estado.pacman.direcao,
+            [(fantasma.x, fantasma.y, fantasma.estado) for fantasma in estado.fantasmas])
+
+@pytest.mark.parametrize("valor", [0, 1, 127, 128, 300, 2**32 - 1, 2**63])
+def test_varint_ida_e_volta(valor):
+    dados = bytearray(b"x")
+    escrever_varint(dados, valor)
+    assert ler_varint(dados, 1) == (valor, len(dados))
+
+def test_replay_reproduz_a_partida():
+    estado, gravador = _jogar(2000)
+    replay = Replay.de_bytes(gravador.para_bytes())
+
+    assert replay.total_ticks == 2000
+    assert list(replay.direcoes()) == [direcao for direcao, comprimento in gravador.execucoes
+                                       for _ in range(comprimento)]
+    assert _resumo(reproduzir(replay)) == _resumo(estado)
+
+def test_replay_rejeita_arquivo_invalido():
+    _, gravador = _jogar(10)
+    dados = bytearray(gravador.para_bytes())
+    dados[:4] = b"NADA"
+    with pytest.raises(ValueError):
+        Replay.de_bytes(bytes(dados))
+
+def test_replay_comecando_em_outro_nivel():
+    estado, gravador = _jogar(500, nivel=7)
+    replay = Replay.de_bytes(gravador.para_bytes())
+    assert replay.nivel == 7
+    assert _resumo(reproduzir(replay)) == _resumo(estado)
+
+def test_replay_rejeita_outra_versao():
+    _, gravador = _jogar(10)
+    dados = bytearray(gravador.para_bytes())
+    dados[4] = 2
+    with pytest.raises(ValueError):
+        Replay.de_bytes(bytes(dados))
+
+def _segmentos(estado):
+    estado.movimento = MovimentoSegmentos()
+
+def _lod_com_camera(estado):
+    estado.lod = AgendadorLOD(raio=3, camera=Camera(200, 150))
+
+def _segmentos_e_lod(estado):
+    estado.movimento = MovimentoSegmentos()
+    estado.lod = AgendadorLOD()
+
+@pytest.mark.parametrize("preparar", [_segmentos, _lod_com_camera, _segmentos_e_lod])
+def test_replay_repete_os_modos_de_simulacao(preparar):
+    estado, gravador = _jogar(600, preparar=preparar)
+    replay = Replay.de_bytes(gravador.para_bytes())
+    reproduzido = reproduzir(replay)
+
+    assert (reproduzido.movimento is None) == (estado.movimento is None)
+    assert (reproduzido.lod is None) == (estado.lod is None)
+    assert _resumo(reproduzido) == _resumo(estado)
@@ -0,0 +1,84 @@
+import asyncio
+from replay import ler_varint
+from servidor import MAX_LINHA, ProtocoloSessao, ServidorJogo
+from transmissao import DecodificadorEstado
+
+class TransporteFalso:
+    """Transporte asyncio mínimo: guarda o que foi escrito e se foi fechado."""
+    def __init__(self):
+        self.dados = bytearray()
+        self.fechado = False
+
+    def write(self, dados):
+        self.dados += dados
+
+    def close(self):
+        self.fechado = True
+
+def _conectar(servidor):
+    protocolo = ProtocoloSessao(servidor)
+    transporte = TransporteFalso()
+    protocolo.connection_made(transporte)
+    return protocolo, transporte
+
+def test_erro_em_uma_sessao_nao_para_as_outras():
+    servidor = ServidorJogo(fps=200)
+    _, transporte_quebrado = _conectar(servidor)
+    _, transporte_ok = _conectar(servidor)
+    quebrada, ok = servidor.sessoes.values()
+
+    def falhar():
+        raise RuntimeError("falha simulada")
+    quebrada.passo = falhar
+
+    async def rodar():
+        tarefa = asyncio.ensure_future(servidor.agendador.executar())
+        await asyncio.sleep(0.2)
+        tarefa.cancel()
+
+    asyncio.run(rodar())
+    assert transporte_quebrado.fechado and not quebrada.ativa
+    assert not transporte_ok.fechado and ok.ativa
+    assert ok.estado.tick > 5
+
+def test_linha_sem_fim_desconecta():
+    servidor = ServidorJogo()
+    protocolo, transporte = _conectar(servidor)
+    protocolo.data_received(b"DIR up\nDIR ")
+    assert protocolo.sessao.direcao == "up" and not transporte.fechado
+
+    for _ in range(MAX_LINHA // 100 + 1):
+        protocolo.data_received(b"x" * 100)
+    assert transporte.fechado
+    assert len(protocolo.buffer) <= MAX_LINHA
+
+def _ler_pacotes(dados):
+    """Separa o fluxo do modo DELTA em pacotes (cada um precedido do tamanho em varint)."""
+    pacotes = []
+    pos = 0
+    while pos < len(dados):
+        tamanho, pos = ler_varint(dados, pos)
+        assert pos + tamanho <= len(dados)
+        pacotes.append(bytes(dados[pos:pos + tamanho]))
+        pos += tamanho
+    return pacotes
+
+def test_modo_delta_so_envia_pacotes():
+    servidor = ServidorJogo()
+    protocolo, transporte = _conectar(servidor)
+    sessao = protocolo.sessao
+    inicio = len(transporte.dados)  # Mensagem "sessao" da conexão, ainda em JSON
+
+    protocolo.data_received(b"DELTA\n")
+    for _ in range(3):
+        sessao.passo()
+    protocolo.data_received(b"NOVA 5\nCOMANDO ERRADO\nNOVA abc\n")
+    for _ in range(3):
+        sessao.passo()
+
+    decodificador = DecodificadorEstado()
+    mensagens = [decodificador.aplicar(pacote) for pacote in _ler_pacotes(transporte.dados[inicio:])]
+    assert [mensagem["t"] for mensagem in mensagens if mensagem is not None] == ["sessao", "erro", "erro"]
+    assert mensagens[3] == {"t": "sessao", "id": sessao.id, "seed": 5}
+    assert decodificador.tick == sessao.estado.tick == 3
+    assert decodificador.pacman[:2] == [sessao.estado.pacman.x, sessao.estado.pacman.y]
@@ -0,0 +1,63 @@
+from jogo import EstadoJogo
+from transmissao import CodificadorEstado, DecodificadorEstado, MENSAGEM, QUADRO_CHAVE, pacote_mensagem
+
+DIRECOES = ("up", "left", "down", "right")
+
+def _conferir(decodificador, estado):
+    """O estado reconstruído pelo decodificador é igual ao da partida."""
+    pacman = estado.pacman
+    assert decodificador.tick == estado.tick
+    assert decodificador.nivel == estado.nivel
+    assert decodificador.pontuacao == estado.pontuacao
+    assert decodificador.seed_labirinto == estado.seed_labirinto
+    assert decodificador.mapa == estado.mapa
+    assert bytes(decodificador.bits) == bytes(estado.pontos.bits)
+    assert decodificador.pacman == [pacman.x, pacman.y, pacman.direcao]
+    assert decodificador.fantasmas == [[fantasma.x, fantasma.y, fantasma.estado, fantasma.direcao_atual]
+                                       for fantasma in estado.fantasmas]
+
+def test_pacotes_reconstroem_a_partida():
+    estado = EstadoJogo(seed=11, carregar_sprites=False)
+    codificador = CodificadorEstado()
+    decodificador = DecodificadorEstado()
+    snapshot = None
+    quadros_chave = 0
+
+    for tick in range(1200):
+        if tick == 300:
+            snapshot = estado.snapshot()
+        elif tick == 500:
+            estado.restore(snapshot)  # Volta no tempo: tick e pontos regridem
+        elif tick == 800:
+            # Todos os pontos comidos: o próximo tick gera um novo nível
+            for row in range(estado.pontos.altura):
+                for col in range(estado.pontos.largura):
+                    estado.pontos.remover(row, col)
+        estado.atualizar(DIRECOES[(tick // 17) % len(DIRECOES)])
+
+        pacote = codificador.codificar(estado)
+        quadros_chave += pacote[0] == QUADRO_CHAVE
+        assert decodificador.aplicar(pacote) is None
+        _conferir(decodificador, estado)
+
+    assert estado.nivel == 2
+    assert quadros_chave == 2
+
+def test_quadro_chave_forcado():
+    estado = EstadoJogo(seed=3, carregar_sprites=False)
+    codificador = CodificadorEstado()
+    for _ in range(20):
+        estado.atualizar("left")
+        codificador.codificar(estado)
+
+    # Um espectador que entra no meio da partida só precisa do quadro-chave seguinte
+    codificador.forcar_quadro_chave()
+    estado.atualizar("up")
+    espectador = DecodificadorEstado()
+    espectador.aplicar(codificador.codificar(estado))
+    _conferir(espectador, estado)
+
+def test_pacote_mensagem():
+    pacote = pacote_mensagem({"t": "erro", "mensagem": "comando inválido: X"})
+    assert pacote[0] == MENSAGEM
+    assert DecodificadorEstado().aplicar(pacote) == {"t": "erro", "mensagem": "comando inválido: X"}
@@ -0,0 +1,310 @@
+import json
+import zlib
+from replay import DIRECOES, CODIGO_DIRECAO, escrever_varint, ler_varint
+
+# Pacotes do estado da partida para espectadores e clientes remotos.
+#
+# Quadro-chave (um por nível, ou quando pedido):
+#   tipo, tick, nível, pontuação, seed do labirinto, altura, largura,
+#   tamanho + zlib(mapa, uma célula por byte, seguido do bitset de pontos),
+#   Pacman (x, y, direção), número de fantasmas e cada fantasma (x, y, estado, direção)
+# Delta (demais ticks), só com o que mudou desde o pacote anterior:
+#   tipo, flags, [avanço de tick], [diferença de pontuação], [células de pontos alteradas],
+#   [deslocamento do Pacman], [direção do Pacman], [fantasmas alterados]
+# Mensagem (avisos do servidor no mesmo fluxo binário, ver servidor.py):
+#   tipo, JSON compacto em UTF-8 até o fim do pacote
+# Números são varints LEB128 (os com sinal em zigue-zague) e direções são um byte.
+QUADRO_CHAVE = 0
+DELTA = 1
+MENSAGEM = 2
+
+# Flags do delta
+MUDOU_TICK = 1        # Avanço de tick diferente de 1
+MUDOU_PONTUACAO = 2
+MUDOU_PONTOS = 4      # Pontos comidos (ou restaurados)
+MOVEU_PACMAN = 8
+DIRECAO_PACMAN = 16
+MUDOU_FANTASMAS = 32
+
+# Campos alterados de um fantasma
+MOVEU_FANTASMA = 1
+ESTADO_FANTASMA = 2
+DIRECAO_FANTASMA = 4
+
+SEM_DIRECAO = len(DIRECOES)  # Código de direção None (ex.: fantasma parado)
+
+def _codigo(direcao):
+    return CODIGO_DIRECAO.get(direcao, SEM_DIRECAO)
+
+def _direcao(codigo):
+    return DIRECOES[codigo] if codigo < SEM_DIRECAO else None
+
+def _escrever_inteiro(dados, valor):
+    """Escreve um inteiro com sinal em zigue-zague (valores pequenos ocupam um byte)."""
+    escrever_varint(dados, valor << 1 if valor >= 0 else ((-valor) << 1) - 1)
+
+def _ler_inteiro(dados, pos):
+    valor, pos = ler_varint(dados, pos)
+    return (valor >> 1) if not valor & 1 else -((valor + 1) >> 1), pos
+
+def _fantasmas(estado):
+    """Estado visível dos fantasmas: [(x, y, estado, direção)]."""
+    return [(fantasma.x, fantasma.y, fantasma.estado, fantasma.direcao_atual) for fantasma in estado.fantasmas]
+
+def pacote_mensagem(mensagem):
+    """Pacote MENSAGEM com uma mensagem do protocolo (dicionário serializável em JSON)."""
+    return bytes([MENSAGEM]) + json.dumps(mensagem, separators=(",", ":")).encode()
+
+class CodificadorEstado:
+    """
+    Codifica o estado de uma partida, tick a tick, em pacotes binários compactos.
+
+    O primeiro pacote de cada nível é um quadro-chave com o labirinto completo. Os
+    seguintes levam apenas as diferenças em relação ao pacote anterior: deslocamentos das
+    entidades, células cujos pontos foram comidos e mudanças de estado dos fantasmas
+    (tornar_vulneravel, foi_comido...). Em um nível 20x22 um delta tem ~20 bytes.
+    """
+    def __init__(self):
+        self.mapa = None
+        self.tick = 0
+        self.pontuacao = 0
+        self.bits = b""
+        self.pacman = None
+        self.fantasmas = []
+
+    def forcar_quadro_chave(self):
+        """Faz o próximo pacote ser um quadro-chave (ex.: um espectador acabou de entrar)."""
+        self.mapa = None
+
+    def codificar(self, estado):
+        """Retorna o pacote do estado atual da partida."""
+        fantasmas = _fantasmas(estado)
+        if estado.mapa is not self.mapa or len(fantasmas) != len(self.fantasmas):
+            return self._quadro_chave(estado, fantasmas)
+
+        dados = bytearray([DELTA, 0])
+        flags = 0
+
+        avanco = estado.tick - self.tick
+        if avanco != 1:
+            flags |= MUDOU_TICK
+            _escrever_inteiro(dados, avanco)
+
+        if estado.pontuacao != self.pontuacao:
+            flags |= MUDOU_PONTUACAO
+            _escrever_inteiro(dados, estado.pontuacao - self.pontuacao)
+
+        bits = bytes(estado.pontos.bits)
+        if bits != self.bits:
+            flags |= MUDOU_PONTOS
+            diferenca = int.from_bytes(bits, "little") ^ int.from_bytes(self.bits, "little")
+            indices = []
+            while diferenca:
+                bit = diferenca & -diferenca
+                indices.append(bit.bit_length() - 1)
+                diferenca ^= bit
+            # Índices crescentes, cada um gravado como a distância até o anterior
+            escrever_varint(dados, len(indices))
+            anterior = 0
+            for indice in indices:
+                escrever_varint(dados, indice - anterior)
+                anterior = indice
+            self.bits = bits
+
+        pacman = estado.pacman
+        x, y, direcao = self.pacman
+        if (pacman.x, pacman.y) != (x, y):
+            flags |= MOVEU_PACMAN
+            _escrever_inteiro(dados, pacman.x - x)
+            _escrever_inteiro(dados, pacman.y - y)
+        if pacman.direcao != direcao:
+            flags |= DIRECAO_PACMAN
+            dados.append(_codigo(pacman.direcao))
+
+        if fantasmas != self.fantasmas:
+            flags |= MUDOU_FANTASMAS
+            alterados = [i for i, (novo, antigo) in enumerate(zip(fantasmas, self.fantasmas)) if novo != antigo]
+            escrever_varint(dados, sum(1 << i for i in alterados))
+            for i in alterados:
+                self._escrever_fantasma_alterado(dados, fantasmas[i], self.fantasmas[i])
+
+        dados[1] = flags
+        self.tick = estado.tick
+        self.pontuacao = estado.pontuacao
+        self.pacman = (pacman.x, pacman.y, pacman.direcao)
+        self.fantasmas = fantasmas
+        return bytes(dados)
+
+    def _quadro_chave(self, estado, fantasmas):
+        """Pacote com o nível completo: labirinto, pontos restantes e entidades."""
+        mapa = estado.mapa
+        dados = bytearray([QUADRO_CHAVE])
+        for valor in (estado.tick, estado.nivel, estado.pontuacao, estado.seed_labirinto,
+                      len(mapa), len(mapa[0])):
+            escrever_varint(dados, valor)
+
+        bits = bytes(estado.pontos.bits)
+        compactado = zlib.compress(bytes(celula for linha in mapa for celula in linha) + bits)
+        escrever_varint(dados, len(compactado))
+        dados += compactado
+
+        pacman = estado.pacman
+        _escrever_inteiro(dados, pacman.x)
+        _escrever_inteiro(dados, pacman.y)
+        dados.append(_codigo(pacman.direcao))
+
+        escrever_varint(dados, len(fantasmas))
+        for x, y, estado_fantasma, direcao in fantasmas:
+            _escrever_inteiro(dados, x)
+            _escrever_inteiro(dados, y)
+            dados.append(estado_fantasma)
+            dados.append(_codigo(direcao))
+
+        self.mapa = mapa
+        self.tick = estado.tick
+        self.pontuacao = estado.pontuacao
+        self.bits = bits
+        self.pacman = (pacman.x, pacman.y, pacman.direcao)
+        self.fantasmas = fantasmas
+        return bytes(dados)
+
+    @staticmethod
+    def _escrever_fantasma_alterado(dados, novo, antigo):
+        """Escreve os campos de um fantasma que mudaram."""
+        x, y, estado_fantasma, direcao = novo
+        campos = 0
+        if (x, y) != antigo[:2]:
+            campos |= MOVEU_FANTASMA
+        if estado_fantasma != antigo[2]:
+            campos |= ESTADO_FANTASMA
+        if direcao != antigo[3]:
+            campos |= DIRECAO_FANTASMA
+        dados.append(campos)
+        if campos & MOVEU_FANTASMA:
+            _escrever_inteiro(dados, x - antigo[0])
+            _escrever_inteiro(dados, y - antigo[1])
+        if campos & ESTADO_FANTASMA:
+            dados.append(estado_fantasma)
+        if campos & DIRECAO_FANTASMA:
+            dados.append(_codigo(direcao))
+
+class DecodificadorEstado:
+    """
+    Reconstrói o estado visível da partida a partir dos pacotes do CodificadorEstado.
+
+    Depois de aplicar um pacote, os atributos têm o estado daquele tick: mapa (matriz do
+    labirinto), bits (bitset de pontos, como em PontosNivel), pacman [x, y, direção] e
+    fantasmas [[x, y, estado, direção], ...].
+    """
+    def __init__(self):
+        self.tick = 0
+        self.nivel = 0
+        self.pontuacao = 0
+        self.seed_labirinto = None
+        self.mapa = None
+        self.bits = bytearray()
+        self.pacman = None
+        self.fantasmas = []
+
+    def tem_ponto(self, row, col):
+        """Retorna True se ainda há um ponto na célula."""
+        indice = row * len(self.mapa[0]) + col
+        return self.bits[indice >> 3] & (1 << (indice & 7)) != 0
+
+    def aplicar(self, pacote):
+        """
+        Aplica um pacote. Deltas só podem ser aplicados depois de um quadro-chave.
+
+        Returns:
+            A mensagem (dicionário) de um pacote MENSAGEM, que não altera o estado; None
+            para os demais pacotes
+        """
+        if pacote[0] == MENSAGEM:
+            return json.loads(pacote[1:].decode())
+        if pacote[0] == QUADRO_CHAVE:
+            self._aplicar_quadro_chave(pacote)
+            return None
+        if pacote[0] != DELTA:
+            raise ValueError(f"Tipo de pacote desconhecido: {pacote[0]}")
+        if self.mapa is None:
+            raise ValueError("Delta recebido antes do primeiro quadro-chave")
+
+        flags = pacote[1]
+        pos = 2
+        avanco = 1
+        if flags & MUDOU_TICK:
+            avanco, pos = _ler_inteiro(pacote, pos)
+        self.tick += avanco
+
+        if flags & MUDOU_PONTUACAO:
+            diferenca, pos = _ler_inteiro(pacote, pos)
+            self.pontuacao += diferenca
+
+        if flags & MUDOU_PONTOS:
+            quantidade, pos = ler_varint(pacote, pos)
+            indice = 0
+            for _ in range(quantidade):
+                distancia, pos = ler_varint(pacote, pos)
+                indice += distancia
+                self.bits[indice >> 3] ^= 1 << (indice & 7)
+
+        if flags & MOVEU_PACMAN:
+            dx, pos = _ler_inteiro(pacote, pos)
+            dy, pos = _ler_inteiro(pacote, pos)
+            self.pacman[0] += dx
+            self.pacman[1] += dy
+        if flags & DIRECAO_PACMAN:
+            self.pacman[2] = _direcao(pacote[pos])
+            pos += 1
+
+        if flags & MUDOU_FANTASMAS:
+            alterados, pos = ler_varint(pacote, pos)
+            for fantasma in self.fantasmas:
+                if alterados & 1:
+                    pos = self._ler_fantasma_alterado(pacote, pos, fantasma)
+                alterados >>= 1
+        return None
+
+    def _aplicar_quadro_chave(self, pacote):
+        pos = 1
+        valores = []
+        for _ in range(6):
+            valor, pos = ler_varint(pacote, pos)
+            valores.append(valor)
+        self.tick, self.nivel, self.pontuacao, self.seed_labirinto, altura, largura = valores
+
+        tamanho, pos = ler_varint(pacote, pos)
+        celulas = zlib.decompress(pacote[pos:pos + tamanho])
+        pos += tamanho
+        self.mapa = [list(celulas[row * largura:(row + 1) * largura]) for row in range(altura)]
+        self.bits = bytearray(celulas[altura * largura:])
+
+        x, pos = _ler_inteiro(pacote, pos)
+        y, pos = _ler_inteiro(pacote, pos)
+        self.pacman = [x, y, _direcao(pacote[pos])]
+        pos += 1
+
+        quantidade, pos = ler_varint(pacote, pos)
+        self.fantasmas = []
+        for _ in range(quantidade):
+            x, pos = _ler_inteiro(pacote, pos)
+            y, pos = _ler_inteiro(pacote, pos)
+            self.fantasmas.append([x, y, pacote[pos], _direcao(pacote[pos + 1])])
+            pos += 2
+
+    @staticmethod
+    def _ler_fantasma_alterado(pacote, pos, fantasma):
+        campos = pacote[pos]
+        pos += 1
+        if campos & MOVEU_FANTASMA:
+            dx, pos = _ler_inteiro(pacote, pos)
+            dy, pos = _ler_inteiro(pacote, pos)
+            fantasma[0] += dx
+            fantasma[1] += dy
+        if campos & ESTADO_FANTASMA:
+            fantasma[2] = pacote[pos]
+            pos += 1
+        if campos & DIRECAO_FANTASMA:
+            fantasma[3] = _direcao(pacote[pos])
+            pos += 1
+        return pos
@@ -0,0 +1,105 @@
+import time
+
+MAX_QUADROS_PULADOS = 5  # Depois de tantos quadros seguidos sem desenho, um é desenhado mesmo atrasado
+VOLTAS_SOBRECARGA = 3    # Voltas seguidas do laço atrasadas para considerar a sobrecarga sustentada
+
+class VigiaTicks:
+    """
+    Relógio de ticks de duração fixa com vigia de orçamento.
+
+    A simulação avança em ticks de `intervalo` segundos no tempo real: a cada volta do
+    laço, ticks_vencidos() diz quantos ticks já deveriam ter acontecido, e todos são
+    executados antes de um único desenho (nenhum tick é descartado, então a velocidade
+    do jogo não depende do tempo de desenho; os ticks recuperados contam como quadros
+    pulados). Cada tick é medido contra o orçamento (o próprio intervalo). Quando o laço
+    fica atrasado por VOLTAS_SOBRECARGA voltas seguidas, a sobrecarga é sustentada:
+    deve_desenhar() passa a pular o desenho enquanto ainda houver ticks vencidos depois
+    dos executados, desenhando ao menos um quadro a cada MAX_QUADROS_PULADOS. Entrar e
+    sair da sobrecarga é avisado na saída padrão, e relatorio() resume a degradação.
+    """
+    def __init__(self, fps, relogio=time.perf_counter, dormir=time.sleep):
+        """
+        Args:
+            fps: Ticks por segundo da simulação
+            relogio, dormir: Funções de tempo (trocáveis para simulação ou testes)
+        """
+        self.intervalo = 1 / fps
+        self.relogio = relogio
+        self.dormir = dormir
+        self.proximo_tick = relogio()
+        self.sobrecarga = False
+        self._atrasados_seguidos = 0
+        self._pulados_seguidos = 0
+        self._inicio_tick = 0.0
+
+        # Estatísticas
+        self.ticks = 0
+        self.ticks_acima_orcamento = 0  # Ticks cuja simulação sozinha passou do intervalo
+        self.quadros_desenhados = 0
+        self.quadros_pulados = 0
+        self.atraso = 0.0  # Atraso do laço na última volta, em segundos
+        self.maior_atraso = 0.0
+        self.episodios_sobrecarga = 0
+
+    def esperar(self):
+        """Dorme até o próximo tick, se ele ainda não venceu."""
+        espera = self.proximo_tick - self.relogio()
+        if espera > 0:
+            self.dormir(espera)
+
+    def ticks_vencidos(self):
+        """Número de ticks a executar agora (todos os vencidos desde o último, ao menos 1)."""
+        self.atraso = self.relogio() - self.proximo_tick
+        self.maior_atraso = max(self.maior_atraso, self.atraso)
+        return max(1, int(self.atraso / self.intervalo) + 1)
+
+    def inicio_tick(self):
+        """Começa a medir um tick."""
+        self._inicio_tick = self.relogio()
+
+    def fim_tick(self):
+        """Encerra a medição de um tick e agenda o próximo."""
+        if self.relogio() - self._inicio_tick > self.intervalo:
+            self.ticks_acima_orcamento += 1
+        self.ticks += 1
+        self.proximo_tick += self.intervalo
+
+    def deve_desenhar(self, ticks):
+        """
+        Decide se o quadro é desenhado, atualizando o estado de sobrecarga.
+
+        Args:
+            ticks: Ticks executados nesta volta do laço (ver ticks_vencidos)
+        """
+        self.quadros_pulados += ticks - 1
+        ainda_atrasado = self.relogio() > self.proximo_tick
+        atrasado = ticks > 1 or ainda_atrasado
+        self._atrasados_seguidos = self._atrasados_seguidos + 1 if atrasado else 0
+
+        if not self.sobrecarga and self._atrasados_seguidos >= VOLTAS_SOBRECARGA:
+            self.sobrecarga = True
+            self.episodios_sobrecarga += 1
+            print(f"AVISO: Sobrecarga: laço {self.atraso * 1000:.0f} ms atrasado por {VOLTAS_SOBRECARGA} "
+                  "quadros seguidos; quadros serão pulados, ticks não")
+        elif self.sobrecarga and not atrasado:
+            self.sobrecarga = False
+            print(f"AVISO: Fim da sobrecarga ({self.quadros_pulados} quadros pulados até agora)")
+
+        if self.sobrecarga and ainda_atrasado and self._pulados_seguidos < MAX_QUADROS_PULADOS:
+            self._pulados_seguidos += 1
+            self.quadros_pulados += 1
+            return False
+        self._pulados_seguidos = 0
+        self.quadros_desenhados += 1
+        return True
+
+    def degradou(self):
+        """True se houve sobrecarga ou ticks acima do orçamento."""
+        return self.episodios_sobrecarga > 0 or self.ticks_acima_orcamento > 0
+
+    def relatorio(self):
+        """Resumo de ticks, quadros e degradação."""
+        return (f"{self.ticks} ticks, {self.quadros_desenhados} quadros desenhados, "
+                f"{self.quadros_pulados} pulados, {self.ticks_acima_orcamento} ticks acima do orçamento "
+                f"de {self.intervalo * 1000:.0f} ms, {self.episodios_sobrecarga} episódios de sobrecarga, "
+                f"maior atraso {self.maior_atraso * 1000:.0f} ms")